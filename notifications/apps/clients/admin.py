@@ -6,4 +6,7 @@ from clients.models import Client
 @admin.register(Client)
 class ClientAdmin(admin.ModelAdmin):
     list_display = ("name",)
-    search_fields = ("name",)
+    # prefix search, which uses the name index, also used by the client autocomplete of tickets
+    search_fields = ("^name",)
+    # counting all clients is slow with many clients
+    show_full_result_count = False
@@ -3,3 +3,7 @@ from django.apps import AppConfig
 
 class ClientsConfig(AppConfig):
     name = "clients"
+
+    def ready(self):
+        """Register the signal receivers."""
+        from clients import signals  # noqa: F401
@@ -0,0 +1,57 @@
+import threading
+import time
+from collections import OrderedDict
+from typing import NamedTuple, Optional, Tuple
+
+from clients.constants import CLIENT_CACHE_SIZE, CLIENT_CACHE_TTL
+from clients.models import Client
+
+
+class ClientDisplay(NamedTuple):
+    id: int
+    name: str
+
+
+_client_cache: "OrderedDict[int, Tuple[float, Optional[ClientDisplay]]]" = OrderedDict()
+_client_cache_lock = threading.Lock()
+
+
+def get_client_display(client_id: Optional[int]) -> Optional[ClientDisplay]:
+    """
+    Return the display data of a client, for rendering notifications.
+
+    Clients are kept in a small LRU cache per process. Entries expire after `CLIENT_CACHE_TTL` seconds, so
+    changes made by other processes are picked up, changes made in this process invalidate them right away.
+
+    Args:
+        client_id (Optional[int]): The primary key of the client.
+
+    Returns:
+        Optional[ClientDisplay]: The id and name of the client, None if there is no such client.
+    """
+    if client_id is None:
+        return None
+
+    now = time.monotonic()
+    with _client_cache_lock:
+        entry = _client_cache.get(client_id)
+        if entry and entry[0] > now:
+            _client_cache.move_to_end(client_id)
+            return entry[1]
+
+    row = Client.objects.filter(pk=client_id).values_list("pk", "name").first()
+    client = ClientDisplay(*row) if row else None
+
+    with _client_cache_lock:
+        _client_cache[client_id] = (now + CLIENT_CACHE_TTL, client)
+        _client_cache.move_to_end(client_id)
+        if len(_client_cache) > CLIENT_CACHE_SIZE:
+            _client_cache.popitem(last=False)
+
+    return client
+
+
+def invalidate_client(client_id: int):
+    """Drop a client from the display cache, the next lookup loads it again."""
+    with _client_cache_lock:
+        _client_cache.pop(client_id, None)
@@ -0,0 +1,3 @@
+# number of clients kept in the display cache of every process, and seconds until a cached client is reloaded
+CLIENT_CACHE_SIZE = 1024
+CLIENT_CACHE_TTL = 300
@@ -0,0 +1,42 @@
+# Generated by Django 5.2.4 on 2026-10-19 17:20
+
+from django.db import migrations, models
+
+# the admin prefix search filters with a case-insensitive LIKE 'prefix%', which the plain name index can't serve
+PREFIX_INDEXES = {
+    "postgresql": (
+        "CREATE INDEX clients_client_name_prefix ON clients_client (UPPER(name::text) text_pattern_ops)",
+        "DROP INDEX IF EXISTS clients_client_name_prefix",
+    ),
+    "sqlite": (
+        "CREATE INDEX clients_client_name_prefix ON clients_client (name COLLATE NOCASE)",
+        "DROP INDEX IF EXISTS clients_client_name_prefix",
+    ),
+}
+
+
+def create_prefix_index(apps, schema_editor):
+    """Create the prefix index of the client names, on the databases which support it."""
+    if schema_editor.connection.vendor in PREFIX_INDEXES:
+        schema_editor.execute(PREFIX_INDEXES[schema_editor.connection.vendor][0])
+
+
+def drop_prefix_index(apps, schema_editor):
+    """Drop the prefix index of the client names."""
+    if schema_editor.connection.vendor in PREFIX_INDEXES:
+        schema_editor.execute(PREFIX_INDEXES[schema_editor.connection.vendor][1])
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("clients", "0001_initial"),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name="client",
+            name="name",
+            field=models.CharField(db_index=True, max_length=100, verbose_name="Name"),
+        ),
+        migrations.RunPython(create_prefix_index, drop_prefix_index),
+    ]
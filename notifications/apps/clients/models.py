@@ -3,7 +3,8 @@ from django.db import models
 
 
 class Client(CoreModel):
-    name = models.CharField("Name", max_length=100)
+    # indexed for the ordering by name, the case-insensitive prefix search has its own index, see migration 0002
+    name = models.CharField("Name", max_length=100, db_index=True)
 
     class Meta:
         app_label = "clients"
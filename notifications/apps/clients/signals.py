@@ -0,0 +1,12 @@
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from clients.cache import invalidate_client
+from clients.models import Client
+
+
+@receiver(post_save, sender=Client)
+@receiver(post_delete, sender=Client)
+def client_changed(sender, instance: Client, **kwargs):
+    """Drop changed clients from the display cache of this process."""
+    invalidate_client(instance.pk)
@@ -2,7 +2,7 @@ from django.contrib import admin
 from django.shortcuts import redirect
 from django.urls import reverse
 
-from core.models import CoreSettings
+from core.models import CircuitBreakerState, CoreSettings, Sequence
 
 
 class CoreAdmin(admin.ModelAdmin):
@@ -21,3 +21,15 @@ class CoreSettingsAdmin(CoreAdmin):
         if obj:
             return redirect(reverse("admin:core_coresettings_change", args=[obj.pk]))
         return super().changelist_view(request, extra_context=extra_context)
+
+
+@admin.register(CircuitBreakerState)
+class CircuitBreakerStateAdmin(CoreAdmin):
+    list_display = ("name", "state", "failures", "opened_at", "updated_at")
+    readonly_fields = ("name", "created_at", "updated_at")
+
+
+@admin.register(Sequence)
+class SequenceAdmin(CoreAdmin):
+    list_display = ("name", "last_value", "updated_at")
+    readonly_fields = ("name", "last_value", "created_at", "updated_at")
@@ -0,0 +1,152 @@
+from datetime import datetime, timedelta
+from datetime import timezone as dt_timezone
+from typing import Optional
+
+import requests
+from django.db.models import F
+from django.utils import timezone
+from django.utils.http import parse_http_date_safe
+
+from core.constants import (
+    CIRCUIT_BREAKER_STATE_CLOSED,
+    CIRCUIT_BREAKER_STATE_HALF_OPEN,
+    CIRCUIT_BREAKER_STATE_OPEN,
+    RATE_LIMIT_RETRY_AFTER,
+)
+from core.exceptions import CircuitOpenError, RateLimitExceededError
+from core.models import CircuitBreakerState
+
+
+class CircuitBreaker:
+    """
+    Circuit breaker guarding the HTTP calls to a third party integration.
+
+    The state is stored in the database, so all processes share it. After `failure_threshold` consecutive
+    failures the breaker opens and calls fail at once with `CircuitOpenError`. Once `recovery_timeout` seconds
+    passed, a single caller is let through as a probe (half-open): if it succeeds the breaker closes again,
+    otherwise it stays open for another `recovery_timeout` seconds.
+    """
+
+    def __init__(self, name: str, failure_threshold: int = 5, recovery_timeout: int = 60):
+        """
+        Create the breaker, its state row is created on the first call.
+
+        Args:
+            name (str): The unique name of the breaker, e.g. the name of the integration.
+            failure_threshold (int): The number of consecutive failures which open the breaker.
+            recovery_timeout (int): Seconds the breaker stays open before a probe is let through.
+        """
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.recovery_timeout = recovery_timeout
+        # primary key of the state row, looked up once per process
+        self.state_id: Optional[int] = None
+
+    def get_state(self) -> CircuitBreakerState:
+        """Load the current state of the breaker, shared by all processes."""
+        if self.state_id is not None:
+            state = CircuitBreakerState.objects.filter(pk=self.state_id).first()
+            if state:
+                return state
+
+        state, _ = CircuitBreakerState.objects.get_or_create(name=self.name)
+        self.state_id = state.pk
+        return state
+
+    def before_call(self) -> CircuitBreakerState:
+        """
+        Check whether a call may pass the breaker.
+
+        Returns:
+            CircuitBreakerState: The state of the breaker at the time of the check.
+
+        Raises:
+            CircuitOpenError: If the breaker is open, or half-open with a probe already in flight.
+        """
+        state = self.get_state()
+        if state.state == CIRCUIT_BREAKER_STATE_CLOSED:
+            return state
+
+        now = timezone.now()
+        retry_at = (state.opened_at or now) + timedelta(seconds=self.recovery_timeout)
+        if retry_at > now:
+            raise CircuitOpenError(name=self.name, retry_at=retry_at)
+
+        # let a single caller probe the integration, the conditional update makes sure only one process wins
+        probing = CircuitBreakerState.objects.filter(pk=state.pk, state=state.state, opened_at=state.opened_at).update(
+            state=CIRCUIT_BREAKER_STATE_HALF_OPEN, opened_at=now
+        )
+        if not probing:
+            raise CircuitOpenError(name=self.name, retry_at=now + timedelta(seconds=self.recovery_timeout))
+
+        state.state = CIRCUIT_BREAKER_STATE_HALF_OPEN
+        state.opened_at = now
+        return state
+
+    def record_success(self, state: CircuitBreakerState):
+        """Close the breaker after a successful call."""
+        # only write to the database if the breaker actually changes
+        if state.state != CIRCUIT_BREAKER_STATE_CLOSED or state.failures:
+            CircuitBreakerState.objects.filter(pk=state.pk).update(
+                state=CIRCUIT_BREAKER_STATE_CLOSED, failures=0, opened_at=None
+            )
+
+    def record_failure(self, state: CircuitBreakerState):
+        """Count a failed call, and open the breaker once the failure threshold is reached or the probe failed."""
+        if state.state == CIRCUIT_BREAKER_STATE_HALF_OPEN:
+            # the probe failed, keep the breaker open for another recovery timeout
+            CircuitBreakerState.objects.filter(pk=state.pk).update(
+                state=CIRCUIT_BREAKER_STATE_OPEN, opened_at=timezone.now()
+            )
+            return
+
+        CircuitBreakerState.objects.filter(pk=state.pk).update(failures=F("failures") + 1)
+        CircuitBreakerState.objects.filter(
+            pk=state.pk, state=CIRCUIT_BREAKER_STATE_CLOSED, failures__gte=self.failure_threshold
+        ).update(state=CIRCUIT_BREAKER_STATE_OPEN, opened_at=timezone.now())
+
+    def request(self, method: str, url: str, **kwargs) -> requests.Response:
+        """
+        Send an HTTP request through the circuit breaker.
+
+        Connection errors, timeouts and server errors count as failures. A rate limit response shows the integration
+        is available, the call is deferred until the time of its `Retry-After` header instead.
+
+        Args:
+            method (str): The HTTP method.
+            url (str): The URL to request.
+            **kwargs: Keyword arguments passed on to `requests.request`, a `timeout` is required.
+
+        Returns:
+            requests.Response: The response of the integration.
+
+        Raises:
+            CircuitOpenError: If the breaker is open, the request is not sent.
+            RateLimitExceededError: If the integration responded with a rate limit error.
+            requests.exceptions.RequestException: If the request failed.
+        """
+        state = self.before_call()
+        try:
+            response = requests.request(method, url, **kwargs)
+            if response.status_code >= 500:
+                response.raise_for_status()
+        except requests.exceptions.RequestException:
+            self.record_failure(state)
+            raise
+
+        self.record_success(state)
+        if response.status_code == 429:
+            raise RateLimitExceededError(key=self.name, retry_at=self.get_retry_at(response))
+        return response
+
+    @staticmethod
+    def get_retry_at(response: requests.Response) -> datetime:
+        """Get the time a rate limited call may be retried from the `Retry-After` header, in seconds or a date."""
+        retry_after = response.headers.get("Retry-After", "")
+        if retry_after.isdigit():
+            return timezone.now() + timedelta(seconds=int(retry_after))
+
+        retry_at = parse_http_date_safe(retry_after)
+        if retry_at is not None:
+            return datetime.fromtimestamp(retry_at, tz=dt_timezone.utc)
+        return timezone.now() + timedelta(seconds=RATE_LIMIT_RETRY_AFTER)
@@ -0,0 +1,15 @@
+CIRCUIT_BREAKER_STATE_CLOSED = "closed"
+CIRCUIT_BREAKER_STATE_OPEN = "open"
+CIRCUIT_BREAKER_STATE_HALF_OPEN = "half_open"
+
+CIRCUIT_BREAKER_STATE_CHOICES = (
+    (CIRCUIT_BREAKER_STATE_CLOSED, "Closed"),
+    (CIRCUIT_BREAKER_STATE_OPEN, "Open"),
+    (CIRCUIT_BREAKER_STATE_HALF_OPEN, "Half-open"),
+)
+
+# seconds to wait after a rate limit response of an integration without a `Retry-After` header
+RATE_LIMIT_RETRY_AFTER = 60
+
+# milliseconds a short-lived process may take to start and set up django, see `benchmark_startup`
+STARTUP_BUDGET_MS = 500
@@ -0,0 +1,33 @@
+from datetime import datetime
+
+
+class CircuitOpenError(Exception):
+    """Raised instead of calling an integration while its circuit breaker is open."""
+
+    def __init__(self, name: str, retry_at: datetime):
+        """
+        Create the error.
+
+        Args:
+            name (str): The name of the open circuit breaker.
+            retry_at (datetime): The time the breaker lets a call pass again.
+        """
+        super().__init__(f"Circuit breaker '{name}' is open until {retry_at.isoformat()}")
+        self.name = name
+        self.retry_at = retry_at
+
+
+class RateLimitExceededError(Exception):
+    """Raised instead of calling an integration while the rate limit of the call is used up."""
+
+    def __init__(self, key: str, retry_at: datetime):
+        """
+        Create the error.
+
+        Args:
+            key (str): The key of the empty bucket.
+            retry_at (datetime): The time the bucket holds a token again.
+        """
+        super().__init__(f"Rate limit of {key} exceeded until {retry_at.isoformat()}")
+        self.key = key
+        self.retry_at = retry_at
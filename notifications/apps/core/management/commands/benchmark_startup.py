@@ -0,0 +1,73 @@
+import os
+import re
+import statistics
+import subprocess
+import sys
+import time
+from typing import Dict, List, Tuple
+
+from django.conf import settings
+from django.core.management import BaseCommand, CommandError
+
+from core.constants import STARTUP_BUDGET_MS
+
+STARTUP_CODE = "import django; django.setup()"
+IMPORT_TIME_LINE = re.compile(r"^import time:\s+(\d+) \|\s+(\d+) \|( *)(\S+)$")
+
+
+def run_startup(settings_module: str, import_time: bool = False) -> Tuple[float, str]:
+    """Start a fresh interpreter which sets up django, returns the wall time in ms and the stderr output."""
+    args = [sys.executable, *(["-X", "importtime"] if import_time else []), "-c", STARTUP_CODE]
+    env = {**os.environ, "DJANGO_SETTINGS_MODULE": settings_module}
+    start = time.perf_counter()
+    result = subprocess.run(args, cwd=settings.BASE_DIR, env=env, capture_output=True, text=True)
+    elapsed = (time.perf_counter() - start) * 1000
+    if result.returncode:
+        raise CommandError(f"Setting up django with '{settings_module}' failed:\n{result.stderr}")
+    return elapsed, result.stderr
+
+
+def top_level_imports(import_time_output: str) -> Dict[str, float]:
+    """Return the cumulative import time in ms of every module imported at the top level."""
+    imports = {}
+    for line in import_time_output.splitlines():
+        match = IMPORT_TIME_LINE.match(line)
+        # nested imports are indented by two spaces per level
+        if match and len(match.group(3)) == 1:
+            imports[match.group(4)] = int(match.group(2)) / 1000
+    return imports
+
+
+class Command(BaseCommand):
+    help = "Measure the cold start time of django with a settings profile, and fail if it exceeds the budget."
+
+    def add_arguments(self, parser):
+        """Add the benchmark options."""
+        parser.add_argument(
+            "--settings-module", default="settings_worker", help="Settings profile to measure the startup of."
+        )
+        parser.add_argument("--runs", type=int, default=5, help="Number of startups to take the median of.")
+        parser.add_argument("--budget", type=float, default=STARTUP_BUDGET_MS, help="Startup budget in ms.")
+        parser.add_argument("--top", type=int, default=15, help="Number of slowest imports to list.")
+
+    def handle(self, *args, **options):
+        """Measure the median startup, list the slowest imports and fail above the budget."""
+        settings_module = options["settings_module"]
+        print(f"Measuring the startup with '{settings_module}' over {options['runs']} runs..")
+
+        # the first run warms up the bytecode cache
+        run_startup(settings_module)
+        durations: List[float] = [run_startup(settings_module)[0] for _ in range(max(1, options["runs"]))]
+        median = statistics.median(durations)
+
+        _, output = run_startup(settings_module, import_time=True)
+        imports = sorted(top_level_imports(output).items(), key=lambda item: item[1], reverse=True)
+
+        print("Slowest top level imports (-X importtime, cumulative):")
+        for module, duration in imports[: options["top"]]:
+            print(f"  {duration:8.1f}ms  {module}")
+        print(f"Startup: median={median:.1f}ms, min={min(durations):.1f}ms, max={max(durations):.1f}ms")
+
+        if median > options["budget"]:
+            raise CommandError(f"Startup exceeds the budget of {options['budget']:.0f}ms.")
+        print(f"Startup is within the budget of {options['budget']:.0f}ms.")
@@ -30,13 +30,13 @@ class Command(BaseCommand):
         client, _ = Client.objects.get_or_create(name="Best Client", defaults={})
 
         print("Setting up testing ticket..")
+        # the ticket number is assigned by the ticket number sequence
         ticket, _ = Ticket.objects.get_or_create(
-            ticket_no="64853",
+            title="Mollie Zahlungen werden nicht verarbeitet.",
             defaults={
                 "draft": True,
                 "status": TICKET_STATUS_OPEN,
                 "client_id": client.pk,
-                "title": "Mollie Zahlungen werden nicht verarbeitet.",
                 "description": "<p>Wir haben aktuell das Problem, das keine Mollie Zahlungen zu unseren Bestellungen "
                 "zugeordnet werden.</p><p>Das geht wohl schon eine ganze weile so. Wir haben lange nicht "
                 "reingeschaut aber irgendwie macht das ja so keinen SInn.</p>",
@@ -0,0 +1,36 @@
+# Generated by Django 5.2.4 on 2026-10-19 16:58
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("core", "0002_coresettings_trello_board_id_and_more"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="CircuitBreakerState",
+            fields=[
+                ("id", models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name="ID")),
+                ("created_at", models.DateTimeField(auto_now_add=True, null=True)),
+                ("updated_at", models.DateTimeField(auto_now=True, null=True)),
+                ("name", models.CharField(max_length=45, unique=True, verbose_name="Name")),
+                (
+                    "state",
+                    models.CharField(
+                        choices=[("closed", "Closed"), ("open", "Open"), ("half_open", "Half-open")],
+                        default="closed",
+                        max_length=45,
+                        verbose_name="State",
+                    ),
+                ),
+                ("failures", models.PositiveIntegerField(default=0, verbose_name="Consecutive failures")),
+                ("opened_at", models.DateTimeField(blank=True, null=True, verbose_name="Opened at")),
+            ],
+            options={
+                "verbose_name": "Circuit Breaker",
+                "verbose_name_plural": "Circuit Breakers",
+            },
+        ),
+    ]
@@ -0,0 +1,26 @@
+# Generated by Django 5.2.4 on 2026-10-19 17:05
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("core", "0003_circuitbreakerstate"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="Sequence",
+            fields=[
+                ("id", models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name="ID")),
+                ("created_at", models.DateTimeField(auto_now_add=True, null=True)),
+                ("updated_at", models.DateTimeField(auto_now=True, null=True)),
+                ("name", models.CharField(max_length=45, unique=True, verbose_name="Name")),
+                ("last_value", models.PositiveBigIntegerField(default=0, verbose_name="Last value")),
+            ],
+            options={
+                "verbose_name": "Sequence",
+                "verbose_name_plural": "Sequences",
+            },
+        ),
+    ]
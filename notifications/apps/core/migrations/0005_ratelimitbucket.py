@@ -0,0 +1,27 @@
+# Generated by Django 5.2.4 on 2026-10-19 17:47
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("core", "0004_sequence"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="RateLimitBucket",
+            fields=[
+                ("id", models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name="ID")),
+                ("created_at", models.DateTimeField(auto_now_add=True, null=True)),
+                ("updated_at", models.DateTimeField(auto_now=True, null=True)),
+                ("key", models.CharField(max_length=255, unique=True, verbose_name="Key")),
+                ("tokens", models.FloatField(default=0, verbose_name="Tokens")),
+                ("refilled_at", models.FloatField(default=0, verbose_name="Refilled at")),
+            ],
+            options={
+                "verbose_name": "Rate Limit Bucket",
+                "verbose_name_plural": "Rate Limit Buckets",
+            },
+        ),
+    ]
@@ -1,5 +1,7 @@
 from django.db import models
 
+from core.constants import CIRCUIT_BREAKER_STATE_CHOICES, CIRCUIT_BREAKER_STATE_CLOSED
+
 
 class CoreModel(models.Model):
     created_at = models.DateTimeField(auto_now_add=True, null=True)
@@ -25,3 +27,50 @@ class CoreSettings(CoreModel):
         app_label = "core"
         verbose_name = "Settings"
         verbose_name_plural = "Settings"
+
+
+class RateLimitBucket(CoreModel):
+    # the name of the rate limiter and the key of the bucket, e.g. "slack chat.postMessage C0123"
+    key = models.CharField("Key", max_length=255, unique=True)
+    tokens = models.FloatField("Tokens", default=0)
+    # seconds since the epoch, so the tokens are refilled with plain arithmetic in the database
+    refilled_at = models.FloatField("Refilled at", default=0)
+
+    def __str__(self):
+        return f"{self.key} > {self.tokens:.1f}"
+
+    class Meta:
+        app_label = "core"
+        verbose_name = "Rate Limit Bucket"
+        verbose_name_plural = "Rate Limit Buckets"
+
+
+class CircuitBreakerState(CoreModel):
+    name = models.CharField("Name", max_length=45, unique=True)
+    state = models.CharField(
+        "State", max_length=45, choices=CIRCUIT_BREAKER_STATE_CHOICES, default=CIRCUIT_BREAKER_STATE_CLOSED
+    )
+    failures = models.PositiveIntegerField("Consecutive failures", default=0)
+    opened_at = models.DateTimeField("Opened at", null=True, blank=True)
+
+    def __str__(self):
+        return f"{self.name} > {self.state}"
+
+    class Meta:
+        app_label = "core"
+        verbose_name = "Circuit Breaker"
+        verbose_name_plural = "Circuit Breakers"
+
+
+class Sequence(CoreModel):
+    name = models.CharField("Name", max_length=45, unique=True)
+    # the last value handed out to any process, processes reserve blocks of values above it
+    last_value = models.PositiveBigIntegerField("Last value", default=0)
+
+    def __str__(self):
+        return f"{self.name} > {self.last_value}"
+
+    class Meta:
+        app_label = "core"
+        verbose_name = "Sequence"
+        verbose_name_plural = "Sequences"
@@ -0,0 +1,71 @@
+import time
+from datetime import timedelta
+
+from django.db import IntegrityError, transaction
+from django.db.models import F, Value
+from django.db.models.functions import Least
+from django.utils import timezone
+
+from core.exceptions import RateLimitExceededError
+from core.models import RateLimitBucket
+
+
+class RateLimiter:
+    """
+    Token bucket limiting the rate of calls to a third party integration, per key.
+
+    Every key has its own bucket holding up to `burst` tokens, which refills with `rate` tokens per second. A call
+    takes a token, calls finding the bucket empty fail with `RateLimitExceededError` instead of waiting, so they
+    never block a request, and are retried by the notification workers. The buckets are stored in the database,
+    so all processes share the limit, and a token is taken with a single conditional update. Acquire tokens
+    outside of transactions, which would keep the bucket locked until they end.
+    """
+
+    def __init__(self, name: str, rate: float, burst: int = 1):
+        """
+        Create the rate limiter, its buckets are created on the first call.
+
+        Args:
+            name (str): The unique name of the rate limiter, e.g. the name of the integration.
+            rate (float): The calls per second, per key.
+            burst (int): The calls which may be made at once, after a pause.
+        """
+        self.name = name
+        self.rate = rate
+        self.burst = burst
+
+    def acquire(self, key: str):
+        """
+        Take a token from the bucket of the given key.
+
+        Args:
+            key (str): The key of the bucket, e.g. the API method.
+
+        Raises:
+            RateLimitExceededError: If the bucket is empty, no token is taken.
+        """
+        bucket_key = f"{self.name} {key}"
+        now = time.time()
+        refilled = F("tokens") + (Value(now) - F("refilled_at")) * Value(self.rate)
+        buckets = RateLimitBucket.objects.filter(key=bucket_key)
+        # take a token if the refilled bucket holds one, concurrent callers never take the same token
+        if buckets.filter(tokens__gte=Value(1.0) - (Value(now) - F("refilled_at")) * Value(self.rate)).update(
+            tokens=Least(refilled, Value(float(self.burst))) - Value(1.0), refilled_at=now
+        ):
+            return
+
+        bucket = buckets.values_list("tokens", "refilled_at").first()
+        if bucket is None:
+            try:
+                with transaction.atomic():
+                    RateLimitBucket.objects.create(key=bucket_key, tokens=self.burst - 1, refilled_at=now)
+                return
+            except IntegrityError:
+                # created by a concurrent call in the meantime
+                return self.acquire(key)
+
+        tokens, refilled_at = bucket
+        tokens = min(self.burst, tokens + (now - refilled_at) * self.rate)
+        raise RateLimitExceededError(
+            key=bucket_key, retry_at=timezone.now() + timedelta(seconds=(1 - tokens) / self.rate)
+        )
@@ -0,0 +1,132 @@
+import os
+import threading
+from collections import deque
+from typing import Deque, List
+
+from django.db import DEFAULT_DB_ALIAS, connection, connections, transaction
+from django.db.models import F
+
+from core.models import Sequence
+
+
+class SequenceAllocator:
+    """
+    Hands out unique, increasing numbers of a named sequence, shared by all processes via the database.
+
+    Instead of locking the counter for every number, a process reserves a whole block of `block_size` numbers
+    with a single update and hands them out from memory. Numbers are unique across processes but only
+    increasing per process, and numbers of unused blocks are skipped when a process exits.
+    """
+
+    def __init__(self, name: str, start: int = 1, block_size: int = 100):
+        """
+        Create the allocator, the sequence is created in the database on the first reservation.
+
+        Args:
+            name (str): The unique name of the sequence.
+            start (int): The first number of a new sequence.
+            block_size (int): The numbers reserved at once by a process.
+        """
+        self.name = name
+        self.start = start
+        self.block_size = block_size
+        self.blocks: Deque[range] = deque()
+        self.lock = threading.Lock()
+        self.pid = os.getpid()
+        self.local = threading.local()
+
+    def reserve(self, count: int) -> range:
+        """
+        Reserve the next `count` numbers of the sequence in the database.
+
+        Within a transaction on Postgres, the numbers are reserved on a separate connection in autocommit mode, so
+        the counter row is not locked until the end of the caller's transaction, which may send notifications
+        before committing. Numbers reserved by a transaction which is rolled back are skipped then. SQLite has a
+        single writer, which is the caller's transaction, so the numbers are reserved within it.
+
+        Args:
+            count (int): The number of values to reserve.
+
+        Returns:
+            range: The reserved numbers.
+        """
+        if connection.in_atomic_block and connection.vendor == "postgresql":
+            last_value = self.reserve_autocommit(count)
+        else:
+            with transaction.atomic():
+                # the update locks the counter row until the end of the transaction, so reservations never overlap
+                updated = Sequence.objects.filter(name=self.name).update(last_value=F("last_value") + count)
+                if not updated:
+                    Sequence.objects.get_or_create(name=self.name, defaults={"last_value": self.start - 1})
+                    Sequence.objects.filter(name=self.name).update(last_value=F("last_value") + count)
+                last_value = Sequence.objects.filter(name=self.name).values_list("last_value", flat=True).get()
+        return range(last_value - count + 1, last_value + 1)
+
+    def reserve_autocommit(self, count: int) -> int:
+        """Reserve the next `count` numbers on the autocommit connection of this thread, returns the last one."""
+        autocommit_connection = getattr(self.local, "connection", None)
+        if autocommit_connection is None or self.local.pid != os.getpid():
+            # connections are not shared between threads and processes
+            autocommit_connection = connections.create_connection(DEFAULT_DB_ALIAS)
+            self.local.connection, self.local.pid = autocommit_connection, os.getpid()
+        autocommit_connection.close_if_unusable_or_obsolete()
+
+        table = autocommit_connection.ops.quote_name(Sequence._meta.db_table)
+        with autocommit_connection.cursor() as cursor:
+            cursor.execute(
+                f"INSERT INTO {table} (name, last_value) VALUES (%s, %s) ON CONFLICT (name) DO NOTHING",
+                [self.name, self.start - 1],
+            )
+            cursor.execute(
+                f"UPDATE {table} SET last_value = last_value + %s WHERE name = %s RETURNING last_value",
+                [count, self.name],
+            )
+            return cursor.fetchone()[0]
+
+    def release(self, block: range):
+        """Make the numbers of a committed reservation available to the threads of this process."""
+        with self.lock:
+            self.blocks.append(block)
+
+    def next_values(self, count: int) -> List[int]:
+        """
+        Return the next `count` numbers of the sequence.
+
+        Args:
+            count (int): The number of values to return.
+
+        Returns:
+            List[int]: The numbers, unique across all processes.
+        """
+        values: List[int] = []
+        with self.lock:
+            if self.pid != os.getpid():
+                # forked processes must not hand out the blocks of their parent process
+                self.blocks.clear()
+                self.pid = os.getpid()
+            while self.blocks and len(values) < count:
+                block = self.blocks.popleft()
+                taken = block[: count - len(values)]
+                values.extend(taken)
+                if len(taken) < len(block):
+                    self.blocks.appendleft(block[len(taken) :])
+
+        missing = count - len(values)
+        if missing:
+            # reserve outside of the lock, other threads may wait for the counter row held by this thread
+            autocommit = connection.in_atomic_block and connection.vendor == "postgresql"
+            block = self.reserve(max(missing, self.block_size))
+            values.extend(block[:missing])
+            if len(block) > missing and autocommit:
+                # reserved and committed on the autocommit connection already
+                self.release(block[missing:])
+            elif len(block) > missing:
+                # within a transaction the reservation is rolled back together with the caller's changes, so
+                # the rest of the block is only handed out once the reservation has been committed
+                transaction.on_commit(lambda: self.release(block[missing:]))
+
+        return values
+
+    def next_value(self) -> int:
+        """Return the next number of the sequence, unique across all processes."""
+        return self.next_values(1)[0]
@@ -1,7 +1,25 @@
+from ckeditor.widgets import CKEditorWidget
 from core.admin import CoreAdmin
-from django.contrib import admin
+from django.contrib import admin, messages
+from django.core.exceptions import PermissionDenied
+from django.db.models import OuterRef, Subquery
+from django.db.models.functions import Coalesce
+from django.http import JsonResponse
+from django.template.response import TemplateResponse
+from django.urls import path, reverse
+from django.utils.html import format_html, format_html_join
 
-from tickets.models import Ticket, TrelloLabel
+from tickets.analytics import dashboard_data
+from tickets.bulk import BulkUpdateResult, bulk_update_tickets
+from tickets.constants import TICKET_STATUS_ACTIVE, TICKET_STATUS_BLOCKED, TICKET_STATUS_CLOSED, TICKET_STATUS_OPEN
+from tickets.models import ArchivedTicket, FailedNotification, NotificationJob, NotificationRoute, Ticket, TrelloLabel
+from tickets.queue import replay_failed_notifications
+from tickets.transitions import ticket_timeline
+
+
+def batch_progress_url(batch: str) -> str:
+    """Return the admin url of the notification jobs of a batch, with their progress per status."""
+    return f"{reverse('admin:tickets_notificationjob_changelist')}?batch={batch}"
 
 
 @admin.register(Ticket)
@@ -9,16 +27,22 @@ class TicketAdmin(CoreAdmin):
     list_display = ("id", "ticket_no", "status", "client", "title")
     search_fields = ("ticket_no", "title", "description")
     list_filter = ("status",)
+    list_select_related = ("client",)
     date_hierarchy = "created_at"
-    readonly_fields = (
-        "ticket_no",
-        "created_at",
-        "updated_at",
-        "trello_ticket_id",
-        "trello_ticket_url",
-        "slack_message_ts",
-        "slack_channel_id",
+    # search the related objects instead of rendering a select with all clients and users
+    autocomplete_fields = ("client", "author", "assignee")
+    actions = (
+        "set_status_open",
+        "set_status_blocked",
+        "set_status_active",
+        "set_status_closed",
+        "assign_to_me",
+        "unassign",
+        "publish_drafts",
     )
+    # the notification fields are written by the integrations and the notification workers only, a form rendered
+    # before the worker ran would reset them and send the notifications again
+    readonly_fields = ("ticket_no", "created_at", "updated_at", *Ticket.NOTIFICATION_FIELDS, "status_history")
 
     fieldsets = (
         (
@@ -30,6 +54,7 @@ class TicketAdmin(CoreAdmin):
                         "ticket_no",
                         "status",
                         "client",
+                        ("author", "assignee"),
                         ("created_at", "updated_at"),
                     )
                 ),
@@ -57,9 +82,226 @@ class TicketAdmin(CoreAdmin):
                 )
             },
         ),
+        (
+            "History",
+            {"fields": ("status_history",)},
+        ),
     )
 
+    def formfield_for_dbfield(self, db_field, request, **kwargs):
+        """Edit the description with the rich text editor."""
+        # the description is stored as html, the rich text editor is only loaded with the admin
+        if db_field.name == "description":
+            kwargs["widget"] = CKEditorWidget()
+        return super().formfield_for_dbfield(db_field, request, **kwargs)
+
+    @admin.display(description="Status history")
+    def status_history(self, obj):
+        """Render the status transitions of the ticket, oldest first."""
+        if not obj.pk:
+            return "-"
+        return format_html_join(
+            "",
+            "<div>{}: {}</div>",
+            ((transition.created_at, transition.to_status_name) for transition in ticket_timeline(obj.pk)),
+        )
+
+    def report_bulk_update(self, request, result: BulkUpdateResult):
+        """Message the result of a bulk action, with a link to the progress of its notifications."""
+        if not result.batch:
+            self.message_user(request, f"{result.updated} ticket(s) updated.", messages.SUCCESS)
+            return
+
+        url = batch_progress_url(result.batch)
+        self.message_user(
+            request,
+            format_html(
+                '{} ticket(s) updated, {} notification(s) queued. <a href="{}">Show progress</a>',
+                result.updated,
+                result.notified,
+                url,
+            ),
+            messages.SUCCESS,
+        )
+
+    @admin.action(description="Set status of selected tickets to open", permissions=["change"])
+    def set_status_open(self, request, queryset):
+        """Set the status of the selected tickets to open."""
+        self.report_bulk_update(request, bulk_update_tickets(queryset, status=TICKET_STATUS_OPEN))
+
+    @admin.action(description="Set status of selected tickets to blocked", permissions=["change"])
+    def set_status_blocked(self, request, queryset):
+        """Set the status of the selected tickets to blocked."""
+        self.report_bulk_update(request, bulk_update_tickets(queryset, status=TICKET_STATUS_BLOCKED))
+
+    @admin.action(description="Set status of selected tickets to active", permissions=["change"])
+    def set_status_active(self, request, queryset):
+        """Set the status of the selected tickets to active."""
+        self.report_bulk_update(request, bulk_update_tickets(queryset, status=TICKET_STATUS_ACTIVE))
+
+    @admin.action(description="Set status of selected tickets to closed", permissions=["change"])
+    def set_status_closed(self, request, queryset):
+        """Set the status of the selected tickets to closed."""
+        self.report_bulk_update(request, bulk_update_tickets(queryset, status=TICKET_STATUS_CLOSED))
+
+    @admin.action(description="Assign selected tickets to me", permissions=["change"])
+    def assign_to_me(self, request, queryset):
+        """Assign the selected tickets to the current user."""
+        # the assignee is not part of the slack and trello notifications
+        self.report_bulk_update(request, bulk_update_tickets(queryset, notify=False, assignee_id=request.user.pk))
+
+    @admin.action(description="Unassign selected tickets", permissions=["change"])
+    def unassign(self, request, queryset):
+        """Remove the assignee of the selected tickets."""
+        self.report_bulk_update(request, bulk_update_tickets(queryset, notify=False, assignee_id=None))
+
+    @admin.action(description="Publish selected drafts", permissions=["change"])
+    def publish_drafts(self, request, queryset):
+        """Publish the selected drafts, which sends their notifications."""
+        self.report_bulk_update(request, bulk_update_tickets(queryset, draft=False))
+
+    def get_urls(self):
+        """Add the analytics views to the ticket admin urls."""
+        urls = [
+            path(
+                "analytics/",
+                self.admin_site.admin_view(self.analytics_view),
+                name="tickets_ticket_analytics",
+            ),
+            path(
+                "analytics/json/",
+                self.admin_site.admin_view(self.analytics_json_view),
+                name="tickets_ticket_analytics_json",
+            ),
+        ]
+        return urls + super().get_urls()
+
+    def get_analytics_days(self, request) -> int:
+        """Return the number of days to show in the analytics, from the `days` query parameter."""
+        try:
+            return min(max(int(request.GET.get("days", 30)), 1), 365)
+        except ValueError:
+            return 30
+
+    def analytics_view(self, request):
+        """Render the ticket analytics dashboard."""
+        if not self.has_view_permission(request):
+            raise PermissionDenied
+
+        context = {
+            **self.admin_site.each_context(request),
+            "opts": self.model._meta,
+            "title": "Ticket analytics",
+            "days": self.get_analytics_days(request),
+            **dashboard_data(days=self.get_analytics_days(request)),
+        }
+        return TemplateResponse(request, "admin/tickets/ticket/analytics.html", context)
+
+    def analytics_json_view(self, request):
+        """Return the ticket analytics dashboard data as JSON."""
+        if not self.has_view_permission(request):
+            raise PermissionDenied
+
+        return JsonResponse(dashboard_data(days=self.get_analytics_days(request)))
+
+
+@admin.register(ArchivedTicket)
+class ArchivedTicketAdmin(CoreAdmin):
+    list_display = ("id", "ticket_no", "status", "client", "title", "updated_at", "archived_at")
+    search_fields = ("=ticket_no", "title")
+    list_filter = ("module",)
+    list_select_related = ("client",)
+    date_hierarchy = "archived_at"
+    # the archive is large, skip counting all archived tickets on every search
+    show_full_result_count = False
+    fieldsets = TicketAdmin.fieldsets + (("Archive", {"fields": ("archived_at",)}),)
+    readonly_fields = ("status_history",)
+
+    status_history = TicketAdmin.status_history
+
+    def has_add_permission(self, request):
+        """Deny adding, tickets are archived by `archive_closed_tickets` only."""
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        """Deny changing, archived tickets are read only."""
+        return False
+
+    def has_delete_permission(self, request, obj=None):
+        """Deny deleting archived tickets."""
+        return False
+
 
 @admin.register(TrelloLabel)
 class TrelloLabelAdmin(CoreAdmin):
-    list_display = ("module", "trello_label_id", "trello_label_name", "trello_label_color")
+    list_display = ("module", "trello_board_id", "trello_label_id", "trello_label_name", "trello_label_color")
+    list_filter = ("trello_board_id",)
+
+
+@admin.register(NotificationRoute)
+class NotificationRouteAdmin(CoreAdmin):
+    list_display = ("client", "module", "slack_channel_id", "trello_board_id", "trello_list_id")
+    list_filter = ("module",)
+    search_fields = ("client__name", "slack_channel_id", "trello_board_id", "trello_list_id")
+    autocomplete_fields = ("client",)
+
+
+class NotificationHistoryAdmin(CoreAdmin):
+    """Admin of the notification history, which is kept when the tickets are archived."""
+
+    def get_queryset(self, request):
+        """Annotate the ticket numbers, of archived tickets as well."""
+        ticket_nos = [
+            Subquery(model.objects.filter(pk=OuterRef("ticket_id")).values("ticket_no")[:1])
+            for model in (Ticket, ArchivedTicket)
+        ]
+        return super().get_queryset(request).annotate(ticket_no=Coalesce(*ticket_nos))
+
+    @admin.display(description="Ticket", ordering="ticket_no")
+    def ticket_number(self, obj):
+        """Show the ticket number, the ticket may be archived."""
+        return f"Ticket No. {obj.ticket_no}" if obj.ticket_no else f"Ticket {obj.ticket_id}"
+
+
+@admin.register(NotificationJob)
+class NotificationJobAdmin(NotificationHistoryAdmin):
+    list_display = ("id", "ticket_number", "status", "attempts", "available_at", "locked_by", "locked_until", "batch")
+    list_filter = ("status",)
+    # counts per status show the progress of a batch filtered by `?batch=<id>`
+    show_facets = admin.ShowFacets.ALWAYS
+    raw_id_fields = ("ticket",)
+    readonly_fields = ("created_at", "updated_at", "locked_by", "locked_until", "last_error", "batch")
+
+
+@admin.register(FailedNotification)
+class FailedNotificationAdmin(NotificationHistoryAdmin):
+    list_display = (
+        "id",
+        "ticket_number",
+        "integration",
+        "action",
+        "error_class",
+        "attempts",
+        "created_at",
+        "replayed_at",
+    )
+    list_filter = ("integration", "error_class", "action", "replayed_at", "created_at")
+    search_fields = ("ticket_no", "error")
+    date_hierarchy = "created_at"
+    raw_id_fields = ("ticket", "job")
+    readonly_fields = ("created_at", "updated_at", "replayed_at")
+    actions = ("replay_selected",)
+
+    @admin.action(description="Replay selected failed notifications", permissions=["change"])
+    def replay_selected(self, request, queryset):
+        """Queue the selected failed notifications for replay."""
+        batch = replay_failed_notifications(queryset)
+        if not batch:
+            self.message_user(request, "No notifications to replay.", messages.WARNING)
+            return
+
+        self.message_user(
+            request,
+            format_html('Notifications queued for replay. <a href="{}">Show progress</a>', batch_progress_url(batch)),
+            messages.SUCCESS,
+        )
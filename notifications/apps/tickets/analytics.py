@@ -0,0 +1,96 @@
+from datetime import timedelta
+from typing import Collection, Dict, List, Optional, Sequence
+
+from clients.models import Client
+from django.db.models import Q, Sum
+from django.utils import timezone
+
+from tickets.constants import ANALYTICS_TOP_CLIENTS, TICKET_STATUS_CHOICES, TICKET_STATUS_CLOSED
+from tickets.models import TicketCount, TicketStatusRollup
+
+
+def ticket_counts(group_by: Sequence[str] = (), client_ids: Optional[Collection[Optional[int]]] = None) -> List[Dict]:
+    """
+    Count the current tickets per status and the given dimensions, from the ticket counts.
+
+    Args:
+        group_by (Sequence[str]): Additional dimensions to group by, `module` and/or `client_id`.
+        client_ids (Optional[Collection[Optional[int]]]): Only count the tickets of these clients, None for
+            tickets without client.
+
+    Returns:
+        List[Dict]: One row per group with its dimensions and the number of `tickets`.
+    """
+    counts = TicketCount.objects.all()
+    if client_ids is not None:
+        clients = Q(client_id__in=[client_id for client_id in client_ids if client_id is not None])
+        counts = counts.filter(clients | Q(client_id=None) if None in client_ids else clients)
+    rows = list(
+        counts.values("status", *group_by)
+        .annotate(tickets=Sum("tickets"))
+        .filter(tickets__gt=0)
+        .order_by(*group_by, "status")
+    )
+
+    if "client_id" in group_by:
+        client_names = dict(Client.objects.filter(pk__in={row["client_id"] for row in rows}).values_list("pk", "name"))
+        for row in rows:
+            row["client"] = client_names.get(row["client_id"], "N/A" if row["client_id"] is None else "Deleted")
+
+    return rows
+
+
+def top_clients(limit: int = ANALYTICS_TOP_CLIENTS) -> List[Optional[int]]:
+    """Return the ids of the clients with the most tickets which are not closed, None for tickets without client."""
+    return list(
+        TicketCount.objects.exclude(status=TICKET_STATUS_CLOSED)
+        .values("client_id")
+        .annotate(tickets=Sum("tickets"))
+        .filter(tickets__gt=0)
+        .order_by("-tickets", "client_id")
+        .values_list("client_id", flat=True)[:limit]
+    )
+
+
+def time_to_close_trend(days: int = 30) -> List[Dict]:
+    """
+    Compute the number of closed tickets and their average time to close per day, from the rollups.
+
+    Args:
+        days (int): Number of days to include, up to today.
+
+    Returns:
+        List[Dict]: One row per day with `date`, `closed` and `avg_hours_to_close`.
+    """
+    since = timezone.localdate() - timedelta(days=days - 1)
+    rows = (
+        TicketStatusRollup.objects.filter(status=TICKET_STATUS_CLOSED, date__gte=since)
+        .values("date")
+        .annotate(closed=Sum("closed"), close_duration=Sum("close_duration"))
+        .order_by("date")
+    )
+    return [
+        {
+            "date": row["date"],
+            "closed": row["closed"],
+            "avg_hours_to_close": round(row["close_duration"] / row["closed"] / 3600, 1) if row["closed"] else None,
+        }
+        for row in rows
+    ]
+
+
+def dashboard_data(days: int = 30) -> Dict:
+    """Collect all figures of the ticket analytics dashboard."""
+    status_labels = dict(TICKET_STATUS_CHOICES)
+    by_status = ticket_counts()
+    for row in by_status:
+        row["label"] = status_labels.get(row["status"], row["status"])
+
+    return {
+        "by_status": by_status,
+        "by_module": ticket_counts(group_by=("module",)),
+        # every client has a row per status, so only the busiest clients are shown
+        "by_client": ticket_counts(group_by=("client_id",), client_ids=top_clients()),
+        "top_clients": ANALYTICS_TOP_CLIENTS,
+        "time_to_close": time_to_close_trend(days=days),
+    }
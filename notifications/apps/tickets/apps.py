@@ -3,3 +3,7 @@ from django.apps import AppConfig
 
 class TicketsConfig(AppConfig):
     name = "tickets"
+
+    def ready(self):
+        """Register the signal receivers."""
+        from tickets import signals  # noqa: F401
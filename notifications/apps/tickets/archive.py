@@ -0,0 +1,96 @@
+from datetime import datetime, timedelta
+from typing import Optional
+
+from django.db import connection, transaction
+from django.db.models import Exists, OuterRef, QuerySet
+from django.utils import timezone
+
+from tickets.constants import (
+    NOTIFICATION_JOB_STATUS_PENDING,
+    NOTIFICATION_JOB_STATUS_RUNNING,
+    TICKET_ARCHIVE_AFTER_DAYS,
+    TICKET_ARCHIVE_BATCH_SIZE,
+    TICKET_STATUS_CLOSED,
+)
+from tickets.models import ArchivedTicket, FailedNotification, NotificationJob, Ticket
+from tickets.signals import suppress_rollups
+
+
+def archivable_tickets(closed_before: datetime) -> QuerySet:
+    """
+    Return the closed tickets last updated before the given time, which can be archived.
+
+    Tickets with queued notifications or with failed notifications which have not been replayed yet stay, so
+    the notification workers and the failed notifications admin keep working on them.
+
+    Args:
+        closed_before (datetime): Only tickets last updated before are returned.
+
+    Returns:
+        QuerySet: The archivable tickets.
+    """
+    queued_jobs = NotificationJob.objects.filter(
+        ticket=OuterRef("pk"), status__in=[NOTIFICATION_JOB_STATUS_PENDING, NOTIFICATION_JOB_STATUS_RUNNING]
+    )
+    failed_notifications = FailedNotification.objects.filter(ticket=OuterRef("pk"), replayed_at=None)
+    return Ticket.objects.filter(status=TICKET_STATUS_CLOSED, updated_at__lt=closed_before).exclude(
+        Exists(queued_jobs) | Exists(failed_notifications)
+    )
+
+
+def archive_ticket_batch(closed_before: datetime, batch_size: int = TICKET_ARCHIVE_BATCH_SIZE) -> int:
+    """
+    Move a batch of closed tickets to the archive, in a single short transaction.
+
+    The tickets are locked by primary key, tickets locked by a concurrent save are skipped where the database
+    supports it, and archived with a later batch. The archived tickets keep their id, so their status
+    transitions, notification jobs and failed notifications stay linked, and they are still counted in the
+    analytics rollups.
+
+    Args:
+        closed_before (datetime): Only tickets last updated before are archived.
+        batch_size (int): The maximum number of tickets to archive.
+
+    Returns:
+        int: The number of archived tickets, 0 once there are none left.
+    """
+    skip_locked = connection.features.has_select_for_update_skip_locked
+    with transaction.atomic():
+        tickets = list(
+            archivable_tickets(closed_before).select_for_update(skip_locked=skip_locked).order_by("pk")[:batch_size]
+        )
+        if not tickets:
+            return 0
+
+        ticket_ids = [ticket.pk for ticket in tickets]
+        ArchivedTicket.objects.bulk_create([ArchivedTicket.from_ticket(ticket) for ticket in tickets])
+        with suppress_rollups():
+            Ticket.objects.filter(pk__in=ticket_ids).delete()
+    return len(tickets)
+
+
+def archive_closed_tickets(
+    days: int = TICKET_ARCHIVE_AFTER_DAYS,
+    batch_size: int = TICKET_ARCHIVE_BATCH_SIZE,
+    max_batches: Optional[int] = None,
+) -> int:
+    """
+    Move the closed tickets which have not been updated for the given number of days to the archive.
+
+    Args:
+        days (int): The days since the last update of the tickets to archive.
+        batch_size (int): The number of tickets to archive per transaction.
+        max_batches (Optional[int]): Stop after this number of batches, e.g. to bound the runtime of a cron job.
+
+    Returns:
+        int: The number of archived tickets.
+    """
+    closed_before = timezone.now() - timedelta(days=days)
+    archived = batches = 0
+    while max_batches is None or batches < max_batches:
+        count = archive_ticket_batch(closed_before=closed_before, batch_size=batch_size)
+        if not count:
+            break
+        archived += count
+        batches += 1
+    return archived
@@ -0,0 +1,81 @@
+from typing import List, NamedTuple, Optional
+
+from django.db import transaction
+from django.db.models import QuerySet
+from django.utils import timezone
+
+from tickets.constants import TICKET_STATUS_CODES
+from tickets.models import NotificationJob, Ticket, TicketStatusRollup, TicketStatusTransition
+
+# fields which are loaded to apply bulk changes, besides the changed fields
+BULK_UPDATE_LOADED_FIELDS = ("id", "created_at", "draft", "status", "module", "client_id", "slack_message_ts")
+
+
+class BulkUpdateResult(NamedTuple):
+    updated: int
+    notified: int
+    batch: Optional[str]
+
+
+def bulk_update_tickets(queryset: QuerySet, notify: bool = True, **changes) -> BulkUpdateResult:
+    """
+    Apply the same changes to many tickets at once.
+
+    The tickets are written with a single `bulk_update` instead of one save per ticket. Status transitions and
+    analytics rollups are recorded like on save, and the Slack and Trello notifications of the changed tickets
+    are queued as one batch for the notification workers, which send them concurrently and rate limited.
+    Tickets which already match the changes are left untouched.
+
+    Args:
+        queryset (QuerySet): The tickets to change.
+        notify (bool): Whether the changes are visible in Slack and Trello, and notifications must be sent.
+        **changes: The new values, by field name.
+
+    Returns:
+        BulkUpdateResult: The number of changed tickets and of queued notifications, with the batch id.
+    """
+    now = timezone.now()
+    with transaction.atomic():
+        # lock the tickets by primary key, so the admin queryset's joins are not locked as well
+        tickets: List[Ticket] = list(
+            Ticket.objects.select_for_update()
+            .filter(pk__in=queryset.values("pk"))
+            .only(*{*BULK_UPDATE_LOADED_FIELDS, *changes})
+            .order_by("pk")
+        )
+
+        changed: List[Ticket] = []
+        transitions: List[TicketStatusTransition] = []
+        rollup_changes = []
+        for ticket in tickets:
+            if all(getattr(ticket, field) == value for field, value in changes.items()):
+                continue
+
+            old_status, old_rollup_key = ticket.status, ticket.rollup_key
+            for field, value in changes.items():
+                setattr(ticket, field, value)
+            ticket.updated_at = now
+            changed.append(ticket)
+
+            if ticket.status != old_status:
+                transitions.append(
+                    TicketStatusTransition(
+                        ticket_id=ticket.pk,
+                        from_status=TICKET_STATUS_CODES[old_status],
+                        to_status=TICKET_STATUS_CODES[ticket.status],
+                        created_at=now,
+                    )
+                )
+            if ticket.rollup_key != old_rollup_key:
+                rollup_changes.append((ticket, old_rollup_key, ticket.rollup_key))
+                ticket._loaded_rollup_key = ticket.rollup_key
+
+        # `bulk_update` skips `save`, which records the transitions and rollups of single tickets
+        Ticket.objects.bulk_update(changed, fields=[*changes, "updated_at"], batch_size=500)
+        TicketStatusTransition.objects.bulk_create(transitions, batch_size=500)
+        TicketStatusRollup.record_changes(rollup_changes)
+
+        notified = [ticket for ticket in changed if ticket.has_notifications] if notify else []
+        batch = NotificationJob.enqueue_batch(tickets=notified) if notified else None
+
+    return BulkUpdateResult(updated=len(changed), notified=len(notified), batch=batch)
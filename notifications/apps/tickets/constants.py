@@ -10,6 +10,20 @@ TICKET_STATUS_CHOICES = (
     (TICKET_STATUS_CLOSED, "Closed"),
 )
 
+# compact representation of the statuses in the status transition log, never change existing codes
+TICKET_STATUS_CODES = {
+    TICKET_STATUS_OPEN: 1,
+    TICKET_STATUS_BLOCKED: 2,
+    TICKET_STATUS_ACTIVE: 3,
+    TICKET_STATUS_CLOSED: 4,
+}
+TICKET_STATUS_BY_CODE = {code: status for status, code in TICKET_STATUS_CODES.items()}
+
+# ticket numbers are handed out by a database sequence, every process reserves a block of numbers at once
+TICKET_NO_SEQUENCE = "ticket_no"
+TICKET_NO_START = 10000
+TICKET_NO_BLOCK_SIZE = 100
+
 TICKET_MODULE_NONE = "none"
 TICKET_MODULE_SELLER_MATCH = "sellermatch"
 TICKET_MODULE_CALCULATOR = "calculator"
@@ -20,6 +34,85 @@ TICKET_MODULE_CHOICES = (
     (TICKET_MODULE_CALCULATOR, "Calculator"),
 )
 
+# ==================
+# NOTIFICATION QUEUE
+# ==================
+
+NOTIFICATION_JOB_STATUS_PENDING = "pending"
+NOTIFICATION_JOB_STATUS_RUNNING = "running"
+NOTIFICATION_JOB_STATUS_DONE = "done"
+NOTIFICATION_JOB_STATUS_FAILED = "failed"
+
+NOTIFICATION_JOB_STATUS_CHOICES = (
+    (NOTIFICATION_JOB_STATUS_PENDING, "Pending"),
+    (NOTIFICATION_JOB_STATUS_RUNNING, "Running"),
+    (NOTIFICATION_JOB_STATUS_DONE, "Done"),
+    (NOTIFICATION_JOB_STATUS_FAILED, "Failed"),
+)
+
+# jobs are sharded by ticket id, all jobs of a ticket are processed in order by the worker owning the shard
+NOTIFICATION_SHARDS = 64
+# seconds a claimed job stays leased to a worker without heartbeat, before other workers may reclaim it
+NOTIFICATION_JOB_LEASE = 60
+NOTIFICATION_JOB_MAX_ATTEMPTS = 5
+# seconds before a failed job is retried, doubled with every attempt
+NOTIFICATION_JOB_RETRY_DELAY = 30
+
+# ====================
+# FAILED NOTIFICATIONS
+# ====================
+
+INTEGRATION_SLACK = "slack"
+INTEGRATION_TRELLO = "trello"
+
+INTEGRATION_CHOICES = (
+    (INTEGRATION_SLACK, "Slack"),
+    (INTEGRATION_TRELLO, "Trello"),
+)
+
+# ========
+# ARCHIVAL
+# ========
+
+# days after their last update closed tickets are moved to the archive
+TICKET_ARCHIVE_AFTER_DAYS = 90
+# tickets moved per transaction, small batches keep locks short
+TICKET_ARCHIVE_BATCH_SIZE = 500
+
+# =========
+# ANALYTICS
+# =========
+
+# clients with the most tickets which are not closed yet, shown in the ticket analytics
+ANALYTICS_TOP_CLIENTS = 50
+
+# ====================
+# NOTIFICATION ROUTING
+# ====================
+
+# seconds after which a process recompiles the notification routes, to pick up changes made by other processes
+ROUTING_CACHE_TTL = 60
+
+# ========================
+# INTEGRATION HTTP SETTINGS
+# ========================
+
+# connect and read timeouts in seconds, without them a hanging integration blocks the ticket save
+INTEGRATION_REQUEST_TIMEOUT = (3.05, 10)
+
+# consecutive failures after which an integration is skipped, and seconds before it is probed again
+INTEGRATION_FAILURE_THRESHOLD = 5
+INTEGRATION_RECOVERY_TIMEOUT = 60
+
+# requests per second and burst size, per slack api method in the workspace and chat.postMessage per channel
+# (tier 3 methods allow about 50 per minute)
+SLACK_RATE_LIMIT = 50 / 60
+SLACK_RATE_LIMIT_BURST = 10
+
+# requests per second and burst size per trello token (100 requests per 10 seconds)
+TRELLO_RATE_LIMIT = 10
+TRELLO_RATE_LIMIT_BURST = 10
+
 # ==================
 # SLACK APP SETTINGS
 # ==================
@@ -35,3 +128,18 @@ SLACK_STATUS_REACTION = {
     TICKET_STATUS_ACTIVE: SLACK_REACTION_ACTIVE,
     TICKET_STATUS_CLOSED: SLACK_REACTION_CLOSED,
 }
+
+# ====================
+# DESCRIPTION RENDERING
+# ====================
+
+FORMAT_TRELLO = "trello"
+FORMAT_SLACK = "slack"
+
+# trello rejects card descriptions longer than 16384 characters
+TRELLO_DESCRIPTION_MAX_LENGTH = 16384
+# slack rejects section blocks with more than 3000 characters of text
+SLACK_DESCRIPTION_MAX_LENGTH = 3000
+
+DESCRIPTION_TRUNCATION_SUFFIX = "\n… (truncated)"
+DESCRIPTION_CACHE_SIZE = 256
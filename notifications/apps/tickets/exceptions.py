@@ -0,0 +1,39 @@
+from typing import Optional
+
+
+class NotificationError(Exception):
+    """Raised when a request to Slack or Trello failed, with everything needed to record and replay it."""
+
+    def __init__(self, integration: str, action: str, payload: Optional[dict], error_class: str, message: str):
+        """
+        Create the error.
+
+        Args:
+            integration (str): The failed integration, e.g. `INTEGRATION_SLACK`.
+            action (str): The API method or path of the request.
+            payload (Optional[dict]): The request body or query parameters.
+            error_class (str): The name of the error, e.g. of the requests exception.
+            message (str): The error message.
+        """
+        super().__init__(f"{integration} {action} failed with {error_class}: {message}")
+        self.integration = integration
+        self.action = action
+        # the request body or query parameters, never the api credentials
+        self.payload = payload
+        self.error_class = error_class
+        self.message = message
+
+    @classmethod
+    def from_exception(cls, integration: str, action: str, payload: Optional[dict], error: Exception):
+        """Create the error for a request which raised the given exception, e.g. a requests timeout."""
+        return cls(
+            integration=integration,
+            action=action,
+            payload=payload,
+            error_class=type(error).__name__,
+            message=str(error),
+        )
+
+
+class JobLeaseExpiredError(Exception):
+    """Recorded for jobs whose worker crashed or hung on every attempt, and whose lease expired after the last."""
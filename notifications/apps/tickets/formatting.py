@@ -0,0 +1,239 @@
+import hashlib
+import re
+import threading
+from collections import OrderedDict
+from html.parser import HTMLParser
+from typing import List, Optional, Tuple
+
+from tickets.constants import (
+    DESCRIPTION_CACHE_SIZE,
+    DESCRIPTION_TRUNCATION_SUFFIX,
+    FORMAT_SLACK,
+    FORMAT_TRELLO,
+    SLACK_DESCRIPTION_MAX_LENGTH,
+    TRELLO_DESCRIPTION_MAX_LENGTH,
+)
+
+# markers used for inline formatting, per target format
+INLINE_MARKERS = {
+    FORMAT_TRELLO: {"bold": "**", "italic": "*", "strike": "~~", "code": "`"},
+    FORMAT_SLACK: {"bold": "*", "italic": "_", "strike": "~", "code": "`"},
+}
+
+BOLD_TAGS = {"b", "strong"}
+ITALIC_TAGS = {"i", "em"}
+STRIKE_TAGS = {"s", "strike", "del"}
+BLOCK_TAGS = {"p", "div", "blockquote", "table", "tr", "h1", "h2", "h3", "h4", "h5", "h6"}
+IGNORED_TAGS = {"script", "style", "head", "title"}
+
+_description_cache: "OrderedDict[Tuple[bytes, str, int], str]" = OrderedDict()
+_description_cache_lock = threading.Lock()
+
+
+class _BudgetExceededError(Exception):
+    """Raised internally to stop parsing once the output length budget is used up."""
+
+
+class _MarkdownConverter(HTMLParser):
+    """Streaming HTML parser which renders CKEditor HTML as Trello markdown or Slack mrkdwn."""
+
+    def __init__(self, target: str, max_length: int):
+        super().__init__(convert_charrefs=True)
+        self.target = target
+        self.markers = INLINE_MARKERS[target]
+        self.max_length = max_length
+        self.parts: List[str] = []
+        self.length = 0
+        self.truncated = False
+        self.ignored = 0
+        self.pre = 0
+        self.lists: List[List] = []
+        self.links: List[Tuple[Optional[str], int]] = []
+
+    def emit(self, text: str):
+        if not text:
+            return
+        self.parts.append(text)
+        self.length += len(text)
+        if self.length > self.max_length:
+            self.truncated = True
+            raise _BudgetExceededError()
+
+    def escape(self, text: str) -> str:
+        if self.target == FORMAT_SLACK:
+            return text.replace("&", "&amp;").replace("<", "&lt;").replace(">", "&gt;")
+        return text
+
+    def escape_href(self, href: str) -> str:
+        # characters which would end the link early are percent-encoded, like browsers do
+        if self.target == FORMAT_SLACK:
+            return href.replace("&", "&amp;").replace("<", "%3C").replace(">", "%3E").replace("|", "%7C")
+        return href.replace(" ", "%20").replace("(", "%28").replace(")", "%29")
+
+    def handle_starttag(self, tag, attrs):
+        if tag in IGNORED_TAGS:
+            self.ignored += 1
+        elif tag in ("ul", "ol"):
+            # nested lists continue right below their parent list item
+            if not self.lists:
+                self.emit("\n\n")
+            self.lists.append([tag, 0])
+        elif tag in BLOCK_TAGS:
+            self.emit("\n\n")
+            if tag[0] == "h" and self.target == FORMAT_TRELLO:
+                self.emit("#" * int(tag[1]) + " ")
+            elif tag[0] == "h":
+                self.emit(self.markers["bold"])
+            elif tag == "blockquote":
+                self.emit("> ")
+        elif tag == "br":
+            self.emit("\n")
+        elif tag == "li":
+            self.handle_list_item()
+        elif tag == "pre":
+            self.pre += 1
+            self.emit("\n```\n")
+        elif tag == "code" and not self.pre:
+            self.emit(self.markers["code"])
+        elif tag in BOLD_TAGS:
+            self.emit(self.markers["bold"])
+        elif tag in ITALIC_TAGS:
+            self.emit(self.markers["italic"])
+        elif tag in STRIKE_TAGS:
+            self.emit(self.markers["strike"])
+        elif tag == "a":
+            self.links.append((dict(attrs).get("href"), len(self.parts)))
+        elif tag == "img":
+            self.emit(self.escape(dict(attrs).get("alt") or ""))
+
+    def handle_startendtag(self, tag, attrs):
+        self.handle_starttag(tag, attrs)
+        if tag not in ("br", "img"):
+            self.handle_endtag(tag)
+
+    def handle_endtag(self, tag):
+        if tag in IGNORED_TAGS:
+            self.ignored = max(self.ignored - 1, 0)
+        elif tag in ("ul", "ol"):
+            if self.lists:
+                self.lists.pop()
+            if not self.lists:
+                self.emit("\n\n")
+        elif tag in BLOCK_TAGS:
+            if tag[0] == "h" and self.target == FORMAT_SLACK:
+                self.emit(self.markers["bold"])
+            self.emit("\n\n")
+        elif tag == "pre" and self.pre:
+            self.pre -= 1
+            self.emit("\n```\n")
+        elif tag == "code" and not self.pre:
+            self.emit(self.markers["code"])
+        elif tag in BOLD_TAGS:
+            self.emit(self.markers["bold"])
+        elif tag in ITALIC_TAGS:
+            self.emit(self.markers["italic"])
+        elif tag in STRIKE_TAGS:
+            self.emit(self.markers["strike"])
+        elif tag == "a" and self.links:
+            self.handle_link(*self.links.pop())
+
+    def handle_data(self, data):
+        if self.ignored:
+            return
+        if not self.pre:
+            data = re.sub(r"\s+", " ", data)
+            if not self.parts or self.parts[-1].endswith("\n"):
+                data = data.lstrip()
+        self.emit(self.escape(data))
+
+    def handle_list_item(self):
+        if not self.lists:
+            self.lists.append(["ul", 0])
+        current = self.lists[-1]
+        current[1] += 1
+        indent = "  " * (len(self.lists) - 1)
+        if current[0] == "ol":
+            bullet = f"{current[1]}. "
+        else:
+            bullet = "• " if self.target == FORMAT_SLACK else "- "
+        self.emit(f"\n{indent}{bullet}")
+
+    def handle_link(self, href: Optional[str], start: int):
+        text = "".join(self.parts[start:]).strip()
+        if not href or href == text:
+            return
+        self.length -= sum(len(part) for part in self.parts[start:])
+        del self.parts[start:]
+        href = self.escape_href(href)
+        if self.target == FORMAT_SLACK:
+            link = f"<{href}|{text}>" if text else f"<{href}>"
+        else:
+            link = f"[{text or href}]({href})"
+        self.emit(link)
+
+    def render(self, html: str) -> str:
+        try:
+            self.feed(html)
+            self.close()
+        except _BudgetExceededError:
+            pass
+
+        text = "".join(self.parts)
+        text = re.sub(r"[ \t]+\n", "\n", text)
+        text = re.sub(r"\n{3,}", "\n\n", text).strip()
+
+        if self.truncated or len(text) > self.max_length:
+            fence = "\n```" if self.pre else ""
+            text = text[: self.max_length - len(DESCRIPTION_TRUNCATION_SUFFIX) - len(fence)]
+            if self.target == FORMAT_SLACK:
+                # drop a link or an escaped character cut in half, e.g. `<https://exa` or `&am`
+                text = re.sub(r"(<[^>]*|&[a-z]*)$", "", text)
+            text = text.rstrip()
+            text = f"{text}{fence}{DESCRIPTION_TRUNCATION_SUFFIX}"
+
+        return text
+
+
+def html_to_markdown(html: Optional[str], target: str, max_length: int) -> str:
+    """
+    Convert rich text HTML into the markdown dialect of the given target.
+
+    Parsing stops as soon as the output exceeds `max_length`, so huge pasted logs are never fully processed,
+    and the result is truncated with a marker. Results are kept in a small LRU cache keyed by a hash of the
+    HTML, which avoids parsing the same description again on every ticket update.
+
+    Args:
+        html (Optional[str]): The HTML as stored by the CKEditor rich text field.
+        target (str): The target format, either `FORMAT_TRELLO` or `FORMAT_SLACK`.
+        max_length (int): The maximum number of characters of the returned text.
+
+    Returns:
+        str: The converted text, empty if there is no HTML.
+    """
+    if not html:
+        return ""
+
+    key = (hashlib.blake2b(html.encode("utf-8"), digest_size=16).digest(), target, max_length)
+    with _description_cache_lock:
+        if key in _description_cache:
+            _description_cache.move_to_end(key)
+            return _description_cache[key]
+
+    text = _MarkdownConverter(target=target, max_length=max_length).render(html)
+
+    with _description_cache_lock:
+        _description_cache[key] = text
+        if len(_description_cache) > DESCRIPTION_CACHE_SIZE:
+            _description_cache.popitem(last=False)
+
+    return text
+
+
+def html_to_trello_markdown(html: Optional[str]) -> str:
+    """Convert rich text HTML into a Trello card description."""
+    return html_to_markdown(html, target=FORMAT_TRELLO, max_length=TRELLO_DESCRIPTION_MAX_LENGTH)
+
+
+def html_to_slack_mrkdwn(html: Optional[str]) -> str:
+    """Convert rich text HTML into Slack mrkdwn fitting into a single section block."""
+    return html_to_markdown(html, target=FORMAT_SLACK, max_length=SLACK_DESCRIPTION_MAX_LENGTH)
@@ -0,0 +1,34 @@
+from datetime import timedelta
+
+from django.core.management import BaseCommand
+from django.utils import timezone
+
+from tickets.archive import archivable_tickets, archive_closed_tickets
+from tickets.constants import TICKET_ARCHIVE_AFTER_DAYS, TICKET_ARCHIVE_BATCH_SIZE
+
+
+class Command(BaseCommand):
+    help = "Move closed tickets which have not been updated for a while to the archive, in small batches."
+
+    def add_arguments(self, parser):
+        """Add the archive options."""
+        parser.add_argument(
+            "--days", type=int, default=TICKET_ARCHIVE_AFTER_DAYS, help="Archive tickets closed for this many days."
+        )
+        parser.add_argument(
+            "--batch-size", type=int, default=TICKET_ARCHIVE_BATCH_SIZE, help="Tickets to archive per transaction."
+        )
+        parser.add_argument("--max-batches", type=int, help="Stop after this number of batches, defaults to all.")
+        parser.add_argument("--dry-run", action="store_true", help="Only count the tickets to archive.")
+
+    def handle(self, *args, **options):
+        """Archive the closed tickets, or only count them with --dry-run."""
+        if options["dry_run"]:
+            count = archivable_tickets(closed_before=timezone.now() - timedelta(days=options["days"])).count()
+            print(f"Found {count} closed ticket(s) to archive.")
+            return
+
+        count = archive_closed_tickets(
+            days=options["days"], batch_size=max(1, options["batch_size"]), max_batches=options["max_batches"]
+        )
+        print(f"Archived {count} closed ticket(s).")
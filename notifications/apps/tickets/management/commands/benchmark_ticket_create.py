@@ -0,0 +1,88 @@
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, NamedTuple
+
+from django.conf import settings
+from django.core.management import BaseCommand
+from django.db import OperationalError, connection
+
+from tickets.models import Ticket, TicketStatusTransition
+
+BENCHMARK_TITLE = "Benchmark ticket"
+
+
+class WriterResult(NamedTuple):
+    # durations in seconds of the successful saves and of the saves which failed with a lock error
+    durations: List[float]
+    failed_durations: List[float]
+    ticket_ids: List[int]
+
+
+def create_tickets(count: int) -> WriterResult:
+    """Create draft tickets one by one, returns the duration of each save and the ids of the created tickets."""
+    result = WriterResult(durations=[], failed_durations=[], ticket_ids=[])
+    try:
+        for index in range(count):
+            start = time.perf_counter()
+            try:
+                ticket = Ticket.objects.create(title=BENCHMARK_TITLE, description=f"<p>Ticket {index}</p>")
+            except OperationalError:
+                result.failed_durations.append(time.perf_counter() - start)
+            else:
+                result.durations.append(time.perf_counter() - start)
+                result.ticket_ids.append(ticket.pk)
+    finally:
+        connection.close()
+    return result
+
+
+def format_latency(durations: List[float]) -> str:
+    """Format the percentiles of the given durations."""
+    if not durations:
+        return "-"
+    durations = sorted(durations)
+    return (
+        f"p50={durations[len(durations) // 2] * 1000:.1f}ms, "
+        f"p95={durations[int(len(durations) * 0.95)] * 1000:.1f}ms, "
+        f"max={durations[-1] * 1000:.1f}ms"
+    )
+
+
+class Command(BaseCommand):
+    help = "Measure the ticket create throughput of the configured database profile."
+
+    def add_arguments(self, parser):
+        """Add the benchmark options."""
+        parser.add_argument("--tickets", type=int, default=1000, help="Number of tickets to create.")
+        parser.add_argument("--concurrency", type=int, default=8, help="Number of concurrent writers.")
+        parser.add_argument("--keep", action="store_true", help="Keep the created tickets.")
+
+    def handle(self, *args, **options):
+        """Create the tickets concurrently, report the throughput and latency, and remove the tickets again."""
+        concurrency = max(1, options["concurrency"])
+        per_writer = max(1, options["tickets"] // concurrency)
+
+        print(f"Database profile: {settings.DATABASE_ENGINE} ({connection.vendor})")
+        print(f"Creating {per_writer * concurrency} draft tickets with {concurrency} concurrent writers..")
+
+        # draft tickets don't send notifications, so only the database is measured
+        start = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=concurrency) as executor:
+            results = list(executor.map(create_tickets, [per_writer] * concurrency))
+        elapsed = time.perf_counter() - start
+
+        durations = [duration for result in results for duration in result.durations]
+        failed_durations = [duration for result in results for duration in result.failed_durations]
+        ticket_ids = [ticket_id for result in results for ticket_id in result.ticket_ids]
+
+        print(f"Created {len(ticket_ids)} tickets in {elapsed:.2f}s: {len(ticket_ids) / elapsed:.1f} tickets/s")
+        print(f"Save latency: {format_latency(durations)}")
+        print(f"Lock errors: {len(failed_durations)}, latency until failed: {format_latency(failed_durations)}")
+
+        if not options["keep"]:
+            # only the tickets of this run are removed, in batches
+            for index in range(0, len(ticket_ids), 1000):
+                batch = ticket_ids[index : index + 1000]
+                TicketStatusTransition.objects.filter(ticket_id__in=batch).delete()
+                Ticket.objects.filter(id__in=batch).delete()
+            print("Removed the benchmark tickets.")
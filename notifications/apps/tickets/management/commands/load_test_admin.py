@@ -0,0 +1,392 @@
+import json
+import random
+import sys
+import threading
+import time
+import uuid
+from collections import Counter, defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional, Tuple
+
+import requests
+from clients.models import Client
+from core.models import CoreSettings
+from django.conf import settings
+from django.contrib.admin.utils import flatten_fieldsets
+from django.contrib.auth import get_user_model
+from django.core.management import BaseCommand
+from django.core.servers.basehttp import ThreadedWSGIServer, WSGIRequestHandler, get_internal_wsgi_application
+from django.core.signals import got_request_exception
+from django.db import OperationalError, connection
+from django.forms.models import model_to_dict
+from django.test.utils import override_settings, setup_databases, teardown_databases
+from django.utils import timezone
+
+from tickets.admin import TicketAdmin
+from tickets.constants import TICKET_STATUS_CHOICES
+from tickets.models import Ticket, TicketCount, TicketStatusRollup, TicketStatusTransition
+from tickets.standins import IntegrationStandIn
+
+User = get_user_model()
+
+LOAD_TEST_PREFIX = "loadtest"
+LOAD_TEST_TITLE = "Load test ticket"
+FLOWS = ("changelist", "search", "change_form", "save")
+# fields of the ticket change form, which are posted back on save
+TICKET_FORM_FIELDS = [
+    field for field in flatten_fieldsets(TicketAdmin.fieldsets) if field not in TicketAdmin.readonly_fields
+]
+
+# one result per request: flow, duration in seconds and status code
+Result = Tuple[str, float, int]
+
+
+class QuietWSGIRequestHandler(WSGIRequestHandler):
+    def log_message(self, format, *args):
+        """Skip logging, requests are measured instead."""
+
+
+def percentile(durations: List[float], fraction: float) -> float:
+    """Return the given percentile of the sorted durations, in ms."""
+    if not durations:
+        return 0.0
+    return durations[min(int(len(durations) * fraction), len(durations) - 1)] * 1000
+
+
+def ticket_form_data(ticket: Ticket, status: str) -> Dict[str, str]:
+    """Return the POST data of the ticket change form, with a new status."""
+    data = {}
+    for field, value in model_to_dict(ticket, fields=TICKET_FORM_FIELDS).items():
+        if isinstance(value, bool):
+            # unchecked checkboxes are not posted
+            if value:
+                data[field] = "on"
+        else:
+            data[field] = "" if value is None else str(value)
+    data["status"] = status
+    data["_save"] = "Save"
+    return data
+
+
+class Agent:
+    """A support agent working through the admin: list, search, open and save tickets."""
+
+    def __init__(self, base_url: str, username: str, password: str, ticket_ids: List[int], seed: int):
+        """
+        Create the agent, with its own session.
+
+        Args:
+            base_url (str): The url of the server.
+            username (str): The username of the staff user to log in with.
+            password (str): The password of the staff user.
+            ticket_ids (List[int]): The tickets to work on.
+            seed (int): The seed of the random choices of the agent, to repeat load tests.
+        """
+        self.base_url = base_url
+        self.username = username
+        self.password = password
+        self.ticket_ids = ticket_ids
+        self.random = random.Random(seed)
+        self.session = requests.Session()
+        self.results: List[Result] = []
+
+    def request(self, flow: str, method: str, path: str, **kwargs) -> requests.Response:
+        """Send a request of the given flow and record its duration and status code."""
+        start = time.perf_counter()
+        response = self.session.request(method, f"{self.base_url}{path}", allow_redirects=False, **kwargs)
+        self.results.append((flow, time.perf_counter() - start, response.status_code))
+        return response
+
+    def csrf_headers(self) -> Dict[str, str]:
+        """Return the CSRF header for posting forms with the session."""
+        return {"X-CSRFToken": self.session.cookies.get("csrftoken", "")}
+
+    def login(self):
+        """Log in to the admin."""
+        self.session.get(f"{self.base_url}/{settings.ADMIN_URL}login/")
+        self.session.post(
+            f"{self.base_url}/{settings.ADMIN_URL}login/",
+            data={"username": self.username, "password": self.password, "next": f"/{settings.ADMIN_URL}"},
+            headers=self.csrf_headers(),
+            allow_redirects=False,
+        )
+
+    def run(self, deadline: float) -> List[Result]:
+        """
+        Work through the tickets until the deadline.
+
+        Args:
+            deadline (float): The `time.monotonic()` to stop at.
+
+        Returns:
+            List[Result]: The results of all requests.
+        """
+        admin_url = f"/{settings.ADMIN_URL}tickets/ticket/"
+        try:
+            self.login()
+            while time.monotonic() < deadline:
+                ticket_id = self.random.choice(self.ticket_ids)
+                self.request("changelist", "GET", admin_url)
+                self.request("search", "GET", admin_url, params={"q": self.random.choice(["load", "test", "ticket"])})
+                self.request("change_form", "GET", f"{admin_url}{ticket_id}/change/")
+
+                ticket = Ticket.objects.filter(pk=ticket_id).first()
+                if ticket:
+                    status = self.random.choice([value for value, _ in TICKET_STATUS_CHOICES if value != ticket.status])
+                    self.request(
+                        "save",
+                        "POST",
+                        f"{admin_url}{ticket_id}/change/",
+                        data=ticket_form_data(ticket, status=status),
+                        headers=self.csrf_headers(),
+                    )
+        finally:
+            connection.close()
+        return self.results
+
+
+class Command(BaseCommand):
+    help = (
+        "Load test the admin ticket workflow with concurrent support agents, against wsgi.py served in process "
+        "on a throwaway test database and with local Slack and Trello stand-ins."
+    )
+
+    def add_arguments(self, parser):
+        """Add the load test options."""
+        parser.add_argument("--agents", type=int, default=8, help="Number of concurrent support agents.")
+        parser.add_argument("--duration", type=float, default=30, help="Seconds to run the load test for.")
+        parser.add_argument("--tickets", type=int, default=500, help="Number of tickets to create for the test.")
+        parser.add_argument("--clients", type=int, default=1000, help="Number of clients to create for the test.")
+        parser.add_argument(
+            "--integration-latency", type=float, default=100, help="Response time of the Slack/Trello stand-ins in ms."
+        )
+        parser.add_argument(
+            "--rate-limits", action="store_true", help="Keep the Slack and Trello rate limits of this process."
+        )
+        parser.add_argument(
+            "--url",
+            help="Load test a running server instead, e.g. http://127.0.0.1:8000 for asgi.py served by uvicorn. "
+            "Start it with SLACK_API_URL and TRELLO_API_URL pointing to the stand-ins, see --standin-port. The "
+            "test data is created in the configured database, which the server must use as well.",
+        )
+        parser.add_argument("--standin-port", type=int, default=0, help="Port of the stand-ins, defaults to any.")
+        parser.add_argument("--output", help="Append the results as a JSON line to this file, to track capacity.")
+        parser.add_argument(
+            "--keep", action="store_true", help="Keep the test database, or with --url the created test data."
+        )
+
+    def handle(self, *args, **options):
+        """Run the load test and report the results."""
+        standin = IntegrationStandIn(
+            port=options["standin_port"], latency=options["integration_latency"] / 1000
+        ).start()
+        # the stand-ins have no rate limits, without --rate-limits measure the capacity of the admin instead
+        integration_settings = override_settings(
+            SLACK_API_URL=standin.slack_api_url,
+            TRELLO_API_URL=standin.trello_api_url,
+            INTEGRATION_RATE_LIMITS=options["rate_limits"],
+        )
+        try:
+            if options["url"]:
+                print(f"Stand-ins: SLACK_API_URL={standin.slack_api_url} TRELLO_API_URL={standin.trello_api_url}")
+                with integration_settings:
+                    report = self.run_load_test(base_url=options["url"].rstrip("/"), standin=standin, options=options)
+            else:
+                # the superusers and test data never touch the configured database
+                test_databases = setup_databases(
+                    verbosity=0,
+                    interactive=False,
+                    keepdb=options["keep"],
+                    aliases={"default"},
+                    serialized_aliases=set(),
+                )
+                try:
+                    with integration_settings:
+                        report = self.run_in_process(standin=standin, options=options)
+                finally:
+                    teardown_databases(test_databases, verbosity=0, keepdb=options["keep"])
+        finally:
+            standin.shutdown()
+
+        if options["output"]:
+            with open(options["output"], "a") as output:
+                line = {
+                    "time": timezone.now().isoformat(),
+                    "database": connection.vendor,
+                    "notifications_async": settings.NOTIFICATIONS_ASYNC,
+                    **{key: options[key] for key in ("agents", "duration", "tickets", "integration_latency")},
+                    **report,
+                }
+                output.write(json.dumps(line) + "\n")
+
+    def run_in_process(self, standin: IntegrationStandIn, options: dict) -> dict:
+        """Serve wsgi.py in process and load test it, counting the exceptions of the server."""
+        server = ThreadedWSGIServer(("127.0.0.1", 0), QuietWSGIRequestHandler)
+        server.set_app(get_internal_wsgi_application())
+        threading.Thread(target=server.serve_forever, name="load-test-server", daemon=True).start()
+
+        exceptions: Counter = Counter()
+
+        def count_exception(sender, request=None, **kwargs):
+            # the signal doesn't pass the exception, it is sent while the exception is handled
+            exceptions[type(sys.exc_info()[1]).__name__] += 1
+
+        got_request_exception.connect(count_exception, weak=False)
+        try:
+            base_url = f"http://127.0.0.1:{server.server_address[1]}"
+            return self.run_load_test(base_url=base_url, standin=standin, options=options, exceptions=exceptions)
+        finally:
+            got_request_exception.disconnect(count_exception)
+            server.shutdown()
+
+    def run_load_test(
+        self, base_url: str, standin: IntegrationStandIn, options: dict, exceptions: Optional[Counter] = None
+    ) -> dict:
+        """
+        Create the test data, run the agents against the server and report the results.
+
+        Args:
+            base_url (str): The url of the server.
+            standin (IntegrationStandIn): The stand-ins the server sends the notifications to.
+            options (dict): The options of the command.
+            exceptions (Optional[Counter]): The exceptions of the server, if it is served in process.
+
+        Returns:
+            dict: The report.
+        """
+        run_id = uuid.uuid4().hex[:8]
+        print(
+            f"Database profile: {settings.DATABASE_ENGINE} ({connection.vendor}, {connection.settings_dict['NAME']}), "
+            f"async notifications: {settings.NOTIFICATIONS_ASYNC}"
+        )
+        print(f"Creating {options['clients']} clients, {options['tickets']} tickets and {options['agents']} agents..")
+        core_settings_created = False
+        if not CoreSettings.objects.exists():
+            CoreSettings.objects.create(slack_token="standin", slack_channel_id="C0STANDIN", trello_list_id="standin")
+            core_settings_created = True
+        password = uuid.uuid4().hex
+        usernames = [f"{LOAD_TEST_PREFIX}-{run_id}-{index}" for index in range(max(1, options["agents"]))]
+        ticket_ids = self.create_data(run_id=run_id, usernames=usernames, password=password, options=options)
+
+        try:
+            print(f"Running {len(usernames)} agents for {options['duration']:.0f}s against {base_url}..")
+            deadline = time.monotonic() + options["duration"]
+            agents = [
+                Agent(base_url=base_url, username=username, password=password, ticket_ids=ticket_ids, seed=index)
+                for index, username in enumerate(usernames)
+            ]
+            start = time.perf_counter()
+            with ThreadPoolExecutor(max_workers=len(agents)) as executor:
+                results = [
+                    result for results in executor.map(lambda agent: agent.run(deadline), agents) for result in results
+                ]
+            elapsed = time.perf_counter() - start
+        finally:
+            # the test database is removed as a whole
+            if options["url"] and not options["keep"]:
+                self.remove_data(run_id=run_id, core_settings_created=core_settings_created)
+
+        return self.report(results=results, elapsed=elapsed, exceptions=exceptions, standin=standin)
+
+    def create_data(self, run_id: str, usernames: List[str], password: str, options: dict) -> List[int]:
+        """Create the superusers of the agents, the clients and published tickets, returns the ticket ids."""
+        for username in usernames:
+            User.objects.create_superuser(username=username, email="", password=password)
+
+        clients = Client.objects.bulk_create(
+            [Client(name=f"{LOAD_TEST_PREFIX}-{run_id} client {index}") for index in range(max(1, options["clients"]))],
+            batch_size=1000,
+        )
+        # published tickets with a slack message, so saves update slack like in production
+        tickets = [
+            Ticket(
+                title=f"{LOAD_TEST_TITLE} {run_id} {index}",
+                description=f"<p>{LOAD_TEST_TITLE} <b>{index}</b></p>",
+                client=random.choice(clients),
+                draft=False,
+                trello_ticket_created=True,
+                trello_ticket_id=f"{LOAD_TEST_PREFIX}-{index}",
+                slack_notification_sent=True,
+                slack_message_ts=f"{index}.000000",
+                slack_channel_id="C0STANDIN",
+            )
+            for index in range(max(1, options["tickets"]))
+        ]
+        Ticket.assign_ticket_numbers(tickets)
+        return [ticket.pk for ticket in Ticket.objects.bulk_create(tickets, batch_size=1000)]
+
+    def remove_data(self, run_id: str, core_settings_created: bool):
+        """Remove the data created by the given run from the configured database."""
+        tickets = Ticket.objects.filter(title__startswith=f"{LOAD_TEST_TITLE} {run_id} ")
+        TicketStatusTransition.objects.filter(ticket_id__in=tickets.values("pk")).delete()
+        tickets.delete()
+        clients = Client.objects.filter(name__startswith=f"{LOAD_TEST_PREFIX}-{run_id} ")
+        # every load test ticket has a load test client, so this removes its status changes from the rollups
+        TicketStatusRollup.objects.filter(client_id__in=clients.values("pk")).delete()
+        TicketCount.objects.filter(client_id__in=clients.values("pk")).delete()
+        clients.delete()
+        User.objects.filter(username__startswith=f"{LOAD_TEST_PREFIX}-{run_id}-").delete()
+        if core_settings_created:
+            CoreSettings.objects.filter(slack_token="standin").delete()
+        print("Removed the load test data.")
+
+    def report(
+        self, results: List[Result], elapsed: float, exceptions: Optional[Counter], standin: IntegrationStandIn
+    ) -> dict:
+        """
+        Print and return the throughput, latency percentiles and errors per flow, and the integration calls.
+
+        Args:
+            results (List[Result]): The results of all requests.
+            elapsed (float): The duration of the load test in seconds.
+            exceptions (Optional[Counter]): The exceptions of the server, None if it runs in another process.
+            standin (IntegrationStandIn): The stand-ins, which counted the integration calls.
+
+        Returns:
+            dict: The report.
+        """
+        durations: Dict[str, List[float]] = defaultdict(list)
+        errors: Counter = Counter()
+        server_errors = 0
+        for flow, duration, status_code in results:
+            durations[flow].append(duration)
+            # saves redirect on success, a rendered form means the save was rejected
+            if status_code >= 400 or (flow == "save" and status_code != 302):
+                errors[flow] += 1
+            server_errors += status_code >= 500
+        # lock timeouts and deadlocks raise OperationalError in the server, which only a server in process reports
+        lock_errors = exceptions[OperationalError.__name__] if exceptions is not None else None
+
+        flows: Dict[str, dict] = {}
+        print(f"{'flow':<12} {'requests':>8} {'errors':>6} {'p50':>9} {'p95':>9} {'p99':>9} {'max':>9}")
+        for flow in FLOWS:
+            flow_durations = sorted(durations[flow])
+            flows[flow] = {
+                "requests": len(flow_durations),
+                "errors": errors[flow],
+                "p50": round(percentile(flow_durations, 0.5), 1),
+                "p95": round(percentile(flow_durations, 0.95), 1),
+                "p99": round(percentile(flow_durations, 0.99), 1),
+                "max": round(percentile(flow_durations, 1.0), 1),
+            }
+            print(
+                f"{flow:<12} {len(flow_durations):>8} {errors[flow]:>6} "
+                + " ".join(f"{flows[flow][key]:>7.1f}ms" for key in ("p50", "p95", "p99", "max"))
+            )
+
+        report = {
+            "requests_per_second": round(len(results) / elapsed, 1),
+            "saves_per_second": round(len(durations["save"]) / elapsed, 1),
+            "server_errors": server_errors,
+            "lock_errors": lock_errors,
+            "server_exceptions": dict(exceptions) if exceptions is not None else None,
+            "integration_calls": dict(standin.calls),
+            "flows": flows,
+        }
+        print(f"Throughput: {report['requests_per_second']} requests/s, {report['saves_per_second']} saves/s")
+        print(
+            f"Server errors: {server_errors}, lock errors: {'n/a' if lock_errors is None else lock_errors}, "
+            f"server exceptions: {'n/a' if exceptions is None else dict(exceptions) or 'none'}"
+        )
+        print(f"Integration calls: {dict(standin.calls) or 'none'}")
+        return report
@@ -0,0 +1,64 @@
+from collections import defaultdict
+from itertools import chain
+from typing import Dict, List
+
+from django.core.management import BaseCommand
+from django.db import transaction
+from django.utils import timezone
+
+from tickets.constants import TICKET_STATUS_CLOSED
+from tickets.models import ArchivedTicket, Ticket, TicketCount, TicketStatusRollup
+
+
+class Command(BaseCommand):
+    help = "Rebuild the ticket analytics rollups and counts from the current and the archived tickets."
+
+    def handle(self, *args, **options):
+        """Replace all rollups and ticket counts with the counts of the current and archived tickets."""
+        # without a history, tickets are counted as entering their current status when created,
+        # closed tickets when last updated
+        totals: Dict[tuple, List[int]] = defaultdict(lambda: [0, 0])
+        fields = ("status", "module", "client_id", "created_at", "updated_at")
+        tickets = chain(
+            Ticket.objects.values_list(*fields).iterator(chunk_size=2000),
+            ArchivedTicket.objects.values_list(*fields).iterator(chunk_size=2000),
+        )
+        for status, module, client_id, created_at, updated_at in tickets:
+            changed_at = updated_at if status == TICKET_STATUS_CLOSED else created_at
+            date = timezone.localdate(changed_at) if changed_at else timezone.localdate()
+            total = totals[(date, status, module, client_id)]
+            total[0] += 1
+            if status == TICKET_STATUS_CLOSED and created_at and updated_at:
+                total[1] += int((updated_at - created_at).total_seconds())
+
+        with transaction.atomic():
+            TicketCount.objects.all().delete()
+            counts: Dict[tuple, int] = defaultdict(int)
+            for (_, status, module, client_id), (entered, _) in totals.items():
+                counts[(status, module, client_id)] += entered
+            TicketCount.objects.bulk_create(
+                [
+                    TicketCount(status=status, module=module, client_id=client_id, tickets=tickets)
+                    for (status, module, client_id), tickets in counts.items()
+                ],
+                batch_size=1000,
+            )
+
+            TicketStatusRollup.objects.all().delete()
+            TicketStatusRollup.objects.bulk_create(
+                [
+                    TicketStatusRollup(
+                        date=date,
+                        status=status,
+                        module=module,
+                        client_id=client_id,
+                        entered=entered,
+                        closed=entered if status == TICKET_STATUS_CLOSED else 0,
+                        close_duration=close_duration,
+                    )
+                    for (date, status, module, client_id), (entered, close_duration) in totals.items()
+                ],
+                batch_size=1000,
+            )
+
+        print(f"Rebuilt {len(totals)} ticket rollups and {len(counts)} ticket counts.")
@@ -0,0 +1,50 @@
+from datetime import datetime, time
+
+from django.core.management import BaseCommand, CommandError
+from django.utils import timezone
+from django.utils.dateparse import parse_date, parse_datetime
+
+from tickets.constants import INTEGRATION_CHOICES
+from tickets.models import FailedNotification
+from tickets.queue import replay_failed_notifications
+
+
+def parse_time(value: str) -> datetime:
+    """Parse a date or datetime argument, naive values are in the current time zone."""
+    parsed = parse_datetime(value)
+    if parsed is None:
+        date = parse_date(value)
+        if date is None:
+            raise CommandError(f"Invalid date or datetime: {value}")
+        parsed = datetime.combine(date, time.min)
+    return parsed if timezone.is_aware(parsed) else timezone.make_aware(parsed)
+
+
+class Command(BaseCommand):
+    help = "Replay the notifications which failed in a time range, e.g. after an outage of Slack or Trello."
+
+    def add_arguments(self, parser):
+        """Add the time range and integration filters."""
+        parser.add_argument("--since", required=True, help="Replay notifications failed since, e.g. 2024-05-01T08:00.")
+        parser.add_argument("--until", help="Replay notifications failed before, defaults to now.")
+        parser.add_argument(
+            "--integration", choices=[value for value, _ in INTEGRATION_CHOICES], help="Only replay one integration."
+        )
+        parser.add_argument("--include-replayed", action="store_true", help="Replay already replayed ones again.")
+
+    def handle(self, *args, **options):
+        """Queue the matching failed notifications for replay."""
+        failed_notifications = FailedNotification.objects.filter(created_at__gte=parse_time(options["since"]))
+        if options["until"]:
+            failed_notifications = failed_notifications.filter(created_at__lt=parse_time(options["until"]))
+        if options["integration"]:
+            failed_notifications = failed_notifications.filter(integration=options["integration"])
+        if not options["include_replayed"]:
+            failed_notifications = failed_notifications.filter(replayed_at=None)
+
+        count = failed_notifications.count()
+        batch = replay_failed_notifications(failed_notifications)
+        if not batch:
+            print(f"Found {count} failed notification(s), no tickets to replay.")
+            return
+        print(f"Queued {count} failed notification(s) for replay as batch {batch}.")
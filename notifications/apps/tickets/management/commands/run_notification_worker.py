@@ -0,0 +1,61 @@
+import multiprocessing
+import signal
+
+from django.core.management import BaseCommand
+from django.db import connections
+
+from tickets.constants import NOTIFICATION_JOB_LEASE
+from tickets.queue import NotificationWorker
+
+
+def run_worker(options: dict):
+    """Run a notification worker in the current process until it receives SIGTERM or SIGINT."""
+    worker = NotificationWorker(
+        threads=options["threads"],
+        batch_size=options["batch_size"],
+        poll_interval=options["poll_interval"],
+        lease=options["lease"],
+    )
+    signal.signal(signal.SIGTERM, worker.stop)
+    signal.signal(signal.SIGINT, worker.stop)
+    worker.run()
+
+
+class Command(BaseCommand):
+    help = "Send the queued Slack and Trello notifications of tickets."
+
+    def add_arguments(self, parser):
+        """Add the options of the worker pool."""
+        parser.add_argument("--processes", type=int, default=1, help="Number of worker processes.")
+        parser.add_argument("--threads", type=int, default=4, help="Number of worker threads per process.")
+        parser.add_argument("--batch-size", type=int, default=10, help="Number of jobs claimed at once per thread.")
+        parser.add_argument("--poll-interval", type=float, default=1.0, help="Seconds to wait for new jobs.")
+        parser.add_argument(
+            "--lease", type=int, default=NOTIFICATION_JOB_LEASE, help="Seconds a claimed job is leased to a worker."
+        )
+
+    def handle(self, *args, **options):
+        """Run the worker pool in this process, or fork a process per worker."""
+        self.stdout.write(
+            f"Starting {options['processes']} notification worker(s) with {options['threads']} thread(s) each.."
+        )
+        if options["processes"] <= 1:
+            run_worker(options)
+            return
+
+        # forked processes must not share the database connections of the parent process
+        connections.close_all()
+        context = multiprocessing.get_context("fork")
+        processes = [context.Process(target=run_worker, args=(options,)) for _ in range(options["processes"])]
+        for process in processes:
+            process.start()
+
+        def stop(signum, frame):
+            for process in processes:
+                process.terminate()
+
+        signal.signal(signal.SIGTERM, stop)
+        signal.signal(signal.SIGINT, signal.SIG_IGN)
+        for process in processes:
+            process.join()
+        self.stdout.write("Notification workers stopped.")
@@ -1,9 +1,8 @@
-import requests
-
 from django.core.management import BaseCommand
 
 from core.models import CoreSettings
-from tickets.models import TrelloLabel
+from tickets.models import NotificationRoute, TrelloLabel
+from tickets.trello import trello_request
 
 
 class Command(BaseCommand):
@@ -13,20 +12,27 @@ class Command(BaseCommand):
             print("CoreSettings not found, please configure it.")
             return
 
-        # fetch existing labels from trello
-        res = requests.get(
-            f"https://api.trello.com/1/boards/{core_settings.trello_board_id}/labels",
-            headers={"Accept": "application/json"},
-            params={
-                "key": core_settings.trello_api_key,
-                "token": core_settings.trello_api_token,
-            },
+        # labels are board specific, sync the default board and every board tickets are routed to
+        board_ids = {core_settings.trello_board_id}
+        board_ids.update(
+            NotificationRoute.objects.exclude(trello_board_id=None).values_list("trello_board_id", flat=True)
         )
+        board_ids.discard(None)
+        board_ids.discard("")
+
+        for board_id in sorted(board_ids):
+            self.sync_board_labels(board_id=board_id, core_settings=core_settings)
+
+    def sync_board_labels(self, board_id: str, core_settings: CoreSettings):
+        """Create or update the labels of a Trello board."""
+        # fetch existing labels from trello
+        res = trello_request("GET", f"boards/{board_id}/labels", action="boards.labels", core_settings=core_settings)
 
         for label in res.json():
-            label, created = TrelloLabel.objects.get_or_create(
+            label, created = TrelloLabel.objects.update_or_create(
                 trello_label_id=label["id"],
                 defaults={
+                    "trello_board_id": board_id,
                     "trello_label_name": label["name"],
                     "trello_label_color": label["color"],
                 },
@@ -0,0 +1,79 @@
+# Generated by Django 5.2.4 on 2026-10-19 16:49
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+def assign_default_board(apps, schema_editor):
+    """Assign the labels synced so far to the board configured in the core settings, they all belong to it."""
+    CoreSettings = apps.get_model("core", "CoreSettings")
+    TrelloLabel = apps.get_model("tickets", "TrelloLabel")
+    core_settings = CoreSettings.objects.first()
+    if core_settings and core_settings.trello_board_id:
+        TrelloLabel.objects.filter(trello_board_id=None).update(trello_board_id=core_settings.trello_board_id)
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("clients", "0001_initial"),
+        ("core", "0002_coresettings_trello_board_id_and_more"),
+        ("tickets", "0001_initial"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="trellolabel",
+            name="trello_board_id",
+            field=models.CharField(blank=True, max_length=255, null=True, verbose_name="Trello board ID"),
+        ),
+        migrations.CreateModel(
+            name="NotificationRoute",
+            fields=[
+                ("id", models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name="ID")),
+                ("created_at", models.DateTimeField(auto_now_add=True, null=True)),
+                ("updated_at", models.DateTimeField(auto_now=True, null=True)),
+                (
+                    "module",
+                    models.CharField(
+                        blank=True,
+                        choices=[("none", None), ("sellermatch", "Seller Match"), ("calculator", "Calculator")],
+                        help_text="Leave empty to match tickets of any module.",
+                        max_length=100,
+                        null=True,
+                        verbose_name="Module",
+                    ),
+                ),
+                (
+                    "slack_channel_id",
+                    models.CharField(blank=True, max_length=255, null=True, verbose_name="Slack channel"),
+                ),
+                (
+                    "trello_board_id",
+                    models.CharField(blank=True, max_length=255, null=True, verbose_name="Trello board ID"),
+                ),
+                (
+                    "trello_list_id",
+                    models.CharField(blank=True, max_length=255, null=True, verbose_name="Trello list ID"),
+                ),
+                (
+                    "client",
+                    models.ForeignKey(
+                        blank=True,
+                        null=True,
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="notification_routes",
+                        to="clients.client",
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "Notification Route",
+                "verbose_name_plural": "Notification Routes",
+                "ordering": ["client__name", "module"],
+                "constraints": [
+                    models.UniqueConstraint(fields=("client", "module"), name="tickets_notificationroute_client_module")
+                ],
+            },
+        ),
+        migrations.RunPython(assign_default_board, migrations.RunPython.noop),
+    ]
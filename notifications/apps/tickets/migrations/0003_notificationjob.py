@@ -0,0 +1,59 @@
+# Generated by Django 5.2.4 on 2026-10-19 16:51
+
+import django.db.models.deletion
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("tickets", "0002_notificationroute"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="NotificationJob",
+            fields=[
+                ("id", models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name="ID")),
+                ("created_at", models.DateTimeField(auto_now_add=True, null=True)),
+                ("updated_at", models.DateTimeField(auto_now=True, null=True)),
+                ("shard", models.PositiveSmallIntegerField(verbose_name="Shard")),
+                (
+                    "status",
+                    models.CharField(
+                        choices=[
+                            ("pending", "Pending"),
+                            ("running", "Running"),
+                            ("done", "Done"),
+                            ("failed", "Failed"),
+                        ],
+                        default="pending",
+                        max_length=45,
+                        verbose_name="Status",
+                    ),
+                ),
+                ("attempts", models.PositiveSmallIntegerField(default=0, verbose_name="Attempts")),
+                ("available_at", models.DateTimeField(default=django.utils.timezone.now, verbose_name="Available at")),
+                ("locked_by", models.CharField(blank=True, max_length=255, null=True, verbose_name="Locked by")),
+                ("locked_until", models.DateTimeField(blank=True, null=True, verbose_name="Locked until")),
+                ("last_error", models.TextField(blank=True, null=True, verbose_name="Last error")),
+                (
+                    "ticket",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="notification_jobs",
+                        to="tickets.ticket",
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "Notification Job",
+                "verbose_name_plural": "Notification Jobs",
+                "ordering": ["-id"],
+                "indexes": [
+                    models.Index(fields=["status", "shard", "available_at"], name="tickets_notificationjob_claim"),
+                    models.Index(fields=["ticket", "status"], name="tickets_notificationjob_ticket"),
+                ],
+            },
+        ),
+    ]
@@ -0,0 +1,63 @@
+# Generated by Django 5.2.4 on 2026-10-19 17:00
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("clients", "0001_initial"),
+        ("tickets", "0003_notificationjob"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="TicketStatusRollup",
+            fields=[
+                ("id", models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name="ID")),
+                ("created_at", models.DateTimeField(auto_now_add=True, null=True)),
+                ("updated_at", models.DateTimeField(auto_now=True, null=True)),
+                ("date", models.DateField(verbose_name="Date")),
+                (
+                    "status",
+                    models.CharField(
+                        choices=[("open", "Open"), ("blocked", "Blocked"), ("active", "Active"), ("closed", "Closed")],
+                        max_length=100,
+                        verbose_name="Status",
+                    ),
+                ),
+                (
+                    "module",
+                    models.CharField(
+                        choices=[("none", None), ("sellermatch", "Seller Match"), ("calculator", "Calculator")],
+                        max_length=100,
+                        verbose_name="Module",
+                    ),
+                ),
+                ("entered", models.PositiveIntegerField(default=0, verbose_name="Entered")),
+                ("left", models.PositiveIntegerField(default=0, verbose_name="Left")),
+                ("close_duration", models.PositiveBigIntegerField(default=0, verbose_name="Time to close (seconds)")),
+                (
+                    "client",
+                    models.ForeignKey(
+                        blank=True,
+                        db_constraint=False,
+                        null=True,
+                        on_delete=django.db.models.deletion.DO_NOTHING,
+                        related_name="+",
+                        to="clients.client",
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "Ticket Status Rollup",
+                "verbose_name_plural": "Ticket Status Rollups",
+                "ordering": ["-date", "status", "module"],
+                "constraints": [
+                    models.UniqueConstraint(
+                        fields=("date", "status", "module", "client"), name="tickets_ticketstatusrollup_dimensions"
+                    )
+                ],
+            },
+        ),
+    ]
@@ -0,0 +1,57 @@
+# Generated by Django 5.2.4 on 2026-10-19 17:02
+
+import django.db.models.deletion
+import django.utils.timezone
+from django.db import migrations, models
+
+
+def log_current_statuses(apps, schema_editor):
+    """Log the existing tickets as created with their current status, they have no history."""
+    Ticket = apps.get_model("tickets", "Ticket")
+    TicketStatusTransition = apps.get_model("tickets", "TicketStatusTransition")
+    status_codes = {"open": 1, "blocked": 2, "active": 3, "closed": 4}
+
+    transitions = []
+    tickets = Ticket.objects.values_list("id", "status", "created_at").order_by("id")
+    for ticket_id, status, created_at in tickets.iterator(chunk_size=2000):
+        transitions.append(
+            TicketStatusTransition(ticket_id=ticket_id, to_status=status_codes[status], created_at=created_at)
+        )
+        if len(transitions) == 2000:
+            TicketStatusTransition.objects.bulk_create(transitions)
+            transitions = []
+    TicketStatusTransition.objects.bulk_create(transitions)
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("tickets", "0004_ticketstatusrollup"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="TicketStatusTransition",
+            fields=[
+                ("id", models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name="ID")),
+                ("from_status", models.PositiveSmallIntegerField(blank=True, null=True, verbose_name="From status")),
+                ("to_status", models.PositiveSmallIntegerField(verbose_name="To status")),
+                ("created_at", models.DateTimeField(default=django.utils.timezone.now)),
+                (
+                    "ticket",
+                    models.ForeignKey(
+                        db_constraint=False,
+                        on_delete=django.db.models.deletion.DO_NOTHING,
+                        related_name="status_transitions",
+                        to="tickets.ticket",
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "Ticket Status Transition",
+                "verbose_name_plural": "Ticket Status Transitions",
+                "ordering": ["ticket", "created_at", "id"],
+                "indexes": [models.Index(fields=["ticket", "created_at"], name="tickets_transition_timeline")],
+            },
+        ),
+        migrations.RunPython(log_current_statuses, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,17 @@
+# Generated by Django 5.2.4 on 2026-10-19 17:02
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("tickets", "0005_ticketstatustransition"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="notificationjob",
+            name="batch",
+            field=models.CharField(blank=True, db_index=True, max_length=32, null=True, verbose_name="Batch"),
+        ),
+    ]
@@ -0,0 +1,42 @@
+# Generated by Django 5.2.4 on 2026-10-19 17:05
+
+from django.db import migrations, models
+
+
+def assign_ticket_numbers(apps, schema_editor):
+    """Start the ticket number sequence above the existing numbers, and number the tickets without a unique one."""
+    Ticket = apps.get_model("tickets", "Ticket")
+    Sequence = apps.get_model("core", "Sequence")
+
+    seen = set()
+    renumber = []
+    last_value = 10000 - 1
+    for ticket_id, ticket_no in Ticket.objects.values_list("id", "ticket_no").order_by("id").iterator(chunk_size=2000):
+        if ticket_no and ticket_no not in seen:
+            seen.add(ticket_no)
+            if ticket_no.isdigit():
+                last_value = max(last_value, int(ticket_no))
+        else:
+            renumber.append(ticket_id)
+
+    for ticket_id in renumber:
+        last_value += 1
+        Ticket.objects.filter(id=ticket_id).update(ticket_no=str(last_value))
+
+    Sequence.objects.update_or_create(name="ticket_no", defaults={"last_value": last_value})
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("core", "0004_sequence"),
+        ("tickets", "0006_notificationjob_batch"),
+    ]
+
+    operations = [
+        migrations.RunPython(assign_ticket_numbers, migrations.RunPython.noop),
+        migrations.AlterField(
+            model_name="ticket",
+            name="ticket_no",
+            field=models.CharField(default="", max_length=45, unique=True, verbose_name="Ticket No."),
+        ),
+    ]
@@ -0,0 +1,17 @@
+# Generated by Django 5.2.4 on 2026-10-19 17:07
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("tickets", "0007_ticket_no_unique"),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name="ticket",
+            name="description",
+            field=models.TextField(blank=True, null=True, verbose_name="Description"),
+        ),
+    ]
@@ -0,0 +1,61 @@
+# Generated by Django 5.2.4 on 2026-10-19 17:10
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("tickets", "0008_ticket_description_text"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="FailedNotification",
+            fields=[
+                ("id", models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name="ID")),
+                ("created_at", models.DateTimeField(auto_now_add=True, null=True)),
+                ("updated_at", models.DateTimeField(auto_now=True, null=True)),
+                (
+                    "integration",
+                    models.CharField(
+                        blank=True,
+                        choices=[("slack", "Slack"), ("trello", "Trello")],
+                        max_length=45,
+                        null=True,
+                        verbose_name="Integration",
+                    ),
+                ),
+                ("action", models.CharField(blank=True, max_length=255, null=True, verbose_name="Action")),
+                ("payload", models.JSONField(blank=True, null=True, verbose_name="Payload")),
+                ("error_class", models.CharField(max_length=255, verbose_name="Error class")),
+                ("error", models.TextField(blank=True, null=True, verbose_name="Error")),
+                ("attempts", models.PositiveSmallIntegerField(default=0, verbose_name="Attempts")),
+                ("replayed_at", models.DateTimeField(blank=True, null=True, verbose_name="Replayed at")),
+                (
+                    "job",
+                    models.ForeignKey(
+                        blank=True,
+                        null=True,
+                        on_delete=django.db.models.deletion.SET_NULL,
+                        related_name="failed_notifications",
+                        to="tickets.notificationjob",
+                    ),
+                ),
+                (
+                    "ticket",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="failed_notifications",
+                        to="tickets.ticket",
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "Failed Notification",
+                "verbose_name_plural": "Failed Notifications",
+                "ordering": ["-created_at"],
+                "indexes": [models.Index(fields=["created_at"], name="tickets_failed_created")],
+            },
+        ),
+    ]
@@ -0,0 +1,114 @@
+# Generated by Django 5.2.4 on 2026-10-19 17:17
+
+import django.db.models.deletion
+import django.utils.timezone
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("clients", "0002_client_name_index"),
+        ("tickets", "0009_failednotification"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="ArchivedTicket",
+            fields=[
+                ("id", models.BigIntegerField(primary_key=True, serialize=False, verbose_name="ID")),
+                ("created_at", models.DateTimeField(null=True)),
+                ("updated_at", models.DateTimeField(null=True)),
+                ("archived_at", models.DateTimeField(default=django.utils.timezone.now, verbose_name="Archived at")),
+                ("draft", models.BooleanField(default=False)),
+                ("ticket_no", models.CharField(max_length=45, unique=True, verbose_name="Ticket No.")),
+                ("title", models.CharField(db_index=True, max_length=100, verbose_name="Title")),
+                ("description", models.TextField(blank=True, null=True, verbose_name="Description")),
+                (
+                    "module",
+                    models.CharField(
+                        choices=[("none", None), ("sellermatch", "Seller Match"), ("calculator", "Calculator")],
+                        default="none",
+                        max_length=100,
+                        verbose_name="Module",
+                    ),
+                ),
+                (
+                    "status",
+                    models.CharField(
+                        choices=[("open", "Open"), ("blocked", "Blocked"), ("active", "Active"), ("closed", "Closed")],
+                        default="closed",
+                        max_length=100,
+                        verbose_name="Status",
+                    ),
+                ),
+                ("last_joblog_log", models.TextField(blank=True, null=True, verbose_name="Last Job Log")),
+                ("last_joblog_message", models.TextField(blank=True, null=True, verbose_name="Last Job Log Message")),
+                (
+                    "last_joblog_stacktrace",
+                    models.TextField(blank=True, null=True, verbose_name="Last Job Log Stacktrace"),
+                ),
+                ("trello_ticket_created", models.BooleanField(default=False, verbose_name="Trello Ticket Created")),
+                (
+                    "trello_ticket_id",
+                    models.CharField(blank=True, max_length=45, null=True, verbose_name="Trello Ticket ID"),
+                ),
+                ("trello_ticket_url", models.URLField(blank=True, null=True, verbose_name="Trello Ticket URL")),
+                ("slack_notification_sent", models.BooleanField(default=False, verbose_name="Slack Notification Sent")),
+                (
+                    "slack_message_ts",
+                    models.CharField(blank=True, max_length=45, null=True, verbose_name="Slack Message TS"),
+                ),
+                (
+                    "slack_channel_id",
+                    models.CharField(blank=True, max_length=45, null=True, verbose_name="Slack Channel ID"),
+                ),
+            ],
+            options={
+                "verbose_name": "Archived Ticket",
+                "verbose_name_plural": "Archived Tickets",
+                "ordering": ["-archived_at", "-id"],
+            },
+        ),
+        migrations.AddIndex(
+            model_name="ticket",
+            index=models.Index(fields=["status", "updated_at"], name="tickets_ticket_archival"),
+        ),
+        migrations.AddField(
+            model_name="archivedticket",
+            name="assignee",
+            field=models.ForeignKey(
+                blank=True,
+                db_constraint=False,
+                null=True,
+                on_delete=django.db.models.deletion.DO_NOTHING,
+                related_name="+",
+                to=settings.AUTH_USER_MODEL,
+            ),
+        ),
+        migrations.AddField(
+            model_name="archivedticket",
+            name="author",
+            field=models.ForeignKey(
+                blank=True,
+                db_constraint=False,
+                null=True,
+                on_delete=django.db.models.deletion.DO_NOTHING,
+                related_name="+",
+                to=settings.AUTH_USER_MODEL,
+            ),
+        ),
+        migrations.AddField(
+            model_name="archivedticket",
+            name="client",
+            field=models.ForeignKey(
+                blank=True,
+                db_constraint=False,
+                null=True,
+                on_delete=django.db.models.deletion.DO_NOTHING,
+                related_name="+",
+                to="clients.client",
+            ),
+        ),
+    ]
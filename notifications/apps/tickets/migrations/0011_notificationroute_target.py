@@ -0,0 +1,40 @@
+# Generated by Django 5.2.4 on 2026-10-19 17:22
+
+import django.db.models.functions.comparison
+from django.db import migrations, models
+
+
+def remove_duplicate_routes(apps, schema_editor):
+    """Remove the duplicate routes without client or module, keep the one the router used, the last updated."""
+    NotificationRoute = apps.get_model("tickets", "NotificationRoute")
+
+    seen = set()
+    routes = NotificationRoute.objects.values_list("id", "client_id", "module").order_by("-updated_at", "-id")
+    for route_id, client_id, module in routes:
+        key = (client_id, module or None)
+        if key in seen:
+            NotificationRoute.objects.filter(id=route_id).delete()
+        seen.add(key)
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("clients", "0002_client_name_index"),
+        ("tickets", "0010_archivedticket"),
+    ]
+
+    operations = [
+        migrations.RemoveConstraint(
+            model_name="notificationroute",
+            name="tickets_notificationroute_client_module",
+        ),
+        migrations.RunPython(remove_duplicate_routes, migrations.RunPython.noop),
+        migrations.AddConstraint(
+            model_name="notificationroute",
+            constraint=models.UniqueConstraint(
+                django.db.models.functions.comparison.Coalesce("client", models.Value(0)),
+                django.db.models.functions.comparison.Coalesce("module", models.Value("")),
+                name="tickets_notificationroute_target",
+            ),
+        ),
+    ]
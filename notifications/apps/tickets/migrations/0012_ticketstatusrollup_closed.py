@@ -0,0 +1,25 @@
+# Generated by Django 5.2.4 on 2026-10-19 17:24
+
+from django.db import migrations, models
+from django.db.models import F
+
+
+def count_closed(apps, schema_editor):
+    """Count every ticket which entered a closed rollup as closed, run `rebuild_ticket_rollups` for exact counts."""
+    TicketStatusRollup = apps.get_model("tickets", "TicketStatusRollup")
+    TicketStatusRollup.objects.filter(status="closed").update(closed=F("entered"))
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("tickets", "0011_notificationroute_target"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="ticketstatusrollup",
+            name="closed",
+            field=models.PositiveIntegerField(default=0, verbose_name="Closed"),
+        ),
+        migrations.RunPython(count_closed, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,35 @@
+# Generated by Django 5.2.4 on 2026-10-19 17:27
+
+from django.db import migrations, models
+
+
+def empty_ticket_no_to_null(apps, schema_editor):
+    """Store missing ticket numbers as NULL, "" is unique, so only one ticket without a number could be saved."""
+    for model_name in ("Ticket", "ArchivedTicket"):
+        apps.get_model("tickets", model_name).objects.filter(ticket_no="").update(ticket_no=None)
+
+
+def null_ticket_no_to_empty(apps, schema_editor):
+    """Store missing ticket numbers as "" again."""
+    for model_name in ("Ticket", "ArchivedTicket"):
+        apps.get_model("tickets", model_name).objects.filter(ticket_no=None).update(ticket_no="")
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("tickets", "0012_ticketstatusrollup_closed"),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name="archivedticket",
+            name="ticket_no",
+            field=models.CharField(blank=True, max_length=45, null=True, unique=True, verbose_name="Ticket No."),
+        ),
+        migrations.AlterField(
+            model_name="ticket",
+            name="ticket_no",
+            field=models.CharField(blank=True, max_length=45, null=True, unique=True, verbose_name="Ticket No."),
+        ),
+        migrations.RunPython(empty_ticket_no_to_null, null_ticket_no_to_empty),
+    ]
@@ -0,0 +1,33 @@
+# Generated by Django 5.2.4 on 2026-10-19 17:31
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("tickets", "0013_ticket_no_nullable"),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name="failednotification",
+            name="ticket",
+            field=models.ForeignKey(
+                db_constraint=False,
+                on_delete=django.db.models.deletion.DO_NOTHING,
+                related_name="failed_notifications",
+                to="tickets.ticket",
+            ),
+        ),
+        migrations.AlterField(
+            model_name="notificationjob",
+            name="ticket",
+            field=models.ForeignKey(
+                db_constraint=False,
+                on_delete=django.db.models.deletion.DO_NOTHING,
+                related_name="notification_jobs",
+                to="tickets.ticket",
+            ),
+        ),
+    ]
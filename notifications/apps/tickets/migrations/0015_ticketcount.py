@@ -0,0 +1,79 @@
+# Generated by Django 5.2.4 on 2026-10-19 17:46
+
+import django.db.models.deletion
+import django.db.models.functions.comparison
+from django.db import migrations, models
+from django.db.models import F, Sum
+
+
+def count_tickets(apps, schema_editor):
+    """Sum up the current ticket counts from the rollups."""
+    TicketStatusRollup = apps.get_model("tickets", "TicketStatusRollup")
+    TicketCount = apps.get_model("tickets", "TicketCount")
+    rows = (
+        TicketStatusRollup.objects.values("status", "module", "client_id")
+        .annotate(tickets=Sum(F("entered") - F("left")))
+        .exclude(tickets=0)
+        .order_by()
+    )
+    TicketCount.objects.bulk_create([TicketCount(**row) for row in rows], batch_size=1000)
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("clients", "0002_client_name_index"),
+        ("tickets", "0014_notification_history_outlives_ticket"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="TicketCount",
+            fields=[
+                ("id", models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name="ID")),
+                ("created_at", models.DateTimeField(auto_now_add=True, null=True)),
+                ("updated_at", models.DateTimeField(auto_now=True, null=True)),
+                (
+                    "status",
+                    models.CharField(
+                        choices=[("open", "Open"), ("blocked", "Blocked"), ("active", "Active"), ("closed", "Closed")],
+                        max_length=100,
+                        verbose_name="Status",
+                    ),
+                ),
+                (
+                    "module",
+                    models.CharField(
+                        choices=[("none", None), ("sellermatch", "Seller Match"), ("calculator", "Calculator")],
+                        max_length=100,
+                        verbose_name="Module",
+                    ),
+                ),
+                ("tickets", models.IntegerField(default=0, verbose_name="Tickets")),
+                (
+                    "client",
+                    models.ForeignKey(
+                        blank=True,
+                        db_constraint=False,
+                        null=True,
+                        on_delete=django.db.models.deletion.DO_NOTHING,
+                        related_name="+",
+                        to="clients.client",
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "Ticket Count",
+                "verbose_name_plural": "Ticket Counts",
+                "ordering": ["status", "module", "client"],
+                "constraints": [
+                    models.UniqueConstraint(
+                        models.F("status"),
+                        models.F("module"),
+                        django.db.models.functions.comparison.Coalesce("client", models.Value(0)),
+                        name="tickets_ticketcount_dimensions",
+                    )
+                ],
+            },
+        ),
+        migrations.RunPython(count_tickets, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,36 @@
+# Generated by Django 5.2.4 on 2026-10-19 17:52
+
+import re
+
+from django.db import migrations
+
+# the actions were recorded as the method and path of the request, e.g. "POST cards/<card id>/idLabels"
+TRELLO_ACTIONS = (
+    (re.compile(r"^POST cards$"), "cards.create"),
+    (re.compile(r"^POST cards/[^/]+/idLabels$"), "cards.idLabels"),
+    (re.compile(r"^GET boards/[^/]+/labels$"), "boards.labels"),
+)
+
+
+def fix_trello_actions(apps, schema_editor):
+    """Record the failed Trello requests with a fixed action name, and the path with its ids in the payload."""
+    FailedNotification = apps.get_model("tickets", "FailedNotification")
+    failed_notifications = FailedNotification.objects.filter(integration="trello", action__contains=" ")
+    for failed_notification in failed_notifications.iterator():
+        path = failed_notification.action.split(" ", 1)[1]
+        for pattern, action in TRELLO_ACTIONS:
+            if pattern.match(failed_notification.action):
+                failed_notification.action = action
+                failed_notification.payload = {"path": path, **(failed_notification.payload or {})}
+                failed_notification.save(update_fields=["action", "payload"])
+                break
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("tickets", "0015_ticketcount"),
+    ]
+
+    operations = [
+        migrations.RunPython(fix_trello_actions, migrations.RunPython.noop),
+    ]
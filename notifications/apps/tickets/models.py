@@ -1,22 +1,85 @@
-from ckeditor.fields import RichTextField
+import functools
+import logging
+import uuid
+from collections import defaultdict
+from datetime import datetime, timedelta
+from typing import Callable, Dict, Iterable, List, NamedTuple, Optional, Tuple
+
+from django.conf import settings
 from django.contrib.auth import get_user_model
-from django.db import models
-from django.db.models import TextField
+from django.db import IntegrityError, models, transaction
+from django.db.models import F, TextField, Value
+from django.db.models.functions import Coalesce
+from django.utils import timezone
+from django.utils.module_loading import import_string
 
 from clients.models import Client
+from core.exceptions import CircuitOpenError, RateLimitExceededError
 from core.models import CoreModel, CoreSettings
-from tickets.constants import TICKET_STATUS_CHOICES, TICKET_STATUS_OPEN, TICKET_MODULE_NONE, TICKET_MODULE_CHOICES
+from core.sequences import SequenceAllocator
+from tickets.constants import (
+    INTEGRATION_CHOICES,
+    NOTIFICATION_JOB_RETRY_DELAY,
+    NOTIFICATION_JOB_STATUS_CHOICES,
+    NOTIFICATION_JOB_STATUS_PENDING,
+    NOTIFICATION_SHARDS,
+    TICKET_MODULE_CHOICES,
+    TICKET_MODULE_NONE,
+    TICKET_NO_BLOCK_SIZE,
+    TICKET_NO_SEQUENCE,
+    TICKET_NO_START,
+    TICKET_STATUS_CHOICES,
+    TICKET_STATUS_CLOSED,
+    TICKET_STATUS_CODES,
+    TICKET_STATUS_OPEN,
+)
+from tickets.exceptions import NotificationError
 
 User = get_user_model()
 
+logger = logging.getLogger(__name__)
+
+# the status, module and client id of a ticket
+RollupKey = Tuple[str, str, Optional[int]]
+
+
+class NotificationResult(NamedTuple):
+    # the time the integrations skipped due to an open circuit breaker or a used up rate limit may be called again
+    deferred_until: Optional[datetime]
+    errors: List[NotificationError]
+
+    @property
+    def retry_at(self) -> Optional[datetime]:
+        """The time to replay the skipped or failed notifications at, None if all notifications were sent."""
+        if not self.errors:
+            return self.deferred_until
+        retry_at = timezone.now() + timedelta(seconds=NOTIFICATION_JOB_RETRY_DELAY)
+        return max(self.deferred_until or retry_at, retry_at)
+
+
+@functools.cache
+def get_notification_handlers() -> Tuple[Callable[..., None], ...]:
+    """
+    Import the notification handlers of the integrations once per process, on the first notification.
+
+    The integrations don't import the models, they are given the ticket. They import `requests` though, which
+    processes that never send a notification, e.g. most management commands, don't load at startup.
+    """
+    return import_string("tickets.notifications.NOTIFICATION_HANDLERS")
+
+
+ticket_no_allocator = SequenceAllocator(name=TICKET_NO_SEQUENCE, start=TICKET_NO_START, block_size=TICKET_NO_BLOCK_SIZE)
+
 
 class Ticket(CoreModel):
     client = models.ForeignKey(Client, null=True, blank=True, on_delete=models.SET_NULL, related_name="tickets")
 
     draft = models.BooleanField(default=True)
-    ticket_no = models.CharField("Ticket No.", max_length=45, null=False, blank=False, default="")
+    # assigned from the ticket number sequence on the first save
+    ticket_no = models.CharField("Ticket No.", max_length=45, null=True, blank=True, unique=True)
     title = models.CharField("Title", max_length=100, null=False, blank=False)
-    description = RichTextField("Description", null=True, blank=True)
+    # html, edited as rich text in the admin, see `TicketAdmin.formfield_for_dbfield`
+    description = models.TextField("Description", null=True, blank=True)
     author = models.ForeignKey(User, on_delete=models.SET_NULL, null=True, blank=True, related_name="tickets_author")
     assignee = models.ForeignKey(
         User, on_delete=models.SET_NULL, null=True, blank=True, related_name="tickets_assignee"
@@ -36,69 +99,160 @@ class Ticket(CoreModel):
     slack_message_ts = models.CharField("Slack Message TS", max_length=45, null=True, blank=True)
     slack_channel_id = models.CharField("Slack Channel ID", max_length=45, null=True, blank=True)
 
+    # fields written by the trello and slack integrations
+    NOTIFICATION_FIELDS = (
+        "trello_ticket_created",
+        "trello_ticket_id",
+        "trello_ticket_url",
+        "slack_notification_sent",
+        "slack_message_ts",
+        "slack_channel_id",
+    )
+
+    # dimensions of the analytics rollups, kept in sync by `save` and `bulk_update_tickets`, while
+    # `QuerySet.update()` and `bulk_update()` bypass the rollups and must not change these fields
+    ROLLUP_FIELDS = ("status", "module", "client_id")
+
     class Meta:
         app_label = "tickets"
         verbose_name = "Ticket"
         verbose_name_plural = "Tickets"
         ordering = ["-created_at"]
+        indexes = [
+            # finds the closed tickets to archive, see `archive_closed_tickets`
+            models.Index(fields=["status", "updated_at"], name="tickets_ticket_archival"),
+        ]
 
     def __str__(self):
         return f"Ticket No. {self.ticket_no}"
 
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        """Load a ticket from the database, remembering its analytics dimensions."""
+        instance = super().from_db(db, field_names, values)
+        # remember the analytics dimensions as loaded, to detect changes on save
+        instance._loaded_rollup_key = instance.rollup_key if set(cls.ROLLUP_FIELDS) <= set(field_names) else None
+        return instance
+
     def save(self, *args, **kwargs):
-        # todo: this can maybe be put into pre_save or post_save signals,
-        #   for the sake of the coding challenge, we do it before we have saved the model instance.
-        #   as we enhance the ticket model instance with trello and slack information, it's probably ok
-        #   to avoid another save cycle of the model instance.
+        # the ticket number is part of the notifications, so it is assigned before they are sent
+        if not self.ticket_no:
+            self.ticket_no = str(ticket_no_allocator.next_value())
+
+        with transaction.atomic():
+            loaded_rollup_key = getattr(self, "_loaded_rollup_key", None)
+            if loaded_rollup_key is None and not self._state.adding:
+                # loaded without the rollup fields, e.g. with `only()`, compare with the stored values instead
+                loaded_rollup_key = Ticket.objects.filter(pk=self.pk).values_list(*self.ROLLUP_FIELDS).first()
+
+            if not self._state.adding and kwargs.get("update_fields") is None:
+                # the integrations and notification workers write the notification fields, which may be stale here
+                kwargs["update_fields"] = [
+                    field.name
+                    for field in self._meta.concrete_fields
+                    if not field.primary_key and field.name not in self.NOTIFICATION_FIELDS
+                ]
+
+            # save the ticket model instance
+            super(Ticket, self).save(*args, **kwargs)
 
+            # log status transitions and keep the analytics rollups in sync with the ticket
+            loaded_status = loaded_rollup_key[0] if loaded_rollup_key else None
+            if loaded_status != self.status:
+                TicketStatusTransition.record(ticket=self, from_status=loaded_status, to_status=self.status)
+            if loaded_rollup_key != self.rollup_key:
+                TicketStatusRollup.record_change(ticket=self, old_key=loaded_rollup_key, new_key=self.rollup_key)
+                self._loaded_rollup_key = self.rollup_key
+
+            # with async notifications, they are sent by the notification workers, see `run_notification_worker`
+            if settings.NOTIFICATIONS_ASYNC and self.has_notifications:
+                NotificationJob.enqueue(ticket=self)
+            elif not settings.NOTIFICATIONS_ASYNC:
+                # sent once the ticket is committed, so the requests to the integrations don't hold the database
+                # locks of the transaction, e.g. the write lock of SQLite while the admin saves a ticket
+                transaction.on_commit(self.notify)
+
+    def notify(self):
+        """
+        Send the notifications of the saved ticket and store the notification fields written by the integrations.
+
+        Skipped and failed notifications are replayed by the notification workers.
+        """
         # ensure the core settings model instance has been created
         core_settings = CoreSettings.objects.first()
-        if core_settings:
-            self.handle_trello_ticket(core_settings=core_settings)
-            self.handle_slack_message(core_settings=core_settings)
+        if not core_settings:
+            return
 
-        # save the ticket model instance
-        super(Ticket, self).save(*args, **kwargs)
+        try:
+            result = self.send_notifications(core_settings=core_settings)
+        except Exception:
+            logger.exception("Sending the notifications of ticket %s failed, replaying them", self.pk)
+            NotificationJob.enqueue(ticket=self)
+            return
 
-    def handle_trello_ticket(self, core_settings: CoreSettings):
-        # todo: local imports - need to resolve circular import - not in coding challenge
-        from tickets.trello import trello_create_ticket, trello_add_label
+        Ticket.objects.filter(pk=self.pk).update(**{field: getattr(self, field) for field in self.NOTIFICATION_FIELDS})
+        if result.retry_at:
+            # replay failed notifications, and those skipped due to unavailable integrations, with the workers
+            NotificationJob.enqueue(ticket=self, available_at=result.retry_at)
 
-        # initially create trello ticket
-        if not self.draft and not self.trello_ticket_created:
-            try:
-                ticket_id, ticket_url = trello_create_ticket(ticket=self, core_settings=core_settings)
-                self.trello_ticket_id = ticket_id
-                self.trello_ticket_url = ticket_url
-                self.trello_ticket_created = True
-                # add label to created trello ticket
-                trello_add_label(ticket=self, core_settings=core_settings)
-            except Exception as e:
-                # todo: do something about failing tickets
-                print(e)
-
-    def handle_slack_message(self, core_settings: CoreSettings):
-        # todo: local imports - need to resolve circular import - not in coding challenge
-        from tickets.slack import slack_create_message, slack_update_message
-
-        # initially create the slack message
-        if not self.draft and not self.slack_notification_sent:
-            try:
-                message_ts, channel_id = slack_create_message(ticket=self, core_settings=core_settings)
-                self.slack_message_ts = message_ts
-                self.slack_channel_id = channel_id
-                self.slack_notification_sent = True
-            except Exception as e:
-                # todo: do something about failing messages
-                print(e)
+    @classmethod
+    def assign_ticket_numbers(cls, tickets: Iterable["Ticket"]):
+        """
+        Assign ticket numbers to all given tickets without one, with a single reservation.
+
+        `bulk_create` skips `save`, so bulk ingests must assign the ticket numbers before.
+
+        Args:
+            tickets (Iterable[Ticket]): The unsaved tickets.
+        """
+        tickets = [ticket for ticket in tickets if not ticket.ticket_no]
+        for ticket, ticket_no in zip(tickets, ticket_no_allocator.next_values(len(tickets)), strict=True):
+            ticket.ticket_no = str(ticket_no)
+
+    @property
+    def rollup_key(self) -> RollupKey:
+        """The analytics dimensions of the ticket: status, module and client id."""
+        return self.status, self.module, self.client_id
+
+    @property
+    def has_notifications(self) -> bool:
+        """Whether saving the ticket sends notifications, drafts don't unless their slack message was sent before."""
+        return not self.draft or bool(self.slack_message_ts)
 
-        # update slack reactions in any case
-        if self.slack_message_ts and self.slack_channel_id:
-            slack_update_message(ticket=self, core_settings=core_settings)
+    def get_trello_label(self, trello_board_id: Optional[str]) -> Optional["TrelloLabel"]:
+        """Get the Trello label of the ticket's module on the given board, None if it wasn't synced yet."""
+        return TrelloLabel.objects.filter(module=self.module, trello_board_id=trello_board_id).first()
+
+    def send_notifications(self, core_settings: CoreSettings) -> NotificationResult:
+        """
+        Create or update the Trello card and Slack message of the ticket.
+
+        Integrations which are unavailable or rate limited are skipped right away instead of slowing down the save,
+        they are replayed by the notification workers. A failing integration doesn't stop the others, its error is
+        returned to replay it later.
+
+        Args:
+            core_settings (CoreSettings): The core settings provide API credentials for trello and slack.
+
+        Returns:
+            NotificationResult: The time to retry the skipped notifications at, and the failed requests.
+        """
+        deferred_until = None
+        errors = []
+        for handle in get_notification_handlers():
+            try:
+                handle(ticket=self, core_settings=core_settings)
+            except (CircuitOpenError, RateLimitExceededError) as e:
+                deferred_until = max(deferred_until or e.retry_at, e.retry_at)
+            except NotificationError as e:
+                logger.warning("Sending the notifications of ticket %s failed: %s", self.pk, e)
+                errors.append(e)
+        return NotificationResult(deferred_until=deferred_until, errors=errors)
 
 
 class TrelloLabel(CoreModel):
     module = models.CharField("Module", max_length=100, null=True, blank=True, choices=TICKET_MODULE_CHOICES)
+    trello_board_id = models.CharField("Trello board ID", max_length=255, null=True, blank=True)
     trello_label_id = models.CharField("Trello label ID", max_length=45, null=True, blank=True)
     trello_label_color = models.CharField("Trello label color", max_length=45, null=True, blank=True)
     trello_label_name = models.CharField("Trello label name", max_length=45, null=True, blank=True)
@@ -111,3 +265,421 @@ class TrelloLabel(CoreModel):
 
     def __str__(self):
         return f"{self.trello_label_name} > {self.module}"
+
+
+class NotificationRoute(CoreModel):
+    client = models.ForeignKey(
+        Client, null=True, blank=True, on_delete=models.CASCADE, related_name="notification_routes"
+    )
+    module = models.CharField(
+        "Module",
+        max_length=100,
+        null=True,
+        blank=True,
+        choices=TICKET_MODULE_CHOICES,
+        help_text="Leave empty to match tickets of any module.",
+    )
+
+    slack_channel_id = models.CharField("Slack channel", max_length=255, null=True, blank=True)
+    trello_board_id = models.CharField("Trello board ID", max_length=255, null=True, blank=True)
+    trello_list_id = models.CharField("Trello list ID", max_length=255, null=True, blank=True)
+
+    class Meta:
+        app_label = "tickets"
+        verbose_name = "Notification Route"
+        verbose_name_plural = "Notification Routes"
+        ordering = ["client__name", "module"]
+        constraints = [
+            # empty clients and modules match any, so they are unique as well, which NULLs are not
+            models.UniqueConstraint(
+                Coalesce("client", Value(0)), Coalesce("module", Value("")), name="tickets_notificationroute_target"
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.client or 'Any client'} > {self.module or 'any module'}"
+
+
+class NotificationJob(CoreModel):
+    # kept when their ticket is deleted or archived, as the notification history of the ticket
+    ticket = models.ForeignKey(
+        Ticket, on_delete=models.DO_NOTHING, db_constraint=False, related_name="notification_jobs"
+    )
+    shard = models.PositiveSmallIntegerField("Shard")
+    status = models.CharField(
+        "Status", max_length=45, choices=NOTIFICATION_JOB_STATUS_CHOICES, default=NOTIFICATION_JOB_STATUS_PENDING
+    )
+    attempts = models.PositiveSmallIntegerField("Attempts", default=0)
+    available_at = models.DateTimeField("Available at", default=timezone.now)
+    locked_by = models.CharField("Locked by", max_length=255, null=True, blank=True)
+    locked_until = models.DateTimeField("Locked until", null=True, blank=True)
+    last_error = models.TextField("Last error", null=True, blank=True)
+    # jobs queued together by a bulk action share a batch id
+    batch = models.CharField("Batch", max_length=32, null=True, blank=True, db_index=True)
+
+    class Meta:
+        app_label = "tickets"
+        verbose_name = "Notification Job"
+        verbose_name_plural = "Notification Jobs"
+        ordering = ["-id"]
+        indexes = [
+            models.Index(fields=["status", "shard", "available_at"], name="tickets_notificationjob_claim"),
+            models.Index(fields=["ticket", "status"], name="tickets_notificationjob_ticket"),
+        ]
+
+    def __str__(self):
+        return f"Notification Job {self.pk} > {self.ticket_id}"
+
+    @classmethod
+    def enqueue(cls, ticket: Ticket, available_at: Optional[datetime] = None) -> "NotificationJob":
+        """
+        Queue sending the Slack and Trello notifications of the given ticket.
+
+        Args:
+            ticket (Ticket): The saved ticket to send notifications for.
+            available_at (Optional[datetime]): The time to send the notifications at, right away if not given.
+
+        Returns:
+            NotificationJob: The queued job.
+        """
+        return cls.objects.create(
+            ticket=ticket, shard=ticket.pk % NOTIFICATION_SHARDS, available_at=available_at or timezone.now()
+        )
+
+    @classmethod
+    def enqueue_batch(cls, tickets: Iterable[Ticket]) -> str:
+        """
+        Queue sending the Slack and Trello notifications of many tickets as one batch.
+
+        Args:
+            tickets (Iterable[Ticket]): The saved tickets to send notifications for.
+
+        Returns:
+            str: The id of the batch, to track its progress.
+        """
+        batch = uuid.uuid4().hex
+        cls.objects.bulk_create(
+            [cls(ticket=ticket, shard=ticket.pk % NOTIFICATION_SHARDS, batch=batch) for ticket in tickets],
+            batch_size=500,
+        )
+        return batch
+
+
+class FailedNotification(CoreModel):
+    # dead letter of a notification which failed for all attempts of its job
+    # kept when their ticket is deleted or archived, as the notification history of the ticket
+    ticket = models.ForeignKey(
+        Ticket, on_delete=models.DO_NOTHING, db_constraint=False, related_name="failed_notifications"
+    )
+    job = models.ForeignKey(
+        NotificationJob, on_delete=models.SET_NULL, null=True, blank=True, related_name="failed_notifications"
+    )
+    integration = models.CharField("Integration", max_length=45, choices=INTEGRATION_CHOICES, null=True, blank=True)
+    action = models.CharField("Action", max_length=255, null=True, blank=True)
+    payload = models.JSONField("Payload", null=True, blank=True)
+    error_class = models.CharField("Error class", max_length=255)
+    error = models.TextField("Error", null=True, blank=True)
+    attempts = models.PositiveSmallIntegerField("Attempts", default=0)
+    replayed_at = models.DateTimeField("Replayed at", null=True, blank=True)
+
+    class Meta:
+        app_label = "tickets"
+        verbose_name = "Failed Notification"
+        verbose_name_plural = "Failed Notifications"
+        ordering = ["-created_at"]
+        indexes = [
+            models.Index(fields=["created_at"], name="tickets_failed_created"),
+        ]
+
+    def __str__(self):
+        return f"{self.ticket_id} > {self.integration} > {self.error_class}"
+
+    @classmethod
+    def record(cls, job: NotificationJob, error: Exception) -> "FailedNotification":
+        """
+        Record a notification whose job failed for good.
+
+        Args:
+            job (NotificationJob): The failed job.
+            error (Exception): The error of the last attempt, a `NotificationError` for failed requests.
+
+        Returns:
+            FailedNotification: The recorded dead letter.
+        """
+        if isinstance(error, NotificationError):
+            return cls.objects.create(
+                ticket_id=job.ticket_id,
+                job=job,
+                integration=error.integration,
+                action=error.action,
+                payload=error.payload,
+                error_class=error.error_class,
+                error=error.message,
+                attempts=job.attempts,
+            )
+
+        return cls.objects.create(
+            ticket_id=job.ticket_id,
+            job=job,
+            error_class=type(error).__name__,
+            error=str(error),
+            attempts=job.attempts,
+        )
+
+
+def rollup_order(key: RollupKey) -> Tuple[str, str, int]:
+    """Return a sort key of the given analytics dimensions, tickets without client first."""
+    status, module, client_id = key
+    return status, module, client_id or 0
+
+
+class TicketCount(CoreModel):
+    """
+    The current number of tickets per status, module and client, the sum of `entered - left` of all rollups.
+
+    Kept up to date with the rollups, so the analytics read a row per dimensions instead of the daily history.
+    """
+
+    status = models.CharField("Status", max_length=100, choices=TICKET_STATUS_CHOICES)
+    module = models.CharField("Module", max_length=100, choices=TICKET_MODULE_CHOICES)
+    # counts outlive deleted clients, hence no database constraint
+    client = models.ForeignKey(
+        Client, null=True, blank=True, on_delete=models.DO_NOTHING, db_constraint=False, related_name="+"
+    )
+    tickets = models.IntegerField("Tickets", default=0)
+
+    class Meta:
+        app_label = "tickets"
+        verbose_name = "Ticket Count"
+        verbose_name_plural = "Ticket Counts"
+        ordering = ["status", "module", "client"]
+        constraints = [
+            models.UniqueConstraint(
+                F("status"), F("module"), Coalesce("client", Value(0)), name="tickets_ticketcount_dimensions"
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.status} > {self.module} > {self.client_id}: {self.tickets}"
+
+    @classmethod
+    def increment(cls, key: RollupKey, tickets: int):
+        """Add the given number of tickets, negative for tickets leaving, to the count of the dimensions."""
+        status, module, client_id = key
+        counts = cls.objects.filter(status=status, module=module, client_id=client_id)
+        values = {"tickets": F("tickets") + tickets, "updated_at": timezone.now()}
+        if counts.update(**values):
+            return
+
+        try:
+            with transaction.atomic():
+                cls.objects.create(status=status, module=module, client_id=client_id, tickets=tickets)
+        except IntegrityError:
+            # created by a concurrent transaction in the meantime
+            counts.update(**values)
+
+
+class TicketStatusRollup(CoreModel):
+    date = models.DateField("Date")
+    status = models.CharField("Status", max_length=100, choices=TICKET_STATUS_CHOICES)
+    module = models.CharField("Module", max_length=100, choices=TICKET_MODULE_CHOICES)
+    # rollups outlive deleted clients, hence no database constraint
+    client = models.ForeignKey(
+        Client, null=True, blank=True, on_delete=models.DO_NOTHING, db_constraint=False, related_name="+"
+    )
+
+    entered = models.PositiveIntegerField("Entered", default=0)
+    left = models.PositiveIntegerField("Left", default=0)
+    # tickets whose status changed to closed, unlike `entered`, which counts closed tickets changing client or module
+    closed = models.PositiveIntegerField("Closed", default=0)
+    close_duration = models.PositiveBigIntegerField("Time to close (seconds)", default=0)
+
+    class Meta:
+        app_label = "tickets"
+        verbose_name = "Ticket Status Rollup"
+        verbose_name_plural = "Ticket Status Rollups"
+        ordering = ["-date", "status", "module"]
+        constraints = [
+            models.UniqueConstraint(
+                fields=["date", "status", "module", "client"], name="tickets_ticketstatusrollup_dimensions"
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.date} > {self.status} > {self.module} > {self.client_id}"
+
+    @classmethod
+    def record_change(cls, ticket: Ticket, old_key: Optional[RollupKey], new_key: Optional[RollupKey]):
+        """
+        Record a change of the status, module or client of a ticket in today's rollups.
+
+        The ticket leaves the rollup of its old dimensions and enters the one of its new dimensions, and the
+        current ticket counts of both dimensions are updated.
+
+        Args:
+            ticket (Ticket): The changed ticket.
+            old_key (Optional[RollupKey]): The dimensions before the change, None for new tickets.
+            new_key (Optional[RollupKey]): The dimensions after the change, None for deleted tickets.
+        """
+        cls.record_changes([(ticket, old_key, new_key)])
+
+    @classmethod
+    def record_changes(cls, changes: Iterable[Tuple[Ticket, Optional[RollupKey], Optional[RollupKey]]]):
+        """
+        Record the changes of many tickets in today's rollups, with a single update per affected rollup.
+
+        Args:
+            changes (Iterable[Tuple[Ticket, Optional[RollupKey], Optional[RollupKey]]]): The changed tickets
+                with their dimensions before and after the change, see `record_change`.
+        """
+        now = timezone.now()
+        totals: Dict[RollupKey, List[int]] = defaultdict(lambda: [0, 0, 0, 0])
+        for ticket, old_key, new_key in changes:
+            if old_key:
+                totals[old_key][1] += 1
+            if new_key:
+                totals[new_key][0] += 1
+                if new_key[0] == TICKET_STATUS_CLOSED and (not old_key or old_key[0] != TICKET_STATUS_CLOSED):
+                    totals[new_key][2] += 1
+                    totals[new_key][3] += int((now - (ticket.created_at or now)).total_seconds())
+
+        today = timezone.localdate(now)
+        # rows are always locked in the same order, so concurrent changes don't deadlock
+        for key, (entered, left, closed, close_duration) in sorted(
+            totals.items(), key=lambda item: rollup_order(item[0])
+        ):
+            cls.increment(date=today, key=key, entered=entered, left=left, closed=closed, close_duration=close_duration)
+            if entered != left:
+                TicketCount.increment(key=key, tickets=entered - left)
+
+    @classmethod
+    def increment(cls, date, key: RollupKey, entered: int = 0, left: int = 0, closed: int = 0, close_duration: int = 0):
+        """Add the given counts to the rollup of a day and dimensions, creating it if needed."""
+        status, module, client_id = key
+        # the unique constraint doesn't cover rows without client, so always update a single row
+        rows = cls.objects.filter(date=date, status=status, module=module, client_id=client_id)
+        rollups = cls.objects.filter(pk__in=rows.order_by("pk").values("pk")[:1])
+        values = {
+            "entered": F("entered") + entered,
+            "left": F("left") + left,
+            "closed": F("closed") + closed,
+            "close_duration": F("close_duration") + close_duration,
+            "updated_at": timezone.now(),
+        }
+        if rollups.update(**values):
+            return
+
+        try:
+            with transaction.atomic():
+                cls.objects.create(
+                    date=date,
+                    status=status,
+                    module=module,
+                    client_id=client_id,
+                    entered=entered,
+                    left=left,
+                    closed=closed,
+                    close_duration=close_duration,
+                )
+        except IntegrityError:
+            # created by a concurrent transaction in the meantime
+            rollups.update(**values)
+
+
+class TicketStatusTransition(models.Model):
+    # append-only log, transitions are kept when their ticket is deleted or archived
+    ticket = models.ForeignKey(
+        Ticket, on_delete=models.DO_NOTHING, db_constraint=False, related_name="status_transitions"
+    )
+    # statuses are stored as their `TICKET_STATUS_CODES`, from_status is empty for new tickets
+    from_status = models.PositiveSmallIntegerField("From status", null=True, blank=True)
+    to_status = models.PositiveSmallIntegerField("To status")
+    created_at = models.DateTimeField(default=timezone.now)
+
+    class Meta:
+        app_label = "tickets"
+        verbose_name = "Ticket Status Transition"
+        verbose_name_plural = "Ticket Status Transitions"
+        ordering = ["ticket", "created_at", "id"]
+        indexes = [
+            models.Index(fields=["ticket", "created_at"], name="tickets_transition_timeline"),
+        ]
+
+    def __str__(self):
+        return f"{self.ticket_id} > {self.from_status} > {self.to_status}"
+
+    @classmethod
+    def record(cls, ticket: Ticket, from_status: Optional[str], to_status: str) -> "TicketStatusTransition":
+        """
+        Append a status transition of the given ticket to the log.
+
+        Args:
+            ticket (Ticket): The saved ticket.
+            from_status (Optional[str]): The previous status, None for new tickets.
+            to_status (str): The new status.
+
+        Returns:
+            TicketStatusTransition: The logged transition.
+        """
+        return cls.objects.create(
+            ticket_id=ticket.pk,
+            from_status=TICKET_STATUS_CODES[from_status] if from_status else None,
+            to_status=TICKET_STATUS_CODES[to_status],
+        )
+
+
+class ArchivedTicket(models.Model):
+    # copy of a closed ticket moved out of the tickets table, keeping its id, see `archive_closed_tickets`
+    id = models.BigIntegerField("ID", primary_key=True)
+    created_at = models.DateTimeField(null=True)
+    updated_at = models.DateTimeField(null=True)
+    archived_at = models.DateTimeField("Archived at", default=timezone.now)
+
+    # archived tickets outlive deleted clients and users, hence no database constraints
+    client = models.ForeignKey(
+        Client, null=True, blank=True, on_delete=models.DO_NOTHING, db_constraint=False, related_name="+"
+    )
+    draft = models.BooleanField(default=False)
+    ticket_no = models.CharField("Ticket No.", max_length=45, null=True, blank=True, unique=True)
+    title = models.CharField("Title", max_length=100, db_index=True)
+    description = models.TextField("Description", null=True, blank=True)
+    author = models.ForeignKey(
+        User, on_delete=models.DO_NOTHING, db_constraint=False, null=True, blank=True, related_name="+"
+    )
+    assignee = models.ForeignKey(
+        User, on_delete=models.DO_NOTHING, db_constraint=False, null=True, blank=True, related_name="+"
+    )
+    module = models.CharField("Module", max_length=100, choices=TICKET_MODULE_CHOICES, default=TICKET_MODULE_NONE)
+    status = models.CharField("Status", max_length=100, choices=TICKET_STATUS_CHOICES, default=TICKET_STATUS_CLOSED)
+    last_joblog_log = TextField("Last Job Log", null=True, blank=True)
+    last_joblog_message = TextField("Last Job Log Message", null=True, blank=True)
+    last_joblog_stacktrace = TextField("Last Job Log Stacktrace", null=True, blank=True)
+
+    trello_ticket_created = models.BooleanField("Trello Ticket Created", default=False)
+    trello_ticket_id = models.CharField("Trello Ticket ID", max_length=45, null=True, blank=True)
+    trello_ticket_url = models.URLField("Trello Ticket URL", null=True, blank=True)
+    slack_notification_sent = models.BooleanField("Slack Notification Sent", default=False)
+    slack_message_ts = models.CharField("Slack Message TS", max_length=45, null=True, blank=True)
+    slack_channel_id = models.CharField("Slack Channel ID", max_length=45, null=True, blank=True)
+
+    class Meta:
+        app_label = "tickets"
+        verbose_name = "Archived Ticket"
+        verbose_name_plural = "Archived Tickets"
+        ordering = ["-archived_at", "-id"]
+
+    def __str__(self):
+        return f"Ticket No. {self.ticket_no} (archived)"
+
+    @classmethod
+    def from_ticket(cls, ticket: Ticket) -> "ArchivedTicket":
+        """
+        Copy a ticket into an unsaved archived ticket, with the same id and field values.
+
+        Args:
+            ticket (Ticket): The ticket to archive.
+
+        Returns:
+            ArchivedTicket: The unsaved archived ticket.
+        """
+        return cls(**{field.attname: getattr(ticket, field.attname) for field in Ticket._meta.concrete_fields})
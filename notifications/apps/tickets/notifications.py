@@ -0,0 +1,54 @@
+from typing import TYPE_CHECKING
+
+from core.models import CoreSettings
+
+from tickets.slack import slack_create_message, slack_update_message
+from tickets.trello import trello_add_label, trello_create_ticket
+
+if TYPE_CHECKING:
+    from tickets.models import Ticket
+
+
+def handle_trello_ticket(ticket: "Ticket", core_settings: CoreSettings):
+    """
+    Create the Trello card of a published ticket and add its module label, once.
+
+    Args:
+        ticket (Ticket): The ticket, its trello fields are updated but not saved.
+        core_settings (CoreSettings): The core settings provide API credentials for trello.
+    """
+    # initially create trello ticket
+    if not ticket.draft and not ticket.trello_ticket_created:
+        # a card created by a previous attempt, whose label failed, is not created again
+        if not ticket.trello_ticket_id:
+            ticket_id, ticket_url = trello_create_ticket(ticket=ticket, core_settings=core_settings)
+            ticket.trello_ticket_id = ticket_id
+            ticket.trello_ticket_url = ticket_url
+        # add label to created trello ticket, the ticket counts as created once it is labeled
+        trello_add_label(ticket=ticket, core_settings=core_settings)
+        ticket.trello_ticket_created = True
+
+
+def handle_slack_message(ticket: "Ticket", core_settings: CoreSettings):
+    """
+    Create the Slack message of a published ticket once, and update its status reactions.
+
+    Args:
+        ticket (Ticket): The ticket, its slack fields are updated but not saved.
+        core_settings (CoreSettings): The core settings provide API credentials for slack.
+    """
+    # initially create the slack message
+    if not ticket.draft and not ticket.slack_notification_sent:
+        message_ts, channel_id = slack_create_message(ticket=ticket, core_settings=core_settings)
+        ticket.slack_message_ts = message_ts
+        ticket.slack_channel_id = channel_id
+        ticket.slack_notification_sent = True
+
+    # update slack reactions in any case
+    if ticket.slack_message_ts and ticket.slack_channel_id:
+        slack_update_message(ticket=ticket, core_settings=core_settings)
+
+
+# the handlers run in order, every handler may update the notification fields of the ticket, failing requests raise
+# `NotificationError`, unavailable integrations `CircuitOpenError` and used up rate limits `RateLimitExceededError`
+NOTIFICATION_HANDLERS = (handle_trello_ticket, handle_slack_message)
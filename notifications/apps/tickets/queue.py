@@ -0,0 +1,337 @@
+import logging
+import os
+import socket
+import threading
+import traceback
+from datetime import datetime, timedelta
+from typing import Iterable, List, Optional
+
+from core.models import CoreSettings
+from django.db import DatabaseError, close_old_connections, connection, transaction
+from django.db.models import Exists, F, OuterRef, Q, QuerySet
+from django.utils import timezone
+
+from tickets.constants import (
+    NOTIFICATION_JOB_LEASE,
+    NOTIFICATION_JOB_MAX_ATTEMPTS,
+    NOTIFICATION_JOB_RETRY_DELAY,
+    NOTIFICATION_JOB_STATUS_DONE,
+    NOTIFICATION_JOB_STATUS_FAILED,
+    NOTIFICATION_JOB_STATUS_PENDING,
+    NOTIFICATION_JOB_STATUS_RUNNING,
+    NOTIFICATION_SHARDS,
+)
+from tickets.exceptions import JobLeaseExpiredError
+from tickets.models import FailedNotification, NotificationJob, Ticket
+
+logger = logging.getLogger(__name__)
+
+
+def worker_name() -> str:
+    """Return a name identifying the current worker process and thread in job leases."""
+    return f"{socket.gethostname()}:{os.getpid()}:{threading.get_ident()}"
+
+
+def claim_jobs(worker: str, shards: Iterable[int], limit: int, lease: int = NOTIFICATION_JOB_LEASE) -> List[int]:
+    """
+    Claim the next jobs of the given shards for a worker.
+
+    Jobs are locked with `SELECT ... FOR UPDATE SKIP LOCKED`, so concurrent workers never block each other.
+    A job is only claimable if no earlier job of its ticket is still pending or running, which keeps the
+    jobs of every ticket in order, no matter how many workers there are. Jobs of crashed workers become
+    claimable again once their lease expired.
+
+    Args:
+        worker (str): The name of the claiming worker.
+        shards (Iterable[int]): The shards the worker processes.
+        limit (int): The maximum number of jobs to claim.
+        lease (int): Seconds the jobs are leased to the worker.
+
+    Returns:
+        List[int]: The ids of the claimed jobs, in processing order.
+    """
+    now = timezone.now()
+    unfinished = [NOTIFICATION_JOB_STATUS_PENDING, NOTIFICATION_JOB_STATUS_RUNNING]
+    earlier_unfinished = NotificationJob.objects.filter(
+        ticket_id=OuterRef("ticket_id"), id__lt=OuterRef("id"), status__in=unfinished
+    )
+
+    shards = list(shards)
+    with transaction.atomic():
+        fail_abandoned_jobs(shards=shards, now=now)
+        job_ids = list(
+            NotificationJob.objects.select_for_update(skip_locked=True)
+            .filter(
+                Q(status=NOTIFICATION_JOB_STATUS_PENDING, available_at__lte=now)
+                | Q(status=NOTIFICATION_JOB_STATUS_RUNNING, locked_until__lt=now),
+                shard__in=shards,
+            )
+            .exclude(Exists(earlier_unfinished))
+            .order_by("id")
+            .values_list("id", flat=True)[:limit]
+        )
+        NotificationJob.objects.filter(id__in=job_ids).update(
+            status=NOTIFICATION_JOB_STATUS_RUNNING,
+            locked_by=worker,
+            locked_until=now + timedelta(seconds=lease),
+            attempts=F("attempts") + 1,
+        )
+
+    return job_ids
+
+
+def fail_abandoned_jobs(shards: List[int], now: datetime) -> int:
+    """
+    Fail the running jobs of the given shards whose lease expired on their last attempt.
+
+    A job which crashes or hangs its worker is never finished by it, so it is reclaimed once its lease expired.
+    Without this, such a job would be retried forever, instead it is recorded as failed notification after
+    `NOTIFICATION_JOB_MAX_ATTEMPTS` attempts.
+
+    Args:
+        shards (List[int]): The shards to check.
+        now (datetime): The current time.
+
+    Returns:
+        int: The number of failed jobs.
+    """
+    jobs = list(
+        NotificationJob.objects.select_for_update(skip_locked=True).filter(
+            status=NOTIFICATION_JOB_STATUS_RUNNING,
+            locked_until__lt=now,
+            attempts__gte=NOTIFICATION_JOB_MAX_ATTEMPTS,
+            shard__in=shards,
+        )
+    )
+    for job in jobs:
+        error = JobLeaseExpiredError(f"The lease of {job.locked_by} expired on attempt {job.attempts}.")
+        NotificationJob.objects.filter(id=job.pk, locked_by=job.locked_by).update(
+            status=NOTIFICATION_JOB_STATUS_FAILED, locked_by=None, locked_until=None, last_error=str(error)
+        )
+        FailedNotification.record(job=job, error=error)
+        logger.warning("Notification job %s failed: %s", job.pk, error)
+    return len(jobs)
+
+
+def release_jobs(worker: str, job_ids: Iterable[int]):
+    """Hand claimed but unprocessed jobs back to the queue, for example when a worker shuts down."""
+    NotificationJob.objects.filter(
+        id__in=list(job_ids), locked_by=worker, status=NOTIFICATION_JOB_STATUS_RUNNING
+    ).update(status=NOTIFICATION_JOB_STATUS_PENDING, locked_by=None, locked_until=None, attempts=F("attempts") - 1)
+
+
+def extend_leases(worker: str, lease: int = NOTIFICATION_JOB_LEASE) -> int:
+    """Extend the leases of all jobs the given worker is running, returns the number of extended leases."""
+    return NotificationJob.objects.filter(locked_by=worker, status=NOTIFICATION_JOB_STATUS_RUNNING).update(
+        locked_until=timezone.now() + timedelta(seconds=lease)
+    )
+
+
+def fail_job(job: NotificationJob, worker: str, errors: List[Exception]):
+    """
+    Retry a failed job with an exponential backoff, or record its errors after the last attempt.
+
+    The errors of the last attempt are recorded as failed notifications, to replay them from the admin.
+
+    Args:
+        job (NotificationJob): The failed job.
+        worker (str): The name of the worker which claimed the job.
+        errors (List[Exception]): The errors of the attempt.
+    """
+    retry = job.attempts < NOTIFICATION_JOB_MAX_ATTEMPTS
+    with transaction.atomic():
+        NotificationJob.objects.filter(id=job.pk, locked_by=worker).update(
+            status=NOTIFICATION_JOB_STATUS_PENDING if retry else NOTIFICATION_JOB_STATUS_FAILED,
+            available_at=timezone.now() + timedelta(seconds=NOTIFICATION_JOB_RETRY_DELAY * 2 ** (job.attempts - 1)),
+            locked_by=None,
+            locked_until=None,
+            last_error="\n".join("".join(traceback.format_exception(error)) for error in errors),
+        )
+        if not retry:
+            for error in errors:
+                FailedNotification.record(job=job, error=error)
+
+
+def process_job(job_id: int, worker: str, core_settings: Optional[CoreSettings] = None) -> bool:
+    """
+    Send the notifications of a claimed job and store the Slack and Trello references on its ticket.
+
+    Only the notification fields of the ticket are written, so edits made to the ticket in the meantime are
+    not overwritten. Failing jobs are retried with an exponential backoff, up to
+    `NOTIFICATION_JOB_MAX_ATTEMPTS` times, and then recorded as failed notifications. Jobs skipped due to an
+    open circuit breaker are postponed without counting as an attempt.
+
+    Args:
+        job_id (int): The id of the claimed job.
+        worker (str): The name of the worker which claimed the job.
+        core_settings (Optional[CoreSettings]): The core settings, loaded from the database if not given.
+
+    Returns:
+        bool: True if the job was processed successfully.
+    """
+    job = NotificationJob.objects.filter(id=job_id, locked_by=worker).first()
+    if not job:
+        # the lease was lost to another worker
+        return False
+
+    try:
+        core_settings = core_settings or CoreSettings.objects.first()
+        ticket = Ticket.objects.filter(pk=job.ticket_id).first()
+        result = None
+        if ticket and core_settings:
+            result = ticket.send_notifications(core_settings=core_settings)
+            # store the notifications sent before a failure, they are not sent again on retry
+            Ticket.objects.filter(pk=ticket.pk).update(
+                **{field: getattr(ticket, field) for field in Ticket.NOTIFICATION_FIELDS}
+            )
+    except Exception as e:
+        fail_job(job=job, worker=worker, errors=[e])
+        return False
+
+    if result and result.errors:
+        fail_job(job=job, worker=worker, errors=list(result.errors))
+        return False
+
+    if result and result.deferred_until:
+        # an integration is unavailable or rate limited, retry once it may be called again
+        NotificationJob.objects.filter(id=job.pk, locked_by=worker).update(
+            status=NOTIFICATION_JOB_STATUS_PENDING,
+            available_at=result.deferred_until,
+            attempts=F("attempts") - 1,
+            locked_by=None,
+            locked_until=None,
+        )
+        return False
+
+    NotificationJob.objects.filter(id=job.pk, locked_by=worker).update(
+        status=NOTIFICATION_JOB_STATUS_DONE, locked_by=None, locked_until=None, last_error=None
+    )
+    return True
+
+
+def replay_failed_notifications(failed_notifications: QuerySet) -> Optional[str]:
+    """
+    Replay failed notifications through the notification queue, which sends them rate limited.
+
+    The notifications of a ticket are replayed as a whole: its job runs all integrations again, which only send
+    what is still missing. Tickets without notifications, e.g. drafts, are skipped and their failed notifications
+    are left as they are, to replay them once the ticket is published.
+
+    Args:
+        failed_notifications (QuerySet): The failed notifications to replay.
+
+    Returns:
+        Optional[str]: The batch id of the queued jobs, None if no job was queued.
+    """
+    with transaction.atomic():
+        ticket_ids = failed_notifications.values("ticket_id")
+        tickets = Ticket.objects.filter(pk__in=ticket_ids).only("id", "draft", "slack_message_ts")
+        tickets = [ticket for ticket in tickets if ticket.has_notifications]
+        batch = NotificationJob.enqueue_batch(tickets=tickets) if tickets else None
+        failed_notifications.filter(ticket_id__in=[ticket.pk for ticket in tickets]).update(replayed_at=timezone.now())
+    return batch
+
+
+class NotificationWorker:
+    """
+    Pool of threads processing the notification queue.
+
+    Every thread owns a fixed subset of the shards, so the jobs of a ticket are always processed by the same
+    thread, one after another, while different tickets are processed in parallel. Several worker processes
+    may run side by side, the claim query keeps the jobs of a ticket in order across processes as well.
+    """
+
+    def __init__(
+        self,
+        threads: int = 1,
+        batch_size: int = 10,
+        poll_interval: float = 1.0,
+        lease: int = NOTIFICATION_JOB_LEASE,
+    ):
+        """
+        Configure the worker pool.
+
+        Args:
+            threads (int): The number of threads, each owning every n-th shard.
+            batch_size (int): The number of jobs a thread claims at once.
+            poll_interval (float): Seconds a thread waits for new jobs when the queue is empty.
+            lease (int): Seconds claimed jobs are leased to a thread, extended by the heartbeat.
+        """
+        self.threads = max(1, min(threads, NOTIFICATION_SHARDS))
+        self.batch_size = batch_size
+        self.poll_interval = poll_interval
+        self.lease = lease
+        self.stop_event = threading.Event()
+        self.workers: List[str] = []
+        self.workers_lock = threading.Lock()
+
+    def stop(self, *args):
+        """Stop the worker gracefully, running jobs are finished and claimed jobs are released."""
+        self.stop_event.set()
+
+    def run(self):
+        """Process the queue until the worker is stopped."""
+        threads = [
+            threading.Thread(
+                target=self.run_thread,
+                args=(list(range(index, NOTIFICATION_SHARDS, self.threads)),),
+                name=f"notification-worker-{index}",
+            )
+            for index in range(self.threads)
+        ]
+        heartbeat = threading.Thread(target=self.run_heartbeat, name="notification-worker-heartbeat")
+
+        for thread in [*threads, heartbeat]:
+            thread.start()
+        for thread in [*threads, heartbeat]:
+            thread.join()
+
+    def run_thread(self, shards: List[int]):
+        """Process the jobs of the given shards until the worker is stopped."""
+        worker = worker_name()
+        with self.workers_lock:
+            self.workers.append(worker)
+
+        try:
+            while not self.stop_event.is_set():
+                close_old_connections()
+                try:
+                    processed = self.process_batch(worker=worker, shards=shards)
+                except DatabaseError as e:
+                    # e.g. lock timeouts, unprocessed jobs are claimed again once their lease expired
+                    logger.warning("%s failed to process jobs: %s", worker, e)
+                    processed = 0
+                if not processed:
+                    self.stop_event.wait(self.poll_interval)
+        finally:
+            connection.close()
+
+    def process_batch(self, worker: str, shards: List[int]) -> int:
+        """Claim and process a batch of jobs, returns the number of processed jobs."""
+        job_ids = claim_jobs(worker=worker, shards=shards, limit=self.batch_size, lease=self.lease)
+        if not job_ids:
+            return 0
+
+        core_settings = CoreSettings.objects.first()
+        for index, job_id in enumerate(job_ids):
+            if self.stop_event.is_set():
+                release_jobs(worker=worker, job_ids=job_ids[index:])
+                return index
+            process_job(job_id=job_id, worker=worker, core_settings=core_settings)
+
+        return len(job_ids)
+
+    def run_heartbeat(self):
+        """Extend the leases of the running jobs of all threads, until the worker is stopped."""
+        try:
+            while not self.stop_event.wait(self.lease / 3):
+                close_old_connections()
+                with self.workers_lock:
+                    workers = list(self.workers)
+                for worker in workers:
+                    try:
+                        extend_leases(worker=worker, lease=self.lease)
+                    except DatabaseError as e:
+                        logger.warning("%s failed to extend its leases: %s", worker, e)
+        finally:
+            connection.close()
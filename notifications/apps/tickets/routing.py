@@ -0,0 +1,163 @@
+import threading
+import time
+from typing import TYPE_CHECKING, Dict, NamedTuple, Optional, Tuple
+
+from core.models import CoreSettings
+from django.apps import apps
+
+from tickets.constants import ROUTING_CACHE_TTL
+
+if TYPE_CHECKING:
+    from tickets.models import Ticket
+
+RouteKey = Tuple[Optional[int], Optional[str]]
+
+
+class NotificationTarget(NamedTuple):
+    slack_channel_id: Optional[str]
+    trello_board_id: Optional[str]
+    trello_list_id: Optional[str]
+
+
+class NotificationRouter:
+    """
+    In-memory matcher resolving the Slack channel and Trello board/list for a ticket.
+
+    All routes are compiled into a dictionary keyed by `(client_id, module)`. Every entry already has its empty
+    fields filled from the more general routes and finally from the core settings, so resolving a ticket
+    takes at most three dictionary lookups, from the most to the least specific key:
+    `(client, module)`, `(client, any module)` and `(any client, module)`. A route without client and
+    module overrides the core settings for all tickets.
+    """
+
+    def __init__(self, routes: Dict[RouteKey, NotificationTarget], default: NotificationTarget):
+        """
+        Create the router, see `compile`.
+
+        Args:
+            routes (Dict[RouteKey, NotificationTarget]): The compiled routes, with their empty fields filled.
+            default (NotificationTarget): The target of tickets without a matching route.
+        """
+        self.routes = routes
+        self.default = default
+
+    @classmethod
+    def compile(cls, core_settings: Optional[CoreSettings]) -> "NotificationRouter":
+        """
+        Load all notification routes from the database and compile them into a router.
+
+        Args:
+            core_settings (Optional[CoreSettings]): The core settings providing the fallback targets.
+
+        Returns:
+            NotificationRouter: The compiled router.
+        """
+        default = NotificationTarget(
+            slack_channel_id=core_settings.slack_channel_id if core_settings else None,
+            trello_board_id=core_settings.trello_board_id if core_settings else None,
+            trello_list_id=core_settings.trello_list_id if core_settings else None,
+        )
+
+        rows: Dict[RouteKey, NotificationTarget] = {}
+        # the model is looked up in the app registry, so the integrations importing the router don't import the models
+        routes = apps.get_model("tickets", "NotificationRoute").objects.order_by("updated_at")
+        for client_id, module, *target in routes.values_list(
+            "client_id", "module", "slack_channel_id", "trello_board_id", "trello_list_id"
+        ):
+            rows[(client_id, module or None)] = NotificationTarget(*(value or None for value in target))
+
+        def merge(target: NotificationTarget, fallback: NotificationTarget) -> NotificationTarget:
+            # a trello list belongs to a board, so both are always taken from the same route
+            trello_board_id, trello_list_id = target.trello_board_id, target.trello_list_id
+            if not trello_list_id:
+                trello_board_id, trello_list_id = fallback.trello_board_id, fallback.trello_list_id
+            return NotificationTarget(
+                slack_channel_id=target.slack_channel_id or fallback.slack_channel_id,
+                trello_board_id=trello_board_id,
+                trello_list_id=trello_list_id,
+            )
+
+        routes: Dict[RouteKey, NotificationTarget] = {}
+        for client_id, module in rows:
+            # fill the empty fields from the more general routes, from the most to the least specific one
+            target = default
+            for key in [(None, None), (None, module), (client_id, None), (client_id, module)]:
+                if key in rows:
+                    target = merge(rows[key], target)
+            routes[(client_id, module)] = target
+
+        # a route without client and module replaces the core settings as the default
+        default = routes.pop((None, None), default)
+
+        return cls(routes=routes, default=default)
+
+    def resolve(self, client_id: Optional[int], module: Optional[str]) -> NotificationTarget:
+        """
+        Resolve the notification target for the given client and module.
+
+        Args:
+            client_id (Optional[int]): The primary key of the ticket's client.
+            module (Optional[str]): The ticket's module.
+
+        Returns:
+            NotificationTarget: The matching target, the core settings targets if no route matches.
+        """
+        routes = self.routes
+        return (
+            routes.get((client_id, module))
+            or routes.get((client_id, None))
+            or routes.get((None, module))
+            or self.default
+        )
+
+
+_router: Optional[NotificationRouter] = None
+_router_expires_at = 0.0
+_router_lock = threading.Lock()
+
+
+def get_router(core_settings: Optional[CoreSettings] = None) -> NotificationRouter:
+    """
+    Return the compiled notification router of this process.
+
+    The router is compiled lazily and recompiled after `ROUTING_CACHE_TTL` seconds, so changes made by other
+    processes are picked up. Changes made in this process invalidate it right away.
+
+    Args:
+        core_settings (Optional[CoreSettings]): The core settings, loaded from the database if not given.
+
+    Returns:
+        NotificationRouter: The compiled router.
+    """
+    global _router, _router_expires_at
+
+    router = _router
+    if router is not None and time.monotonic() < _router_expires_at:
+        return router
+
+    with _router_lock:
+        if _router is None or time.monotonic() >= _router_expires_at:
+            _router = NotificationRouter.compile(core_settings or CoreSettings.objects.first())
+            _router_expires_at = time.monotonic() + ROUTING_CACHE_TTL
+        return _router
+
+
+def invalidate_router():
+    """Drop the compiled notification router, the next lookup compiles it again."""
+    global _router
+    with _router_lock:
+        _router = None
+
+
+def route_ticket(ticket: "Ticket", core_settings: Optional[CoreSettings] = None) -> NotificationTarget:
+    """
+    Resolve the Slack channel and Trello board/list notifications of the given ticket are sent to.
+
+    Args:
+        ticket (Ticket): The ticket to route.
+        core_settings (Optional[CoreSettings]): The core settings providing the fallback targets.
+
+    Returns:
+        NotificationTarget: The target of the ticket's notifications.
+    """
+    return get_router(core_settings=core_settings).resolve(client_id=ticket.client_id, module=ticket.module)
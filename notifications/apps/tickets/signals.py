@@ -0,0 +1,39 @@
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from core.models import CoreSettings
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from tickets.models import NotificationRoute, Ticket, TicketStatusRollup
+from tickets.routing import invalidate_router
+
+# set by `suppress_rollups`, while deleted tickets stay in the analytics rollups
+rollups_suppressed: ContextVar[bool] = ContextVar("rollups_suppressed", default=False)
+
+
+@contextmanager
+def suppress_rollups():
+    """Keep the tickets deleted within the block in the analytics rollups, e.g. when moving them to the archive."""
+    token = rollups_suppressed.set(True)
+    try:
+        yield
+    finally:
+        rollups_suppressed.reset(token)
+
+
+@receiver(post_save, sender=CoreSettings)
+@receiver(post_delete, sender=CoreSettings)
+@receiver(post_save, sender=NotificationRoute)
+@receiver(post_delete, sender=NotificationRoute)
+def notification_routes_changed(sender, **kwargs):
+    """Recompile the notification routes of this process after the routes or the default targets changed."""
+    invalidate_router()
+
+
+@receiver(post_delete, sender=Ticket)
+def ticket_deleted(sender, instance: Ticket, **kwargs):
+    """Remove deleted tickets from the analytics rollups, unless they are suppressed."""
+    if rollups_suppressed.get():
+        return
+    TicketStatusRollup.record_change(ticket=instance, old_key=instance.rollup_key, new_key=None)
@@ -1,15 +1,104 @@
-from typing import Dict, List, Tuple, Union
+from typing import TYPE_CHECKING, Dict, List, Tuple, Union
 
 import requests
 from django.conf import settings
 from django.urls import reverse
 
+from clients.cache import get_client_display
+from core.circuit_breaker import CircuitBreaker
 from core.models import CoreSettings
-from tickets.constants import SLACK_STATUS_REACTION
-from tickets.models import Ticket
+from core.rate_limit import RateLimiter
+from tickets.constants import (
+    INTEGRATION_FAILURE_THRESHOLD,
+    INTEGRATION_RECOVERY_TIMEOUT,
+    INTEGRATION_REQUEST_TIMEOUT,
+    INTEGRATION_SLACK,
+    SLACK_RATE_LIMIT,
+    SLACK_RATE_LIMIT_BURST,
+    SLACK_STATUS_REACTION,
+)
+from tickets.exceptions import NotificationError
+from tickets.formatting import html_to_slack_mrkdwn
+from tickets.routing import route_ticket
 
+if TYPE_CHECKING:
+    from tickets.models import Ticket
 
-def slack_update_message(ticket: Ticket, core_settings: CoreSettings):
+slack_circuit_breaker = CircuitBreaker(
+    name="slack", failure_threshold=INTEGRATION_FAILURE_THRESHOLD, recovery_timeout=INTEGRATION_RECOVERY_TIMEOUT
+)
+slack_rate_limiter = RateLimiter(name=INTEGRATION_SLACK, rate=SLACK_RATE_LIMIT, burst=SLACK_RATE_LIMIT_BURST)
+
+
+def slack_request(method: str, endpoint: str, core_settings: CoreSettings, **kwargs) -> requests.Response:
+    """
+    Send a request to the Slack Web API through the Slack rate limiter and circuit breaker.
+
+    Args:
+        method (str): The HTTP method.
+        endpoint (str): The Slack API method, e.g. `chat.postMessage`.
+        core_settings (CoreSettings): The core settings provide API credentials for slack.
+        **kwargs: Keyword arguments passed on to `requests.request`.
+
+    Returns:
+        requests.Response: The response of the Slack API.
+
+    Raises:
+        CircuitOpenError: If Slack is currently unavailable, the request is not sent.
+        RateLimitExceededError: If the rate limit of the method is used up, the request is not sent.
+        NotificationError: If the request failed.
+    """
+    if settings.INTEGRATION_RATE_LIMITS:
+        # slack limits the methods per workspace, only posting messages is limited per channel
+        key = endpoint
+        if endpoint == "chat.postMessage":
+            key = f"{endpoint} {kwargs['json']['channel']}"
+        slack_rate_limiter.acquire(key)
+    try:
+        return slack_circuit_breaker.request(
+            method,
+            f"{settings.SLACK_API_URL}/{endpoint}",
+            headers={
+                "Authorization": f"Bearer {core_settings.slack_token}",
+                "Content-Type": "application/json; charset=utf-8",
+            },
+            timeout=INTEGRATION_REQUEST_TIMEOUT,
+            **kwargs,
+        )
+    except requests.exceptions.RequestException as e:
+        raise NotificationError.from_exception(
+            integration=INTEGRATION_SLACK, action=endpoint, payload=kwargs.get("json") or kwargs.get("params"), error=e
+        ) from e
+
+
+def slack_check_response(endpoint: str, payload: dict, data: dict, ignored_errors: Tuple[str, ...] = ()) -> dict:
+    """
+    Check the response data of a Slack API method, Slack reports errors with a successful HTTP status.
+
+    Args:
+        endpoint (str): The Slack API method.
+        payload (dict): The request body sent to the method.
+        data (dict): The response data.
+        ignored_errors (Tuple[str, ...]): Slack errors which leave the message as intended, e.g. `no_reaction`.
+
+    Returns:
+        dict: The response data, if the call was successful.
+
+    Raises:
+        NotificationError: If Slack reports an error.
+    """
+    if not data.get("ok") and data.get("error") not in ignored_errors:
+        raise NotificationError(
+            integration=INTEGRATION_SLACK,
+            action=endpoint,
+            payload=payload,
+            error_class="SlackApiError",
+            message=data.get("error") or "unknown error",
+        )
+    return data
+
+
+def slack_update_message(ticket: "Ticket", core_settings: CoreSettings):
     """
     Update the Slack message for a given ticket.
 
@@ -25,9 +114,9 @@ def slack_update_message(ticket: Ticket, core_settings: CoreSettings):
     slack_update_message_status(ticket=ticket, core_settings=core_settings)
 
 
-def slack_create_message(ticket: Ticket, core_settings: CoreSettings) -> Tuple[str, str]:
+def slack_create_message(ticket: "Ticket", core_settings: CoreSettings) -> Tuple[str, str]:
     """
-    Post a new ticket message to Slack and add a status-specific reaction.
+    Post a new ticket message to the Slack channel the ticket is routed to and add a status-specific reaction.
 
     Args:
         ticket (Ticket): The ticket object containing details to be posted.
@@ -35,29 +124,23 @@ def slack_create_message(ticket: Ticket, core_settings: CoreSettings) -> Tuple[s
 
     Returns:
         Tuple[str, str]: A tuple containing the Slack message timestamp and channel ID.
+
+    Raises:
+        CircuitOpenError: If Slack is currently unavailable.
+        NotificationError: If the message could not be posted.
     """
-    try:
-        data = requests.post(
-            "https://slack.com/api/chat.postMessage",
-            headers={
-                "Authorization": f"Bearer {core_settings.slack_token}",
-                "Content-Type": "application/json; charset=utf-8",
-            },
-            json={
-                "channel": core_settings.slack_channel_id,
-                "blocks": slack_message_blocks(ticket=ticket),
-            },
-        ).json()
-        slack_update_message_reaction(ticket=ticket, core_settings=core_settings)
-    except requests.exceptions.RequestException as e:
-        # todo: do something about it, for example send an email
-        print(e)
-        return "", ""
+    # the status reaction is added by `slack_update_message`, once the message timestamp is stored on the ticket
+    payload = {
+        "channel": route_ticket(ticket=ticket, core_settings=core_settings).slack_channel_id,
+        "blocks": slack_message_blocks(ticket=ticket),
+    }
+    response = slack_request("POST", "chat.postMessage", core_settings=core_settings, json=payload)
+    data = slack_check_response(endpoint="chat.postMessage", payload=payload, data=response.json())
 
-    return data.get("ts"), data.get("channel")
+    return data["ts"], data["channel"]
 
 
-def slack_update_message_status(ticket: Ticket, core_settings: CoreSettings):
+def slack_update_message_status(ticket: "Ticket", core_settings: CoreSettings):
     """
     Update the Slack message for a given ticket with the latest block content.
 
@@ -65,21 +148,16 @@ def slack_update_message_status(ticket: Ticket, core_settings: CoreSettings):
         ticket (Ticket): The ticket object containing Slack channel ID, message timestamp, and ticket details.
         core_settings (CoreSettings): The core settings provide API credentials for trello.
     """
-    requests.post(
-        "https://slack.com/api/chat.update",
-        headers={
-            "Authorization": f"Bearer {core_settings.slack_token}",
-            "Content-Type": "application/json; charset=utf-8",
-        },
-        json={
-            "channel": ticket.slack_channel_id,
-            "ts": ticket.slack_message_ts,
-            "blocks": slack_message_blocks(ticket=ticket),
-        },
-    )
+    payload = {
+        "channel": ticket.slack_channel_id,
+        "ts": ticket.slack_message_ts,
+        "blocks": slack_message_blocks(ticket=ticket),
+    }
+    response = slack_request("POST", "chat.update", core_settings=core_settings, json=payload)
+    slack_check_response(endpoint="chat.update", payload=payload, data=response.json())
 
 
-def slack_update_message_reaction(ticket: Ticket, core_settings: CoreSettings):
+def slack_update_message_reaction(ticket: "Ticket", core_settings: CoreSettings):
     """
     Add a status-specific reaction to a Slack message associated with the given ticket.
 
@@ -87,21 +165,18 @@ def slack_update_message_reaction(ticket: Ticket, core_settings: CoreSettings):
         ticket (Ticket): The ticket object containing Slack channel ID, message timestamp, and status.
         core_settings (CoreSettings): The core settings provide API credentials for trello.
     """
-    requests.post(
-        "https://slack.com/api/reactions.add",
-        headers={
-            "Authorization": f"Bearer {core_settings.slack_token}",
-            "Content-Type": "application/json; charset=utf-8",
-        },
-        json={
-            "channel": ticket.slack_channel_id,
-            "timestamp": ticket.slack_message_ts,
-            "name": SLACK_STATUS_REACTION[ticket.status],
-        },
+    payload = {
+        "channel": ticket.slack_channel_id,
+        "timestamp": ticket.slack_message_ts,
+        "name": SLACK_STATUS_REACTION[ticket.status],
+    }
+    response = slack_request("POST", "reactions.add", core_settings=core_settings, json=payload)
+    slack_check_response(
+        endpoint="reactions.add", payload=payload, data=response.json(), ignored_errors=("already_reacted",)
     )
 
 
-def slack_remove_message_reaction(ticket: Ticket, core_settings: CoreSettings):
+def slack_remove_message_reaction(ticket: "Ticket", core_settings: CoreSettings):
     """
     Remove all reactions from a Slack message associated with the given ticket.
 
@@ -109,36 +184,27 @@ def slack_remove_message_reaction(ticket: Ticket, core_settings: CoreSettings):
         ticket (Ticket): The ticket object containing Slack channel ID and message timestamp.
         core_settings (CoreSettings): The core settings provide API credentials for trello.
     """
-    data = requests.get(
-        "https://slack.com/api/reactions.get",
-        headers={
-            "Authorization": f"Bearer {core_settings.slack_token}",
-            "Content-Type": "application/json; charset=utf-8",
-        },
-        params={
-            "channel": ticket.slack_channel_id,
-            "timestamp": ticket.slack_message_ts,
-        },
-    ).json()
+    params = {
+        "channel": ticket.slack_channel_id,
+        "timestamp": ticket.slack_message_ts,
+    }
+    response = slack_request("GET", "reactions.get", core_settings=core_settings, params=params)
+    data = slack_check_response(endpoint="reactions.get", payload=params, data=response.json())
 
     for reaction in data.get("message", {}).get("reactions", []):
-        emoji_name = reaction["name"]
-
-        requests.post(
-            "https://slack.com/api/reactions.remove",
-            headers={
-                "Authorization": f"Bearer {core_settings.slack_token}",
-                "Content-Type": "application/json; charset=utf-8",
-            },
-            json={
-                "channel": ticket.slack_channel_id,
-                "timestamp": ticket.slack_message_ts,
-                "name": emoji_name,
-            },
+        payload = {
+            "channel": ticket.slack_channel_id,
+            "timestamp": ticket.slack_message_ts,
+            "name": reaction["name"],
+        }
+        response = slack_request("POST", "reactions.remove", core_settings=core_settings, json=payload)
+        # reactions of other users can't be removed
+        slack_check_response(
+            endpoint="reactions.remove", payload=payload, data=response.json(), ignored_errors=("no_reaction",)
         )
 
 
-def slack_message_blocks(ticket: Ticket) -> List[Dict[str, Union[str, dict]]]:
+def slack_message_blocks(ticket: "Ticket") -> List[Dict[str, Union[str, dict]]]:
     """
     Generate Slack message blocks for a given ticket, including a link to the Django admin page and client information.
 
@@ -148,15 +214,14 @@ def slack_message_blocks(ticket: Ticket) -> List[Dict[str, Union[str, dict]]]:
     Returns:
         List[Dict[str, Union[str, dict]]]: A list of Slack block elements formatted as dictionaries.
     """
-    django_admin_path = reverse("admin:tickets_ticket_change", args=[ticket.pk])
-    django_admin_url = f"{settings.BASE_URL}{django_admin_path}"
-    client = ticket.client
-    client_id = client.pk if client else "N/A"
+    django_admin_url = settings.BASE_URL + reverse("admin:tickets_ticket_change", args=[ticket.pk])
+    client = get_client_display(ticket.client_id)
+    client_id = client.id if client else "N/A"
     client_name = client.name if client else "N/A"
-    client_admin_path = reverse("admin:clients_client_change", args=[client_id]) if client else None
-    client_admin_url = f"{settings.BASE_URL}{client_admin_path}" if client else ""
+    client_admin_url = settings.BASE_URL + reverse("admin:clients_client_change", args=[client_id]) if client else ""
+    description = html_to_slack_mrkdwn(ticket.description)
 
-    return [
+    blocks = [
         {
             "type": "header",
             "text": {
@@ -193,3 +258,9 @@ def slack_message_blocks(ticket: Ticket) -> List[Dict[str, Union[str, dict]]]:
             "text": {"type": "mrkdwn", "text": f"*Status: {ticket.get_status_display()}*"},
         },
     ]
+
+    # add the converted description right after the ticket summary, slack rejects empty text sections
+    if description:
+        blocks.insert(3, {"type": "section", "text": {"type": "mrkdwn", "text": description}})
+
+    return blocks
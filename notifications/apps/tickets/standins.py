@@ -0,0 +1,126 @@
+import json
+import threading
+import time
+import uuid
+from collections import Counter
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlsplit
+
+SLACK_STANDIN_PATH = "/slack/api/"
+TRELLO_STANDIN_PATH = "/trello/1/"
+
+
+class _StandInHandler(BaseHTTPRequestHandler):
+    server: "IntegrationStandIn"
+
+    def do_GET(self):
+        """Answer a GET request."""
+        self.respond()
+
+    def do_POST(self):
+        """Answer a POST request."""
+        self.respond()
+
+    def do_PUT(self):
+        """Answer a PUT request."""
+        self.respond()
+
+    def do_DELETE(self):
+        """Answer a DELETE request."""
+        self.respond()
+
+    def respond(self):
+        """Answer a Slack or Trello call after the latency of the stand-in, and count it."""
+        path = urlsplit(self.path).path
+        self.rfile.read(int(self.headers.get("Content-Length") or 0))
+        if self.server.latency:
+            time.sleep(self.server.latency)
+
+        if path.startswith(SLACK_STANDIN_PATH):
+            method = path[len(SLACK_STANDIN_PATH) :]
+            data = self.slack_response(method)
+            self.server.count(f"slack {method}")
+        elif path.startswith(TRELLO_STANDIN_PATH):
+            data = self.trello_response(path[len(TRELLO_STANDIN_PATH) :])
+            self.server.count(f"trello {self.command} {path[len(TRELLO_STANDIN_PATH) :].split('/')[0]}")
+        else:
+            self.send_error(404)
+            return
+
+        body = json.dumps(data).encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def slack_response(self, method: str) -> dict:
+        """Return a minimal successful response of the given Slack API method."""
+        if method == "chat.postMessage":
+            return {"ok": True, "ts": f"{time.time():.6f}", "channel": "C0STANDIN"}
+        if method == "reactions.get":
+            return {"ok": True, "message": {"reactions": []}}
+        return {"ok": True}
+
+    def trello_response(self, path: str) -> object:
+        """Return a minimal successful response of the given Trello API path."""
+        if self.command == "POST" and path == "cards":
+            card_id = uuid.uuid4().hex[:24]
+            return {"id": card_id, "url": f"https://trello.com/c/{card_id}"}
+        if path.endswith("/labels"):
+            return []
+        return {}
+
+    def log_message(self, format, *args):
+        """Skip logging, requests are counted instead."""
+
+
+class IntegrationStandIn(ThreadingHTTPServer):
+    """
+    Local HTTP server standing in for the Slack Web API and the Trello REST API, e.g. for load tests.
+
+    Every call succeeds after `latency` seconds with a minimal response, calls are counted per API method. Point
+    the `SLACK_API_URL` and `TRELLO_API_URL` settings to `slack_api_url` and `trello_api_url`.
+    """
+
+    daemon_threads = True
+
+    def __init__(self, host: str = "127.0.0.1", port: int = 0, latency: float = 0.0):
+        """
+        Bind the stand-in, `start` serves it.
+
+        Args:
+            host (str): The host to listen on.
+            port (int): The port to listen on, any free port by default.
+            latency (float): Seconds to wait before answering a call.
+        """
+        super().__init__((host, port), _StandInHandler)
+        self.latency = latency
+        self.calls: Counter = Counter()
+        self.calls_lock = threading.Lock()
+
+    @property
+    def base_url(self) -> str:
+        """The url of the stand-in."""
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}"
+
+    @property
+    def slack_api_url(self) -> str:
+        """The url to use as `SLACK_API_URL`."""
+        return f"{self.base_url}{SLACK_STANDIN_PATH.rstrip('/')}"
+
+    @property
+    def trello_api_url(self) -> str:
+        """The url to use as `TRELLO_API_URL`."""
+        return f"{self.base_url}{TRELLO_STANDIN_PATH.rstrip('/')}"
+
+    def count(self, call: str):
+        """Count a call of the given API method."""
+        with self.calls_lock:
+            self.calls[call] += 1
+
+    def start(self) -> "IntegrationStandIn":
+        """Serve in a background thread."""
+        threading.Thread(target=self.serve_forever, name="integration-standin", daemon=True).start()
+        return self
@@ -0,0 +1,91 @@
+from collections import defaultdict
+from datetime import datetime
+from typing import Dict, Iterable, List, Optional
+
+from django.utils import timezone
+
+from tickets.constants import TICKET_STATUS_BY_CODE
+from tickets.models import TicketStatusTransition
+
+TRANSITION_FIELDS = ("ticket_id", "from_status", "to_status", "created_at")
+
+
+class StatusTransition:
+    """Lightweight, read-only view on a logged status transition."""
+
+    __slots__ = TRANSITION_FIELDS
+
+    def __init__(self, ticket_id: int, from_status: Optional[int], to_status: int, created_at: datetime):
+        """Create the view from the stored values, statuses are `TICKET_STATUS_CODES`."""
+        self.ticket_id = ticket_id
+        self.from_status = from_status
+        self.to_status = to_status
+        self.created_at = created_at
+
+    def __repr__(self):
+        return (
+            f"StatusTransition({self.ticket_id}, {self.from_status_name} -> {self.to_status_name}, {self.created_at})"
+        )
+
+    @property
+    def from_status_name(self) -> Optional[str]:
+        """The previous status, None for new tickets."""
+        return TICKET_STATUS_BY_CODE.get(self.from_status) if self.from_status else None
+
+    @property
+    def to_status_name(self) -> str:
+        """The new status."""
+        return TICKET_STATUS_BY_CODE[self.to_status]
+
+
+def ticket_timeline(ticket_id: int) -> List[StatusTransition]:
+    """
+    Load the status transitions of a ticket, in the order they happened.
+
+    Args:
+        ticket_id (int): The id of the ticket.
+
+    Returns:
+        List[StatusTransition]: The transitions of the ticket.
+    """
+    rows = TicketStatusTransition.objects.filter(ticket_id=ticket_id).order_by("created_at", "id")
+    return [StatusTransition(*row) for row in rows.values_list(*TRANSITION_FIELDS)]
+
+
+def time_in_status(ticket_ids: Iterable[int], until: Optional[datetime] = None) -> Dict[int, Dict[str, float]]:
+    """
+    Compute the seconds each of the given tickets spent in each status, with a single query.
+
+    Args:
+        ticket_ids (Iterable[int]): The ids of the tickets.
+        until (Optional[datetime]): The end of the time span of the current status, now if not given.
+
+    Returns:
+        Dict[int, Dict[str, float]]: The seconds spent per status, by ticket id. Tickets without logged
+        transitions are missing.
+    """
+    until = until or timezone.now()
+    durations: Dict[int, Dict[str, float]] = defaultdict(lambda: defaultdict(float))
+
+    rows = (
+        TicketStatusTransition.objects.filter(ticket_id__in=list(ticket_ids))
+        .order_by("ticket_id", "created_at", "id")
+        .values_list("ticket_id", "to_status", "created_at")
+    )
+
+    current_ticket_id = current_status = entered_at = None
+    for ticket_id, status, created_at in rows.iterator(chunk_size=2000):
+        if ticket_id == current_ticket_id:
+            durations[ticket_id][TICKET_STATUS_BY_CODE[current_status]] += (created_at - entered_at).total_seconds()
+        elif current_ticket_id is not None:
+            durations[current_ticket_id][TICKET_STATUS_BY_CODE[current_status]] += max(
+                (until - entered_at).total_seconds(), 0
+            )
+        current_ticket_id, current_status, entered_at = ticket_id, status, created_at
+
+    if current_ticket_id is not None:
+        durations[current_ticket_id][TICKET_STATUS_BY_CODE[current_status]] += max(
+            (until - entered_at).total_seconds(), 0
+        )
+
+    return {ticket_id: dict(statuses) for ticket_id, statuses in durations.items()}
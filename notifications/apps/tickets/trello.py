@@ -1,49 +1,123 @@
-from typing import Tuple
+import hashlib
+from typing import TYPE_CHECKING, Optional, Tuple
 
 import requests
+from django.conf import settings
 
+from core.circuit_breaker import CircuitBreaker
 from core.models import CoreSettings
-from tickets.models import Ticket, TrelloLabel
+from core.rate_limit import RateLimiter
+from tickets.constants import (
+    INTEGRATION_FAILURE_THRESHOLD,
+    INTEGRATION_RECOVERY_TIMEOUT,
+    INTEGRATION_REQUEST_TIMEOUT,
+    INTEGRATION_TRELLO,
+    TRELLO_RATE_LIMIT,
+    TRELLO_RATE_LIMIT_BURST,
+)
+from tickets.exceptions import NotificationError
+from tickets.formatting import html_to_trello_markdown
+from tickets.routing import route_ticket
 
+if TYPE_CHECKING:
+    from tickets.models import Ticket
 
-def trello_create_ticket(ticket: Ticket, core_settings: CoreSettings) -> Tuple[str, str]:
+trello_circuit_breaker = CircuitBreaker(
+    name="trello", failure_threshold=INTEGRATION_FAILURE_THRESHOLD, recovery_timeout=INTEGRATION_RECOVERY_TIMEOUT
+)
+trello_rate_limiter = RateLimiter(name=INTEGRATION_TRELLO, rate=TRELLO_RATE_LIMIT, burst=TRELLO_RATE_LIMIT_BURST)
+
+
+def trello_request(
+    method: str, path: str, action: str, core_settings: CoreSettings, params: Optional[dict] = None, **kwargs
+) -> requests.Response:
     """
-    Create a new Trello card in the specified Trello list using the given ticket information.
+    Send a request to the Trello REST API through the Trello rate limiter and circuit breaker.
 
     Args:
-        ticket (Ticket): The ticket object containing title and description to create the Trello card.
+        method (str): The HTTP method.
+        path (str): The API path, e.g. `cards/{id}/idLabels`.
+        action (str): The fixed name of the API method failures are recorded with, e.g. `cards.idLabels`, the ids
+            of the path are recorded in the payload.
         core_settings (CoreSettings): The core settings provide API credentials for trello.
+        params (Optional[dict]): The query parameters, the API credentials are added.
+        **kwargs: Keyword arguments passed on to `requests.request`, e.g. the request body as `json`. Send the card
+            fields in the body, the query string is limited in length and ends up in access logs.
 
     Returns:
-        Tuple[str, str]: A tuple containing the Trello card ID and URL. Returns empty strings if an exception occurs.
+        requests.Response: The response of the Trello API.
+
+    Raises:
+        CircuitOpenError: If Trello is currently unavailable, the request is not sent.
+        RateLimitExceededError: If the rate limit of the token is used up, the request is not sent.
+        NotificationError: If the request failed, or Trello responded with an error.
     """
+    if settings.INTEGRATION_RATE_LIMITS:
+        # the buckets are stored in the database, keyed by a digest instead of the token itself
+        trello_rate_limiter.acquire(hashlib.sha256((core_settings.trello_api_token or "").encode()).hexdigest()[:16])
     try:
-        data = requests.post(
-            url="https://api.trello.com/1/cards",
+        response = trello_circuit_breaker.request(
+            method,
+            f"{settings.TRELLO_API_URL}/{path}",
             headers={"Accept": "application/json"},
             params={
-                "idList": core_settings.trello_list_id,
                 "key": core_settings.trello_api_key,
                 "token": core_settings.trello_api_token,
-                "name": f"{ticket.title} | Ticket #{ticket.pk} | Module: {ticket.module}",
-                "desc": ticket.description,
+                **(params or {}),
             },
-        ).json()
+            timeout=INTEGRATION_REQUEST_TIMEOUT,
+            **kwargs,
+        )
+        # client errors don't trip the circuit breaker, but must not pass as success either
+        response.raise_for_status()
     except requests.exceptions.RequestException as e:
-        # todo: do something about it, for example send an email
-        print("trello exception", e)
-        return "", ""
+        # the api credentials are not recorded
+        raise NotificationError.from_exception(
+            integration=INTEGRATION_TRELLO,
+            action=action,
+            payload={"path": path, **(kwargs.get("json") or kwargs.get("data") or params or {})},
+            error=e,
+        ) from e
+    return response
 
-    return data.get("id"), data.get("url")
 
+def trello_create_ticket(ticket: "Ticket", core_settings: CoreSettings) -> Tuple[str, str]:
+    """
+    Create a new Trello card in the Trello list the ticket is routed to, using the given ticket information.
+
+    Args:
+        ticket (Ticket): The ticket object containing title and description to create the Trello card.
+        core_settings (CoreSettings): The core settings provide API credentials for trello.
 
-def trello_add_label(ticket: Ticket, core_settings: CoreSettings):
+    Returns:
+        Tuple[str, str]: A tuple containing the Trello card ID and URL.
+
+    Raises:
+        CircuitOpenError: If Trello is currently unavailable.
+        NotificationError: If the card could not be created.
+    """
+    data = trello_request(
+        "POST",
+        "cards",
+        action="cards.create",
+        core_settings=core_settings,
+        json={
+            "idList": route_ticket(ticket=ticket, core_settings=core_settings).trello_list_id,
+            "name": f"{ticket.title} | Ticket #{ticket.pk} | Module: {ticket.module}",
+            "desc": html_to_trello_markdown(ticket.description),
+        },
+    ).json()
+
+    return data["id"], data["url"]
+
+
+def trello_add_label(ticket: "Ticket", core_settings: CoreSettings):
     """Adds a Trello label to a card based on the ticket's module.
 
     This function fetches the appropriate Trello label for the given
-    ticket's module and attaches it to the Trello card via the Trello API.
-    If no label is found for the module, the function returns early
-    without making any API request.
+    ticket's module on the board the ticket is routed to and attaches it
+    to the Trello card via the Trello API. If no label is found for the
+    module, the function returns early without making any API request.
 
     Args:
         ticket (Ticket): The ticket object containing module and Trello card ID information.
@@ -52,17 +126,16 @@ def trello_add_label(ticket: Ticket, core_settings: CoreSettings):
     Returns:
         None
     """
-    trello_label = TrelloLabel.objects.filter(module=ticket.module).first()
+    trello_board_id = route_ticket(ticket=ticket, core_settings=core_settings).trello_board_id
+    trello_label = ticket.get_trello_label(trello_board_id=trello_board_id)
 
     if not trello_label:
         return
 
-    requests.post(
-        url=f"https://api.trello.com/1/cards/{ticket.trello_ticket_id}/idLabels",
-        headers={"Accept": "application/json"},
-        params={
-            "key": core_settings.trello_api_key,
-            "token": core_settings.trello_api_token,
-            "value": trello_label.trello_label_id,
-        },
+    trello_request(
+        "POST",
+        f"cards/{ticket.trello_ticket_id}/idLabels",
+        action="cards.idLabels",
+        core_settings=core_settings,
+        json={"value": trello_label.trello_label_id},
     )
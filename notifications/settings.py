@@ -16,6 +16,16 @@ DEBUG = True
 ALLOWED_HOSTS: List[str] = []
 
 BASE_URL = "http://localhost:8000"
+ADMIN_URL = "admin/"
+
+# send slack and trello notifications from the notification workers instead of while saving tickets
+NOTIFICATIONS_ASYNC = False
+
+# base urls of the integrations, can point to local stand-ins, see `load_test_admin`
+SLACK_API_URL = os.environ.get("SLACK_API_URL", "https://slack.com/api")
+TRELLO_API_URL = os.environ.get("TRELLO_API_URL", "https://api.trello.com/1")
+# limit the calls to the integrations per process, stand-ins without rate limits may turn this off
+INTEGRATION_RATE_LIMITS = True
 
 
 # Application definition
@@ -69,12 +79,56 @@ WSGI_APPLICATION = "wsgi.application"
 # Database
 # https://docs.djangoproject.com/en/5.2/ref/settings/#databases
 
-DATABASES = {
-    "default": {
-        "ENGINE": "django.db.backends.sqlite3",
-        "NAME": os.path.join(BASE_DIR, "db.sqlite3"),
+#
+# The database profile is selected with the environment variable DATABASE_ENGINE:
+#   - "sqlite" (default): local development, a single file running in WAL mode
+#   - "postgres": production, configured with the POSTGRES_* environment variables
+
+DATABASE_ENGINE = os.environ.get("DATABASE_ENGINE", "sqlite")
+
+if DATABASE_ENGINE == "postgres":
+    DATABASES = {
+        "default": {
+            "ENGINE": "django.db.backends.postgresql",
+            "NAME": os.environ.get("POSTGRES_DB", "notifications"),
+            "USER": os.environ.get("POSTGRES_USER", "notifications"),
+            "PASSWORD": os.environ.get("POSTGRES_PASSWORD", ""),
+            "HOST": os.environ.get("POSTGRES_HOST", "localhost"),
+            "PORT": os.environ.get("POSTGRES_PORT", "5432"),
+            # keep connections open between requests, and check them before reuse
+            "CONN_MAX_AGE": int(os.environ.get("POSTGRES_CONN_MAX_AGE", "60")),
+            "CONN_HEALTH_CHECKS": True,
+            # pgbouncer in transaction pooling mode does not support server-side cursors
+            "DISABLE_SERVER_SIDE_CURSORS": os.environ.get("POSTGRES_PGBOUNCER", "false").lower() == "true",
+            "OPTIONS": {
+                "connect_timeout": 5,
+                "application_name": os.environ.get("POSTGRES_APPLICATION_NAME", "notifications"),
+            },
+        }
+    }
+else:
+    DATABASES = {
+        "default": {
+            "ENGINE": "django.db.backends.sqlite3",
+            "NAME": os.environ.get("SQLITE_PATH", os.path.join(BASE_DIR, "db.sqlite3")),
+            # a file instead of an in-memory database, so the threads of load tests share it with the same locking
+            "TEST": {"NAME": os.path.join(BASE_DIR, "test_db.sqlite3")},
+            "OPTIONS": {
+                # wait for locks instead of failing right away
+                "timeout": 20,
+                # take the write lock when a transaction starts, lock upgrades of readers can't wait for it
+                "transaction_mode": "IMMEDIATE",
+                # readers don't block the writer in WAL mode, syncing on checkpoints only is safe in WAL mode
+                "init_command": (
+                    "PRAGMA journal_mode=WAL;"
+                    "PRAGMA synchronous=NORMAL;"
+                    "PRAGMA temp_store=MEMORY;"
+                    "PRAGMA cache_size=-20000;"
+                    "PRAGMA mmap_size=134217728;"
+                ),
+            },
+        }
     }
-}
 
 
 # Password validation
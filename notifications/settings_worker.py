@@ -0,0 +1,27 @@
+"""
+Lean settings profile for the notification workers, management commands and cron jobs.
+
+Runs without the admin, ckeditor, sessions, messages and static files, which are only needed to serve the
+admin, so they don't add to the startup time of short-lived processes:
+
+    $ DJANGO_SETTINGS_MODULE=settings_worker python manage.py run_notification_worker
+"""
+
+from settings import *  # noqa: F401, F403
+
+INSTALLED_APPS = [
+    # django
+    "django.contrib.auth",
+    "django.contrib.contenttypes",
+    # 1st party
+    "core",
+    "clients",
+    "tickets",
+]
+
+MIDDLEWARE = []
+
+# only names the admin pages linked from notifications, which skips importing the admin urls in the system checks
+ROOT_URLCONF = "urls_worker"
+
+TEMPLATES = []
@@ -0,0 +1,130 @@
+from datetime import timedelta
+
+from django.test import TestCase
+from django.utils import timezone
+from tickets.constants import (
+    INTEGRATION_TRELLO,
+    NOTIFICATION_JOB_MAX_ATTEMPTS,
+    NOTIFICATION_JOB_RETRY_DELAY,
+    NOTIFICATION_JOB_STATUS_DONE,
+    NOTIFICATION_JOB_STATUS_FAILED,
+    NOTIFICATION_JOB_STATUS_PENDING,
+    NOTIFICATION_JOB_STATUS_RUNNING,
+    NOTIFICATION_SHARDS,
+)
+from tickets.exceptions import NotificationError
+from tickets.models import FailedNotification, NotificationJob, Ticket
+from tickets.queue import claim_jobs, fail_job
+
+SHARDS = range(NOTIFICATION_SHARDS)
+
+
+def create_ticket(title: str = "Ticket") -> Ticket:
+    # drafts don't send or enqueue notifications on save, the tests enqueue their jobs themselves
+    return Ticket.objects.create(title=title, draft=True)
+
+
+class ClaimJobsTest(TestCase):
+    def test_jobs_of_a_ticket_are_claimed_in_order(self):
+        ticket, other_ticket = create_ticket(), create_ticket()
+        first = NotificationJob.enqueue(ticket=ticket)
+        second = NotificationJob.enqueue(ticket=ticket)
+        other = NotificationJob.enqueue(ticket=other_ticket)
+
+        # the second job of the ticket waits for the first one, the job of the other ticket doesn't
+        self.assertEqual(claim_jobs(worker="a", shards=SHARDS, limit=10), [first.pk, other.pk])
+        self.assertEqual(claim_jobs(worker="b", shards=SHARDS, limit=10), [])
+
+        NotificationJob.objects.filter(pk=first.pk).update(status=NOTIFICATION_JOB_STATUS_DONE)
+        self.assertEqual(claim_jobs(worker="b", shards=SHARDS, limit=10), [second.pk])
+
+    def test_jobs_are_claimed_once_available(self):
+        job = NotificationJob.enqueue(ticket=create_ticket(), available_at=timezone.now() + timedelta(minutes=1))
+
+        self.assertEqual(claim_jobs(worker="a", shards=SHARDS, limit=10), [])
+        NotificationJob.objects.filter(pk=job.pk).update(available_at=timezone.now())
+        self.assertEqual(claim_jobs(worker="a", shards=SHARDS, limit=10), [job.pk])
+
+    def test_expired_lease_is_reclaimed(self):
+        job = NotificationJob.enqueue(ticket=create_ticket())
+        self.assertEqual(claim_jobs(worker="crashed", shards=SHARDS, limit=10), [job.pk])
+        self.assertEqual(claim_jobs(worker="other", shards=SHARDS, limit=10), [])
+
+        NotificationJob.objects.filter(pk=job.pk).update(locked_until=timezone.now() - timedelta(seconds=1))
+        self.assertEqual(claim_jobs(worker="other", shards=SHARDS, limit=10), [job.pk])
+
+        job.refresh_from_db()
+        self.assertEqual(job.status, NOTIFICATION_JOB_STATUS_RUNNING)
+        self.assertEqual(job.locked_by, "other")
+        self.assertEqual(job.attempts, 2)
+
+    def test_expired_lease_on_last_attempt_fails_the_job(self):
+        job = NotificationJob.enqueue(ticket=create_ticket())
+        NotificationJob.objects.filter(pk=job.pk).update(
+            status=NOTIFICATION_JOB_STATUS_RUNNING,
+            attempts=NOTIFICATION_JOB_MAX_ATTEMPTS,
+            locked_by="crashed",
+            locked_until=timezone.now() - timedelta(seconds=1),
+        )
+
+        with self.assertLogs("tickets.queue", level="WARNING"):
+            self.assertEqual(claim_jobs(worker="other", shards=SHARDS, limit=10), [])
+        job.refresh_from_db()
+        self.assertEqual(job.status, NOTIFICATION_JOB_STATUS_FAILED)
+        self.assertIsNone(job.locked_by)
+        failed_notification = FailedNotification.objects.get(job=job)
+        self.assertEqual(failed_notification.error_class, "JobLeaseExpiredError")
+        self.assertEqual(failed_notification.attempts, NOTIFICATION_JOB_MAX_ATTEMPTS)
+
+
+class FailJobTest(TestCase):
+    def claim(self, attempts: int) -> NotificationJob:
+        job = NotificationJob.enqueue(ticket=create_ticket())
+        claim_jobs(worker="worker", shards=SHARDS, limit=1)
+        NotificationJob.objects.filter(pk=job.pk).update(attempts=attempts)
+        job.refresh_from_db()
+        return job
+
+    def test_failed_job_is_retried_with_exponential_backoff(self):
+        for attempts in (1, 3):
+            job = self.claim(attempts=attempts)
+            before = timezone.now()
+            fail_job(job=job, worker="worker", errors=[ValueError("boom")])
+
+            job.refresh_from_db()
+            delay = timedelta(seconds=NOTIFICATION_JOB_RETRY_DELAY * 2 ** (attempts - 1))
+            self.assertEqual(job.status, NOTIFICATION_JOB_STATUS_PENDING)
+            self.assertIsNone(job.locked_by)
+            self.assertGreaterEqual(job.available_at, before + delay)
+            self.assertLess(job.available_at, timezone.now() + delay)
+            self.assertIn("ValueError: boom", job.last_error)
+            self.assertFalse(FailedNotification.objects.filter(job=job).exists())
+
+    def test_failed_job_is_dead_lettered_after_the_last_attempt(self):
+        job = self.claim(attempts=NOTIFICATION_JOB_MAX_ATTEMPTS)
+        error = NotificationError(
+            integration=INTEGRATION_TRELLO,
+            action="cards.create",
+            payload={"path": "cards", "name": "Ticket"},
+            error_class="HTTPError",
+            message="400 Client Error",
+        )
+        fail_job(job=job, worker="worker", errors=[error])
+
+        job.refresh_from_db()
+        self.assertEqual(job.status, NOTIFICATION_JOB_STATUS_FAILED)
+        failed_notification = FailedNotification.objects.get(job=job)
+        self.assertEqual(failed_notification.ticket_id, job.ticket_id)
+        self.assertEqual(failed_notification.integration, INTEGRATION_TRELLO)
+        self.assertEqual(failed_notification.action, "cards.create")
+        self.assertEqual(failed_notification.payload, {"path": "cards", "name": "Ticket"})
+        self.assertEqual(failed_notification.error_class, "HTTPError")
+        self.assertEqual(failed_notification.attempts, NOTIFICATION_JOB_MAX_ATTEMPTS)
+
+    def test_job_lost_to_another_worker_is_left_alone(self):
+        job = self.claim(attempts=1)
+        fail_job(job=job, worker="other", errors=[ValueError("boom")])
+
+        job.refresh_from_db()
+        self.assertEqual(job.status, NOTIFICATION_JOB_STATUS_RUNNING)
+        self.assertEqual(job.locked_by, "worker")
@@ -0,0 +1,51 @@
+import os
+from unittest import mock
+
+from core.models import Sequence
+from core.sequences import SequenceAllocator
+from django.db import transaction
+from django.test import TestCase
+
+
+class SequenceAllocatorTest(TestCase):
+    def setUp(self):
+        self.allocator = SequenceAllocator(name="test", start=100, block_size=10)
+
+    def last_value(self) -> int:
+        return Sequence.objects.get(name="test").last_value
+
+    def test_numbers_are_handed_out_from_a_reserved_block(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            self.assertEqual(self.allocator.next_values(3), [100, 101, 102])
+        self.assertEqual(self.last_value(), 109)
+
+        # the rest of the block is handed out without another reservation
+        self.assertEqual(self.allocator.next_values(3), [103, 104, 105])
+        self.assertEqual(self.allocator.next_value(), 106)
+        self.assertEqual(self.last_value(), 109)
+
+    def test_numbers_beyond_the_block_are_reserved_at_once(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            self.assertEqual(self.allocator.next_values(8), list(range(100, 108)))
+        with self.captureOnCommitCallbacks(execute=True):
+            self.assertEqual(self.allocator.next_values(15), [108, 109, *range(110, 123)])
+        self.assertEqual(self.last_value(), 122)
+
+    def test_forked_process_does_not_hand_out_the_blocks_of_its_parent(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            self.assertEqual(self.allocator.next_value(), 100)
+
+        with mock.patch("core.sequences.os.getpid", return_value=os.getpid() + 1):
+            with self.captureOnCommitCallbacks(execute=True):
+                self.assertEqual(self.allocator.next_value(), 110)
+        self.assertEqual(self.last_value(), 119)
+
+    def test_block_of_a_rolled_back_reservation_is_not_handed_out(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            with self.assertRaises(ValueError), transaction.atomic():
+                self.assertEqual(self.allocator.next_value(), 100)
+                raise ValueError("rollback")
+
+        self.assertFalse(self.allocator.blocks)
+        # sqlite rolls the reservation back, postgres reserves on a separate connection and skips the block
+        self.assertNotIn(self.allocator.next_value(), range(101, 110))
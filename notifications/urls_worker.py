@@ -0,0 +1,25 @@
+"""
+Url conf of the worker settings profile, which runs without the admin.
+
+Names the admin pages linked from the notifications in the `admin` namespace, so they are reversed the same way
+as with the full admin, without importing it. The pages are not served.
+"""
+
+from django.conf import settings
+from django.http import Http404
+from django.urls import include, path
+
+
+def not_served(request, object_id):
+    """Admin pages are only served by the full settings profile."""
+    raise Http404
+
+
+admin_patterns = [
+    path("clients/client/<path:object_id>/change/", not_served, name="clients_client_change"),
+    path("tickets/ticket/<path:object_id>/change/", not_served, name="tickets_ticket_change"),
+]
+
+urlpatterns = [
+    path(settings.ADMIN_URL, include((admin_patterns, "admin"))),
+]